@@ -0,0 +1,113 @@
+"""
+Benchmark the automatic outlier flagging on a large synthetic dataset.
+
+Creates a synthetic dataframe with the columns used by auto outliers, times
+flagging all the columns in one pass with flag_all_outliers against the
+previous implementation, which flagged one column at a time with a row-wise
+apply and a merge, and checks the flags match. A copy of the previous
+implementation is kept below as baseline_flag_outliers. Then times
+run_auto_flagging end to end.
+"""
+
+#%% Configuration settings
+import math
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.append(".")
+from src.outlier_detection import auto_outliers as auto  # noqa
+
+num_rows = 1000000
+num_cells = 500
+flag_cols = ["701", "702", "703", "704", "705", "706", "707", "708", "709", "711"]
+upper_clip = 0.05
+lower_clip = 0.0
+
+
+#%% The previous implementation, flagging one column at a time
+def baseline_normal_round(x: float) -> int:
+    """Round halves up, as the previous normal_round."""
+    f = math.floor(x)
+    if x - f < 0.5:
+        return f
+    else:
+        return f + 1
+
+
+def baseline_flag_outliers(
+    df: pd.DataFrame, upper_clip: float, lower_clip: float, value_col: str
+) -> pd.DataFrame:
+    """Flag the outliers in one column, as the previous flag_outliers."""
+    groupby_cols = ["period", "cellnumber"]
+    sample_cond = df.selectiontype == "P"
+    status_cond = df["status"].isin(["Clear", "Clear - overridden"])
+    filtered_df = df[
+        sample_cond & status_cond & (df[value_col] > 0) & (df["instance"] == 0)
+    ].copy()
+
+    filtered_df["group_count"] = filtered_df.groupby(groupby_cols)[
+        value_col
+    ].transform("count")
+    filtered_df["high"] = filtered_df["group_count"] * upper_clip
+    filtered_df["high_rounded"] = filtered_df.apply(
+        lambda row: baseline_normal_round(row["high"]), axis=1
+    )
+    filtered_df["upper_band"] = filtered_df["group_count"] - filtered_df["high_rounded"]
+    filtered_df["low"] = filtered_df["group_count"] * lower_clip
+    filtered_df["lower_band"] = filtered_df.apply(
+        lambda row: baseline_normal_round(row["low"]), axis=1
+    )
+    filtered_df["group_rank"] = filtered_df.groupby(groupby_cols)[value_col].rank(
+        method="first", ascending=True
+    )
+    outlier_cond = (filtered_df["group_rank"] > filtered_df["upper_band"]) | (
+        filtered_df["group_rank"] <= filtered_df["lower_band"]
+    )
+    filtered_df[f"{value_col}_outlier_flag"] = outlier_cond
+
+    cols_sel = groupby_cols + ["reference", f"{value_col}_outlier_flag"]
+    df = df.merge(filtered_df[cols_sel], how="left", on=groupby_cols + ["reference"])
+    df[f"{value_col}_outlier_flag"] = df[f"{value_col}_outlier_flag"].fillna(False)
+    return df
+
+
+#%% Create a synthetic dataset
+rng = np.random.default_rng(2024)
+df = pd.DataFrame(
+    {
+        "reference": np.arange(num_rows),
+        "instance": rng.choice([0, 0, 0, 1], num_rows),
+        "selectiontype": rng.choice(["P", "P", "P", "C"], num_rows),
+        "status": rng.choice(
+            ["Clear", "Clear - overridden", "Form sent out"], num_rows
+        ),
+        "period": 2023,
+        "cellnumber": rng.integers(0, num_cells, num_rows),
+    }
+)
+for col in flag_cols:
+    df[col] = rng.gamma(1, 1000, num_rows).round(0)
+
+#%% Time flagging all the columns at once against the previous implementation
+start = time.perf_counter()
+one_pass_df = auto.flag_all_outliers(df.copy(), upper_clip, lower_clip, flag_cols)
+one_pass_time = time.perf_counter() - start
+
+start = time.perf_counter()
+baseline_df = df.copy()
+for col in flag_cols:
+    baseline_df = baseline_flag_outliers(baseline_df, upper_clip, lower_clip, col)
+baseline_time = time.perf_counter() - start
+
+assert_frame_equal(one_pass_df, baseline_df)
+print(f"baseline flag_outliers by column: {baseline_time:.2f}s")
+print(f"flag_all_outliers: {one_pass_time:.2f}s")
+
+#%% Time the whole auto outlier step
+start = time.perf_counter()
+auto.run_auto_flagging(df.copy(), upper_clip, lower_clip, flag_cols)
+print(f"run_auto_flagging: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,93 @@
+"""
+Benchmark the ways rd_read_csv can read the postcode masterlist.
+
+Creates a synthetic masterlist with the same shape as the ONS postcode directory,
+then times each read and measures the peak memory allocated by Python while
+reading it and the memory used by the resulting dataframe. Allocations made by
+the pyarrow engine happen outside Python, so only the size of its result is
+comparable.
+"""
+
+#%% Configuration settings
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(".")
+from src.staging.validation import schema_read_csv_kwargs  # noqa
+from src.utils.local_file_mods import rd_read_csv  # noqa
+
+num_rows = 1000000
+num_extra_columns = 46
+schema_kwargs = schema_read_csv_kwargs("./config/postcode_masterlist_schema.toml")
+
+#%% Create a synthetic masterlist
+rng = np.random.default_rng(2024)
+areas = np.array([f"{a}{b}" for a in "ABCDEFGHKLMNPRST" for b in "ABCDEHLMNW"])
+itl_codes = [f"UK{c}{n:02d}" for c in "CDEFGHIJKLMN" for n in range(1, 20)]
+masterlist = pd.DataFrame(
+    {
+        "pcd2": [
+            f"{area}{district:<2} {sector}{unit}"
+            for area, district, sector, unit in zip(
+                rng.choice(areas, num_rows),
+                rng.integers(1, 99, num_rows),
+                rng.integers(0, 9, num_rows),
+                rng.choice(["AA", "AB", "BD", "XL", "ZZ"], num_rows),
+            )
+        ],
+        "itl": rng.choice(itl_codes, num_rows),
+    }
+)
+for i in range(num_extra_columns):
+    if i % 2:
+        masterlist[f"col_{i}"] = rng.integers(0, 100000, num_rows)
+    else:
+        masterlist[f"col_{i}"] = rng.choice(["E0100", "W0200", "S0300"], num_rows)
+
+tmp_dir = tempfile.mkdtemp()
+masterlist_path = os.path.join(tmp_dir, "masterlist.csv")
+masterlist.to_csv(masterlist_path, index=False)
+del masterlist
+print(f"Masterlist size: {os.path.getsize(masterlist_path) / 1e6:.0f}MB")
+
+
+#%% Read the masterlist in each way
+def read_chunked():
+    """Read the schema columns in chunks, keeping the rows with an itl."""
+    chunks = rd_read_csv(masterlist_path, **schema_kwargs, chunksize=100000)
+    return pd.concat(chunk.dropna(subset=["itl"]) for chunk in chunks)
+
+
+reads = {
+    "full read": lambda: rd_read_csv(masterlist_path),
+    "usecols": lambda: rd_read_csv(masterlist_path, usecols=["pcd2", "itl"]),
+    "schema": lambda: rd_read_csv(masterlist_path, **schema_kwargs),
+    "schema, pyarrow": lambda: rd_read_csv(
+        masterlist_path, **schema_kwargs, engine="pyarrow"
+    ),
+    "schema, chunked": read_chunked,
+}
+
+for name, read in reads.items():
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = read()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    df_memory = df.memory_usage(deep=True).sum()
+    print(
+        f"{name}: {duration:.2f}s, peak {peak / 1e6:.0f}MB, "
+        f"dataframe {df_memory / 1e6:.0f}MB"
+    )
+    del df
+
+#%% Clean up
+os.remove(masterlist_path)
+os.rmdir(tmp_dir)
@@ -0,0 +1,93 @@
+"""
+Benchmark the streaming SPP snapshot parser against loading the whole JSON.
+
+Writes a synthetic snapshot to a temporary file, then compares the time and peak
+memory of json.load followed by parse_snap_data with parse_snap_stream, and
+checks the outputs match.
+"""
+
+#%% Configuration settings
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from pandas.testing import assert_frame_equal
+
+sys.path.append(".")
+from src.staging.spp_parser import parse_snap_data, parse_snap_stream  # noqa
+
+num_references = 20000
+questions = ["200", "201", "202", "211", "305", "405", "406", "501", "502", "503"]
+
+#%% Create a synthetic snapshot file
+rng = np.random.default_rng(2024)
+contributors = [
+    {
+        "reference": str(11000000000 + i),
+        "period": "202212",
+        "formtype": rng.choice(["0001", "0006"]),
+        "status": rng.choice(["Clear", "Form sent out", "Check needed"]),
+        "statusencoded": "210",
+        "cellnumber": int(rng.integers(0, 800)),
+        "employees": int(rng.integers(0, 5000)),
+    }
+    for i in range(num_references)
+]
+responses = [
+    {
+        "reference": contributor["reference"],
+        "period": "202212",
+        "instance": int(instance),
+        "questioncode": question,
+        "response": str(rng.integers(0, 100000)),
+        "adjustedresponse": "",
+    }
+    for contributor in contributors
+    for instance in range(2)
+    for question in questions
+]
+snapshot_path = os.path.join(tempfile.mkdtemp(), "snapshot.json")
+with open(snapshot_path, "w") as file:
+    json.dump(
+        {
+            "snapshot_id": "benchmark",
+            "contributors": contributors,
+            "responses": responses,
+        },
+        file,
+    )
+del contributors, responses
+print(f"Snapshot size: {os.path.getsize(snapshot_path) / 1e6:.1f} MB")
+
+
+#%% Time and measure peak memory of both implementations
+def load_and_parse(path):
+    with open(path, "r") as file:
+        snapdata = json.load(file)
+    return parse_snap_data(snapdata)
+
+
+def stream_and_parse(path):
+    with open(path, "rb") as file:
+        return parse_snap_stream(file)
+
+
+results = {}
+for func in [load_and_parse, stream_and_parse]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    results[func.__name__] = func(snapshot_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{func.__name__}: {elapsed:.2f}s, peak memory {peak / 1e6:.0f} MB")
+
+#%% Check the outputs match
+for old_df, new_df in zip(results["load_and_parse"], results["stream_and_parse"]):
+    assert_frame_equal(new_df, old_df)
+print("Outputs match.")
+os.remove(snapshot_path)
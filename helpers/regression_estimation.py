@@ -1,6 +1,6 @@
 """
 Regression test to compare two versions of outputs
-Reads two csv files, old and new
+Reads two csv, parquet or feather files, old and new
 Selects the columns of interest
 Joins old and new on key columns, outer
 Checks which records are in old only (left), new only (right) or both
@@ -12,8 +12,8 @@ import sys
 
 sys.path.append("D:/programming_projects/research-and-development")
 #%%
-from src.utils.local_file_mods import read_local_csv as read_csv
-from src.utils.local_file_mods import write_local_csv as write_csv
+from src.utils.local_file_mods import rd_read_table as read_table
+from src.utils.local_file_mods import rd_write_csv as write_csv
 
 #%% Configuration settings
 
@@ -40,8 +40,8 @@ other_cols = [
 tolerance = 0.001
 #%% Read files
 cols_read = key_cols + [value_col] + other_cols
-df_old = read_csv(in_fol + in_file_old)[cols_read]
-df_new = read_csv(in_fol + in_file_new)[cols_read]
+df_old = read_table(in_fol + in_file_old)[cols_read]
+df_new = read_table(in_fol + in_file_new)[cols_read]
 
 #%% Filter good statuses only
 imp_markers_to_keep = ["TMI", "CF", "MoR", "constructed"]
@@ -1,6 +1,6 @@
 """
 Regression test to compare two versions of outputs
-Reads two csv files, old and new
+Reads two csv, parquet or feather files, old and new
 Selects the columns of interest
 Joins old and new on key columns, outer
 Checks which records are in old only (left), new only (right) or both
@@ -9,7 +9,11 @@ Saves the ouotputs
 """
 
 #%% Configuration settings
-import pandas as pd
+import sys
+
+sys.path.append(".")
+from src.utils.local_file_mods import rd_read_table as read_table  # noqa
+from src.utils.local_file_mods import rd_write_csv as write_csv  # noqa
 
 # Input folder and file names
 root_path = "R:/BERD Results System Development 2023/DAP_emulation/2023_surveys/BERD/06_imputation/imputation_qa/"
@@ -34,8 +38,8 @@ other_cols = [
 tolerance = 0.001
 #%% Read files
 cols_read = key_cols + [value_col] + other_cols
-df_old = pd.read_csv(root_path + in_file_old)
-df_new = pd.read_csv(root_path + in_file_new)
+df_old = read_table(root_path + in_file_old)
+df_new = read_table(root_path + in_file_new)
 
 #%% join old and new
 df_merge = df_old.merge(df_new, on=key_cols, how="inner", suffixes=("_old", "_new"))
@@ -117,7 +117,6 @@ def all_data_construction(
 
     if "construction_type" in construction_df.columns:
         if "short_to_long" in construction_df["construction_type"].values:
-            construction_df.reset_index(inplace=True)
             updated_snapshot_df = remove_short_to_long_0(
                 updated_snapshot_df, construction_df
             )
@@ -9,6 +9,7 @@ import numpy as np
 from src.outputs.outputs_helpers import create_period_year
 from src.staging import postcode_validation as pcval
 from src.utils.helpers import convert_formtype
+from src.utils.upsert import keyed_upsert
 
 
 def read_construction_file(
@@ -201,7 +202,7 @@ def finalise_forms_gb(updated_snapshot_df: pd.DataFrame) -> pd.DataFrame:
     # Top up all new postcodes so they're all eight characters exactly
     postcode_cols = ["601", "referencepostcode", "postcodes_harmonised"]
     for col in postcode_cols:
-        constructed_df[col] = constructed_df[col].apply(pcval.format_postcodes)
+        constructed_df[col] = pcval.format_postcode_series(constructed_df[col])
 
     updated_snapshot_df = pd.concat([constructed_df, not_constructed_df]).reset_index(
         drop=True
@@ -285,17 +286,18 @@ def prep_new_rows(
         pd.DataFrame: The new rows (from construction) containing formtype and
             cellnumber.
     """
-    # iterate through new rows and add formtype/cellnumber from snapshot
-    for index, row in rows_to_add.iterrows():
-        if pd.isna(row["formtype"]) or pd.isna(row["cellnumber"]):
-            reference = row["reference"]
-            snapshot_row = updated_snapshot_df[
-                updated_snapshot_df["reference"] == reference
-            ].iloc[0]
-            if pd.isna(row["formtype"]):
-                rows_to_add.at[index, "formtype"] = snapshot_row["formtype"]
-            if pd.isna(row["cellnumber"]):
-                rows_to_add.at[index, "cellnumber"] = snapshot_row["cellnumber"]
+    # fill missing formtype/cellnumber from the first snapshot row of each reference
+    first_rows = updated_snapshot_df.drop_duplicates("reference").set_index(
+        "reference"
+    )
+    rows_to_add = rows_to_add.assign(
+        **{
+            col: rows_to_add[col].fillna(
+                rows_to_add["reference"].map(first_rows[col])
+            )
+            for col in ["formtype", "cellnumber"]
+        }
+    )
     # obtain references with missing formtype/cellnumber
     missing_references = rows_to_add[
         rows_to_add["formtype"].isna() | rows_to_add["cellnumber"].isna()
@@ -320,27 +322,17 @@ def replace_values_in_construction(
 
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame]: The updated snapshot dataframe and the
-            modified construction dataframe.
+            construction dataframe.
     """
-    # Update the values with the constructed ones
-    construction_df.set_index(
-        [
-            "reference",
-            "instance",
-            "period_year",
-        ],
-        inplace=True,
-    )
-    updated_snapshot_df.set_index(
-        [
-            "reference",
-            "instance",
-            "period_year",
-        ],
-        inplace=True,
+    # Update the values with the constructed ones, keeping the snapshot values
+    # where the constructed ones are missing
+    updated_snapshot_df, _ = keyed_upsert(
+        updated_snapshot_df,
+        construction_df,
+        ["reference", "instance", "period_year"],
+        insert=False,
+        skip_missing=True,
     )
-    updated_snapshot_df.update(construction_df)
-    updated_snapshot_df.reset_index(inplace=True)
 
     updated_snapshot_df = updated_snapshot_df.astype(
         {"reference": "Int64", "instance": "Int64", "period_year": "Int64"}
@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 
 from src.utils.defence import type_defence
+from src.utils.upsert import match_rows
 
 
 def check_for_duplicates(
@@ -240,24 +241,11 @@ def _ref_instance_in_snapshot(
     type_defence(snapshot_df, "snapshot_df", pd.DataFrame)
     type_defence(logger, "logger", (logging.Logger, type(None)))
 
-    snapshot_df_copy = snapshot_df.copy()
-    construction_df_copy = construction_df.copy()
-
-    # create a key to check if ref/instance combo exists
-    snapshot_df_copy["ref_instance"] = (
-        snapshot_df_copy["reference"].astype(str)
-        + ": "
-        + snapshot_df_copy["instance"].astype(str)
-    )
-    construction_df_copy["ref_instance"] = (
-        construction_df_copy["reference"].astype(str)
-        + ": "
-        + construction_df_copy["instance"].astype(str)
-    )
-
-    invalid_combo = pd.merge(
-        construction_df_copy, snapshot_df_copy, on="ref_instance", how="inner"
+    # match the ref/instance combinations on the key columns themselves
+    construction_rows, _ = match_rows(
+        construction_df, snapshot_df, ["reference", "instance"]
     )
+    invalid_combo = construction_df.iloc[np.unique(construction_rows)]
 
     if invalid_combo.empty:
         logger.info(
@@ -265,7 +253,11 @@ def _ref_instance_in_snapshot(
             " against the snapshot and validated."
         )
     if not invalid_combo.empty:
-        invalid_combo_ref = invalid_combo["ref_instance"].unique()
+        invalid_combo_ref = (
+            invalid_combo["reference"].astype(str)
+            + ": "
+            + invalid_combo["instance"].astype(str)
+        ).unique()
         raise ValueError(
             "Reference/instance combinations marked as 'new' are already in the"
             f" dataset: {invalid_combo_ref}"
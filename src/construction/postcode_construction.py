@@ -2,7 +2,7 @@ import logging
 import pandas as pd
 
 from src.outputs.outputs_helpers import create_period_year
-from src.staging.postcode_validation import format_postcodes
+from src.staging.postcode_validation import format_postcode_series
 from src.construction.construction_helpers import replace_values_in_construction
 
 
@@ -29,9 +29,9 @@ def postcode_data_construction(
     construction_df["postcodes_harmonised"] = construction_df["601"].fillna(
         construction_df["referencepostcode"]
     )
-    construction_df["postcodes_harmonised"] = construction_df[
-        "postcodes_harmonised"
-    ].apply(format_postcodes)
+    construction_df["postcodes_harmonised"] = format_postcode_series(
+        construction_df["postcodes_harmonised"]
+    )
 
     # Drop columns without constructed values
     construction_df = construction_df.dropna(axis="columns", how="all")
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any
 from itertools import chain
 
+import numpy as np
 import pandas as pd
 
 AppWeights_Logger = logging.getLogger(__name__)
@@ -30,18 +31,20 @@ def apply_weights(
     bd_cols = list(chain(*bd_qs_lists))  # breakdown cols 2xx, 3xx, emp_xx hc_xx
     cols_list = num_cols + master_cols + hc_tot_cols + bd_cols
 
+    # apply the weights to all the columns at once, as one 2-D block
+    values = df[cols_list].to_numpy(dtype=float, na_value=np.nan)
+    weights = df["a_weight"].to_numpy(dtype=float)[:, None]
+    weighted = np.round(values * weights, round_val)
+
     # if the dataframe is for QA output, create new columns with the weights applied.
     if for_qa:
-
-        estimated_cols = pd.concat(
-            [round(df[col] * df["a_weight"], round_val).rename(
-                f"{col}_estimated") for col in cols_list], axis=1
+        estimated_cols = pd.DataFrame(
+            weighted, columns=[f"{col}_estimated" for col in cols_list], index=df.index
         )
         df = pd.concat([df, estimated_cols], axis=1)
 
     # if the dataframe is for the final output, apply the weights to the original cols.
     else:
-        for col in cols_list:
-            df[col] = round(df[col] * df["a_weight"], round_val)
+        df[cols_list] = weighted
 
     return df
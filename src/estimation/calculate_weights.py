@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import logging
 from typing import Tuple
@@ -69,16 +70,27 @@ def calculate_weighting_factor(
     # Default a_weight = 1 for all entries
     df["a_weight"] = 1.0
 
-    grouped_by_cell = df.groupby("cellnumber", group_keys=False).apply(calc_a_weight)
+    estimation_filter = create_estimation_filter(df)
+    cell_weights = calc_cell_weights(df, estimation_filter, exp_col)
 
-    # Create a QA dataframe
-    qa_frame = create_a_weight_qa_df(grouped_by_cell)
-    grouped_by_cell = grouped_by_cell.drop(columns=["N", "n", "o"])
-    return grouped_by_cell, qa_frame
+    # Broadcast the weight of each cell back to its rows which are estimated
+    weighted = estimation_filter & df["cellnumber"].notnull()
+    df.loc[weighted, "a_weight"] = df.loc[weighted, "cellnumber"].map(
+        cell_weights.set_index("cellnumber")["a_weight"]
+    )
+
+    # Create a QA dataframe of the cells with records to estimate
+    estimated_cells = df.loc[estimation_filter, "cellnumber"].unique()
+    qa_frame = create_a_weight_qa_df(
+        cell_weights[cell_weights["cellnumber"].isin(estimated_cells)]
+    )
+    return df, qa_frame
 
 
-def calc_a_weight(cell_group: pd.DataFrame) -> pd.DataFrame:
-    """Calculate the 'a' weighting factor for a cell group.
+def calc_cell_weights(
+    df: pd.DataFrame, estimation_filter: pd.Series, exp_col: str = "709"
+) -> pd.DataFrame:
+    """Calculate the 'a' weighting factor for every cell at once.
 
     The calculation here is:
 
@@ -89,54 +101,63 @@ def calc_a_weight(cell_group: pd.DataFrame) -> pd.DataFrame:
         - n is the number of businesses in sample for that cell
         - o is the number of outliers in the cell
 
-    'o' is calculated in this function by summing all the `True` values
-        because `True` == 1
+    n and o are counted from the records to estimate at instance 0 with a
+    value in exp_col. Cells with no such records have an 'a' of 1.
 
     Args:
-        cell_group (pd.DataFrame): The dataframe grouped by cellnumber.
+        df (pd.DataFrame): The input df containing survey data.
+        estimation_filter (pd.Series): Mask of the records to estimate.
+        exp_col (str, optional): The column that is used to calculate n.
 
     Returns:
-        pd.DataFrame: The dataframe with the 'a' weighting factor calculated.
+        pd.DataFrame: The "cellnumber", "N", "n", "o" and "a_weight" of each
+            cell, sorted by cellnumber.
     """
-    N = cell_group["uni_count"].iloc[0]
-
-    estimation_filter = create_estimation_filter(cell_group)
-    a_weight_filter = (cell_group["instance"] == 0) & cell_group["709"].notnull()
-    filtered_group = cell_group.loc[estimation_filter & a_weight_filter]
-
-    n = calc_lower_n(filtered_group)
+    # Check if any of the key cols are missing
+    cols = set(df.columns)
+    if not ("reference" in cols) & (exp_col in cols):
+        raise ValueError(f"'reference' or {exp_col} missing.")
 
-    # Count the outliers for this group (will count all the `True` values)
-    outlier_count = filtered_group["outlier"].sum()
+    # N is taken from the first record of each cell
+    cells = df.drop_duplicates("cellnumber").dropna(subset=["cellnumber"])
+    cell_weights = cells.set_index("cellnumber")[["uni_count"]].sort_index()
+    cell_weights.columns = ["N"]
 
-    # Calculate 'a' for this group
-    if n > 0:
-        a_weight = (N - outlier_count) / (n - outlier_count)
-    else:
-        a_weight = 1.0
+    a_weight_filter = (df["instance"] == 0) & df[exp_col].notnull()
+    filtered = df.loc[estimation_filter & a_weight_filter]
+    filtered_cells = filtered.groupby("cellnumber")
+    cell_weights["n"] = (
+        filtered_cells["reference"].nunique().reindex(cell_weights.index, fill_value=0)
+    )
+    # Count the outliers for each cell (will count all the `True` values)
+    cell_weights["o"] = (
+        filtered["outlier"]
+        .astype(bool)
+        .groupby(filtered["cellnumber"])
+        .sum()
+        .reindex(cell_weights.index, fill_value=0)
+    )
 
-    cell_group["N"] = N
-    cell_group["n"] = n
-    cell_group["o"] = outlier_count
-    cell_group.loc[estimation_filter, "a_weight"] = a_weight
+    N = cell_weights["N"].to_numpy(dtype=float)
+    n = cell_weights["n"].to_numpy()
+    o = cell_weights["o"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cell_weights["a_weight"] = np.where(n > 0, (N - o) / (n - o), 1.0)
 
-    return cell_group
+    return cell_weights.reset_index()
 
 
-def create_a_weight_qa_df(df: pd.DataFrame) -> pd.DataFrame:
+def create_a_weight_qa_df(cell_weights: pd.DataFrame) -> pd.DataFrame:
     """Create a QA dataframe for the a_weight calculation.
 
     Args:
-        df (pd.DataFrame): The dataframe containing the a_weight column.
+        cell_weights (pd.DataFrame): The N, n, o and a_weight of each cell.
 
     Returns:
         pd.DataFrame: The QA dataframe.
     """
-    est_filter = create_estimation_filter(df)
-
     qa_cols_list = ["cellnumber", "N", "n", "o", "a_weight"]
-    qa_frame = df[qa_cols_list].loc[est_filter].groupby("cellnumber").first()
-    qa_frame = qa_frame.reset_index()
+    qa_frame = cell_weights[qa_cols_list].reset_index(drop=True)
     qa_frame = qa_frame.rename(
         columns={
             "cellnumber": "Cell Number",
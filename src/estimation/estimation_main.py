@@ -13,7 +13,7 @@ EstMainLogger = logging.getLogger(__name__)
 def run_estimation(
     df: pd.DataFrame,
     config: Dict[str, Any],
-    write_csv: Callable,
+    write_table: Callable,
     run_id: int,
 ) -> pd.DataFrame:
     """
@@ -22,8 +22,9 @@ def run_estimation(
     Args:
         df (pd.DataFrame): The main dataset were estimation will be applied.
         config (dict): The configuration settings.
-        write_csv (Callable): Function to write to a csv file.
-            This will be the s3, hdfs or network version depending on settings.
+        write_table (Callable): Function to write to csv, parquet and/or feather
+            files. This will be the s3, hdfs or network version depending on
+            settings.
         run_id (int): The current run id
 
     Returns:
@@ -51,8 +52,9 @@ def run_estimation(
         est_qa_path = config["estimation_paths"]["qa_path"]
         cell_qa_filename = f"{survey_year}_estimation_weights_qa_{tdate}_v{run_id}.csv"
         full_qa_filename = f"{survey_year}_full_estimation_qa_{tdate}_v{run_id}.csv"
-        write_csv(f"{est_qa_path}/{cell_qa_filename}", qa_df)
-        write_csv(f"{est_qa_path}/{full_qa_filename}", estimated_df)
+        qa_formats = config["qa_output_formats"]["estimation_qa"]
+        write_table(f"{est_qa_path}/{cell_qa_filename}", qa_df, qa_formats)
+        write_table(f"{est_qa_path}/{full_qa_filename}", estimated_df, qa_formats)
     EstMainLogger.info("Finished estimation weights calculation.")
 
     return weighted_df
@@ -6,6 +6,8 @@ from typing import Union, Callable
 import pandas as pd
 
 from src.utils.helpers import values_in_column
+from src.utils.upsert import keyed_upsert
+from src.freezing.freezing_compare import KEY_COLS
 from src.freezing.freezing_utils import _add_last_frozen_column
 
 
@@ -171,12 +173,19 @@ def apply_amendments(
     # update last_frozen column
     accepted_amendments_df = _add_last_frozen_column(accepted_amendments_df, run_id)
 
-    # drop records to be amended from main df
-    main_df = main_df[~main_df.reference.isin(changes_refs)]
-    # add amended records to main df
-    amended_df = pd.concat([main_df, accepted_amendments_df])
+    # Update the amended records in place, add the new ones, and drop the other
+    # records of the amended references
+    keys = [col for col in KEY_COLS if col in accepted_amendments_df.columns]
+    amended_df, counts = keyed_upsert(
+        main_df,
+        accepted_amendments_df,
+        keys,
+        remove=main_df.reference.isin(changes_refs),
+    )
     FreezingLogger.info(
-        f"{accepted_amendments_df.shape[0]} record(s) amended during freezing"
+        f"{accepted_amendments_df.shape[0]} record(s) amended during freezing "
+        f"({counts['updated']} updated, {counts['inserted']} inserted, "
+        f"{counts['removed']} removed)"
     )
     return amended_df
 
@@ -206,16 +215,29 @@ def apply_additions(
 
     accepted_additions_df = additions_df[additions_df.reference.isin(changes_refs)]
 
-    # removes the old form sent out where we have a new clear response
-    remove_status = ['Form sent out', 'Ceased trading (NIL4)', 'Out of scope (NIL3)', 'Dormant (NIL5)']
-    main_df = main_df[~((main_df.reference.isin(accepted_additions_df.reference)) & (main_df.status.isin(remove_status)))]
-
     accepted_additions_df = accepted_additions_df.drop("accept_changes", axis=1)
     if accepted_additions_df.shape[0] > 0:
         accepted_additions_df = _add_last_frozen_column(accepted_additions_df, run_id)
-        added_df = pd.concat([main_df, accepted_additions_df], ignore_index=True)
+        # removes the old form sent out where we have a new clear response
+        remove_status = [
+            "Form sent out",
+            "Ceased trading (NIL4)",
+            "Out of scope (NIL3)",
+            "Dormant (NIL5)",
+        ]
+        keys = [col for col in KEY_COLS if col in accepted_additions_df.columns]
+        added_df, counts = keyed_upsert(
+            main_df,
+            accepted_additions_df,
+            keys,
+            remove=(
+                main_df.reference.isin(accepted_additions_df.reference)
+                & main_df.status.isin(remove_status)
+            ),
+        )
         FreezingLogger.info(
-            f"{accepted_additions_df.shape[0]} record(s) added during freezing"
+            f"{accepted_additions_df.shape[0]} record(s) added during freezing "
+            f"({counts['removed']} replaced record(s) removed)"
         )
     else:
         FreezingLogger.info("Additions file contained no records marked for inclusion")
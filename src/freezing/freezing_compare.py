@@ -1,8 +1,123 @@
 import logging
 from datetime import datetime
 import os
+import numpy as np
 import pandas as pd
-from typing import Callable, Tuple
+from typing import Callable, List, Tuple
+
+
+# The columns compared to find the records which have changed
+KEY_COLS = ["reference", "period", "instance"]
+NUMERIC_COLS = [
+    "202", "203", "204", "205", "206", "207", "209", "210",
+    "211", "212", "214", "216", "218", "219", "220", "221", "222",
+    "223", "225", "226", "227", "228", "229", "237", "242", "243",
+    "244", "245", "246", "247", "248", "249", "250", "405", "406",
+    "407", "408", "409", "410", "411", "412", "501", "502", "503",
+    "504", "505", "506", "507", "508", "602", "701", "702", "703",
+    "704", "705", "706", "707", "709", "711",
+]
+NON_NUMERIC_COLS = ["200", "201", "601"]
+
+# Numeric differences above this are treated as changes
+DIFF_TOLERANCE = 0.00001
+
+
+def _align_rows(
+    frozen_csv: pd.DataFrame, updated_snapshot: pd.DataFrame
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the positions of the rows of both dataframes with matching keys.
+
+    Only the key columns are joined, so the rest of the columns are taken by
+    position once, rather than being copied by a merge of the whole dataframes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The row positions in frozen_csv and in
+            updated_snapshot of each pair of matching records, in the order of
+            frozen_csv.
+    """
+    positions = pd.merge(
+        frozen_csv[KEY_COLS].assign(_original=np.arange(len(frozen_csv))),
+        updated_snapshot[KEY_COLS].assign(_updated=np.arange(len(updated_snapshot))),
+        on=KEY_COLS,
+        how="inner",
+    )
+    return positions["_original"].to_numpy(), positions["_updated"].to_numpy()
+
+
+def _object_values(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    """Get the values of the given columns as objects, with None if missing."""
+    values = df[cols].to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    return values
+
+
+def record_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    """Hash the compared columns of each record of a dataframe.
+
+    The numeric columns are hashed as floats and the non-numeric columns as
+    objects, so records read from a csv and staged from a snapshot hash the same
+    when their values are the same, whatever their data types.
+
+    Args:
+        df (pd.DataFrame): The staged snapshot or frozen data.
+
+    Returns:
+        pd.DataFrame: The key columns of each record, its "record_hash" and its
+            "row" position in df.
+    """
+    normalised = pd.concat(
+        [
+            pd.DataFrame(df[NUMERIC_COLS].to_numpy(dtype=float, na_value=np.nan)),
+            pd.DataFrame(_object_values(df, NON_NUMERIC_COLS)),
+        ],
+        axis=1,
+    )
+    hashes = df[KEY_COLS].reset_index(drop=True)
+    hashes["record_hash"] = pd.util.hash_pandas_object(normalised, index=False).values
+    hashes["row"] = np.arange(len(df))
+    return hashes
+
+
+def get_changed_records(
+    frozen_csv: pd.DataFrame,
+    updated_snapshot: pd.DataFrame,
+    FreezingLogger: logging.Logger,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Select only the records which may have been added or amended.
+
+    The records are matched on their keys and the hashes of their compared
+    columns. Records in both with the same hash are unchanged, and are left out,
+    so the comparison only works on the records which have changed.
+
+    Args:
+        frozen_csv (pd.DataFrame): The staged and validated frozen data.
+        updated_snapshot (pd.DataFrame): The staged and validated updated
+            snapshot data.
+        FreezingLogger (logging.Logger): The logger to log to.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The frozen records with a changed
+            hash, and the updated records which are new or have a changed hash.
+    """
+    matched = pd.merge(
+        record_hashes(updated_snapshot),
+        record_hashes(frozen_csv),
+        on=KEY_COLS,
+        how="left",
+        suffixes=("_updated", "_original"),
+    )
+    changed = matched["record_hash_updated"] != matched["record_hash_original"]
+    updated_rows = np.unique(matched.loc[changed, "row_updated"])
+    original_rows = np.unique(
+        matched.loc[changed & matched["row_original"].notna(), "row_original"]
+    ).astype(int)
+
+    FreezingLogger.info(
+        f"{len(updated_rows)} of {len(updated_snapshot)} records in the updated "
+        "snapshot are new or have changed."
+    )
+    return frozen_csv.iloc[original_rows], updated_snapshot.iloc[updated_rows]
 
 
 def get_amendments(
@@ -15,6 +130,11 @@ def get_amendments(
     Get all records that are present in both the frozen_csv and the updated
     snapshot, and have matching keys.
 
+    The records are matched on their keys, and records whose compared columns
+    hash to the same value are skipped as unchanged. For the remaining records,
+    the numeric differences are found as one 2-D array, and the non-numeric
+    columns are compared together, with missing values in both treated as equal.
+
     Args:
         frozen_csv (pd.DataFrame): The staged and validated frozen data.
         updated_snapshot (pd.DataFrame): The staged and validated updated
@@ -27,89 +147,72 @@ def get_amendments(
     FreezingLogger.info(
         "Looking for records that have changed in the updated snapshot."
     )
-    key_cols = ["reference", "period", "instance"]
-    numeric_cols = [
-        "202", "203", "204", "205", "206", "207", "209", "210",
-        "211", "212", "214", "216", "218", "219", "220", "221", "222",
-        "223", "225", "226", "227", "228", "229", "237", "242", "243",
-        "244", "245", "246", "247", "248", "249", "250", "405", "406",
-        "407", "408", "409", "410", "411", "412", "501", "502", "503",
-        "504", "505", "506", "507", "508", "602", "701", "702", "703",
-        "704", "705", "706", "707", "709", "711",
-    ]
+    original_rows, updated_rows = _align_rows(frozen_csv, updated_snapshot)
 
-    non_numeric_cols = [
-        "200",
-        "201",
-        "601",
-    ]
-    # numeric_cols_new = [f"{i}_updated" for i in numeric_cols]
-    numeric_cols_diff = [f"{i}_diff" for i in numeric_cols]
-    # non_numeric_cols_new = [f"{i}_updated" for i in non_numeric_cols]
-    non_numeric_cols_diff = [f"{i}_diff" for i in non_numeric_cols]
+    if len(original_rows) == 0:
+        FreezingLogger.info("No amendments found.")
+        return None
 
-    # Inner join on keys to select only records present in both snapshots
-    amendments_df = pd.merge(
-        frozen_csv,
-        updated_snapshot,
-        on=key_cols,
-        how="inner",
-        suffixes=("_original", "_updated"),
+    # Skip the records where every compared column is the same
+    hash_differs = (
+        record_hashes(frozen_csv)["record_hash"].to_numpy()[original_rows]
+        != record_hashes(updated_snapshot)["record_hash"].to_numpy()[updated_rows]
+    )
+    original_rows = original_rows[hash_differs]
+    updated_rows = updated_rows[hash_differs]
+    original = frozen_csv.iloc[original_rows]
+    updated = updated_snapshot.iloc[updated_rows]
+
+    # Numeric differences, as a single array operation
+    numeric_diff = updated[NUMERIC_COLS].to_numpy(
+        dtype=float, na_value=np.nan
+    ) - original[NUMERIC_COLS].to_numpy(dtype=float, na_value=np.nan)
+    numeric_changed = numeric_diff > DIFF_TOLERANCE
+
+    # Non-numeric changes, where missing values in both are not a change
+    original_values = _object_values(original, NON_NUMERIC_COLS)
+    updated_values = _object_values(updated, NON_NUMERIC_COLS)
+    non_numeric_changed = ~(
+        (original_values == updated_values)
+        | (pd.isna(original_values) & pd.isna(updated_values))
     )
 
-    # If there are any records to amend, calculate differences
-    if amendments_df.shape[0] > 0:
-        for each in numeric_cols:
-            amendments_df[f"{each}_diff"] = (
-                amendments_df[f"{each}_updated"] - amendments_df[f"{each}_original"]
-            )
-            amendments_df.loc[
-                amendments_df[f"{each}_diff"] > 0.00001,
-                f"is_{each}_diff_nonzero_or_true",
-            ] = True
-
-        for each in non_numeric_cols:
-            amendments_df[f"is_{each}_diff_nonzero_or_true"] = (
-                amendments_df[f"{each}_updated"] != amendments_df[f"{each}_original"]
-            )
-            amendments_df.loc[
-                amendments_df[f"is_{each}_diff_nonzero_or_true"], f"{each}_diff"
-            ] = amendments_df[f"{each}_updated"]
-
-        # Take a slice of the df which is just the cols ending with
-        # _diff_nonzero_or_true.
-        # Do a column-wise any() on this slice, which returns a series where the
-        # value is True if any of the *_diff_nonzero_or_true cols in that row were True
-        # Add that series as a column to the original df
-        # Remove any rows from the df where is_any_diff_nonzero_or_true is False
-        amendments_df["is_any_diff_nonzero_or_true"] = amendments_df[
-            amendments_df.columns[
-                amendments_df.columns.str.endswith("_diff_nonzero_or_true")
-            ]
-        ].any(axis="columns")
-        amendments_df = amendments_df.loc[amendments_df["is_any_diff_nonzero_or_true"]]
-
-        # Select the row from the updated snapshot, and differences in key variables
-        select_cols = [
-            "reference",
-            "period",
-            "instance",
-            *[col for col in amendments_df.columns if col.endswith("_updated")],
-            *numeric_cols_diff,
-            *non_numeric_cols_diff,
-        ]
-        amendments_df = amendments_df[select_cols]
-        amendments_df.columns = [
-            col.replace("_updated", "") for col in amendments_df.columns
-        ]
+    changed = numeric_changed.any(axis=1) | non_numeric_changed.any(axis=1)
+
+    # Select the row from the updated snapshot, and differences in key variables
+    updated_cols = [
+        col
+        for col in updated_snapshot.columns
+        if col in frozen_csv.columns and col not in KEY_COLS
+    ]
+    numeric_diff_df = pd.DataFrame(
+        numeric_diff[changed], columns=[f"{col}_diff" for col in NUMERIC_COLS]
+    )
+    # Differences of text columns are objects, as when subtracting the columns
+    object_cols = [
+        f"{col}_diff"
+        for col in NUMERIC_COLS
+        if frozen_csv[col].dtype == object or updated_snapshot[col].dtype == object
+    ]
+    numeric_diff_df[object_cols] = numeric_diff_df[object_cols].astype(object)
+    non_numeric_diff_df = pd.DataFrame(
+        np.where(non_numeric_changed, updated_values, np.nan)[changed],
+        columns=[f"{col}_diff" for col in NON_NUMERIC_COLS],
+    )
 
-        # Add markers
-        amendments_df["accept_changes"] = False
+    amendments_df = pd.concat(
+        [
+            updated[KEY_COLS + updated_cols][changed].reset_index(drop=True),
+            numeric_diff_df,
+            non_numeric_diff_df,
+        ],
+        axis=1,
+    )
 
-        return amendments_df
-    else:
-        FreezingLogger.info("No amendments found.")
-        return None
+    # Add markers
+    amendments_df["accept_changes"] = False
+
+    return amendments_df
 
 
 def get_additions(
@@ -264,11 +367,13 @@ def run_comparison(
     Returns:
         None
     """
-    additions_df = get_additions(
+    # Only the records which are new or have changed are compared
+    changed_frozen_data, changed_snapshot = get_changed_records(
         frozen_data_for_comparison, updated_snapshot, FreezingLogger
     )
+    additions_df = get_additions(changed_frozen_data, changed_snapshot, FreezingLogger)
     amendments_df = get_amendments(
-        frozen_data_for_comparison, updated_snapshot, FreezingLogger
+        changed_frozen_data, changed_snapshot, FreezingLogger
     )
     additions_df, amendments_df = bring_together_split_cases(
         additions_df, amendments_df, FreezingLogger
@@ -3,8 +3,11 @@ import itertools
 import re
 import pandas as pd
 
-from src.imputation.tmi_imputation import create_imp_class_col, trim_bounds
-from src.staging.postcode_validation import format_postcodes
+from src.imputation.tmi_imputation import (
+    create_imp_class_col,
+    flag_trims_vectorised,
+)
+from src.staging.postcode_validation import format_postcode_series
 from src.construction.construction_helpers import convert_formtype
 
 good_statuses = ["Clear", "Clear - overridden"]
@@ -84,7 +87,7 @@ def mor_preprocessing(df, backdata, is_2022):
     df["formtype"] = df["formtype"].apply(convert_formtype)
     backdata["formtype"] = backdata["formtype"].apply(convert_formtype)
 
-    backdata["601"] = backdata["601"].apply(format_postcodes)
+    backdata["601"] = format_postcode_series(backdata["601"])
 
     lf_cond = df["formtype"] == "0001"
     stat_cond = df["status"].isin(bad_statuses)
@@ -272,6 +275,11 @@ def calculate_growth_rates(current_df, prev_df, target_vars):
 def calculate_links(gr_df, target_vars, config):
     """Calculate the Means of Ratios (links) for each imp_class
 
+    Growth rate trimming, valid group sizes and links are calculated for all
+    target variables and imputation classes with grouped operations, giving the
+    same result as trimming and averaging each class in turn. Where growth rates
+    are tied at a trimming boundary, ties are broken by original row order.
+
     Args:
         gr_df (pd.DataFrame): DataFrame of growth rates for each target variable
         target_vars ([string]): List of target variables to use.
@@ -280,11 +288,40 @@ def calculate_links(gr_df, target_vars, config):
     Returns:
         pd.DataFrame: DataFrame with calculated links for each imp_class
     """
-    # Apply trimming and calculate means for each imp class
-    gr_df = gr_df.groupby("imp_class")
-    gr_df = gr_df.apply(group_calc_link, target_vars, config)
+    threshold_num = get_threshold_value(config)
+
+    gr_df = gr_df.copy()
+    imp_classes = gr_df["imp_class"]
+
+    for var in target_vars:
+        # Only non-null growth rates are used for trimming and in the mean
+        non_null_mask = gr_df[f"{var}_gr"].notnull()
+
+        gr_df[f"{var}_gr_trim"] = False
+        gr_df.loc[non_null_mask, f"{var}_gr_trim"] = flag_trims_vectorised(
+            gr_df.loc[non_null_mask], f"{var}_gr", config, use_tiebreaks=False
+        )
 
-    # Reorder columns to make QA easier
+        valid_mask = ~gr_df[f"{var}_gr_trim"] & non_null_mask
+        group_size = valid_mask.groupby(imp_classes).transform("sum")
+        group_mean = (
+            gr_df[f"{var}_gr"].where(valid_mask).groupby(imp_classes).transform("mean")
+        )
+
+        gr_df[f"{var}_group_size"] = group_size
+        # If the group is not a valid size the link is set to 1
+        gr_df[f"{var}_link"] = group_mean.where(group_size >= threshold_num, 1.0)
+
+    # Order the rows as the class-by-class calculation left them after sorting by
+    # each growth rate in turn: the last growth rate first, earlier ones breaking ties
+    sort_cols = ["imp_class"] + [f"{var}_gr" for var in reversed(target_vars)]
+    gr_df = gr_df.sort_values(sort_cols)
+
+    return _order_links_columns(gr_df, target_vars)
+
+
+def _order_links_columns(gr_df, target_vars):
+    """Reorder the columns of the links QA dataframe to make QA easier."""
     column_order = ["imp_class", "reference"] + list(
         itertools.chain(
             *[
@@ -316,57 +353,6 @@ def get_threshold_value(config: dict) -> int:
         )
 
 
-def group_calc_link(group, target_vars, config):
-    """Apply the MoR method to each group as part of the groupby operation.
-
-    The calling function `calculate_links` groups the data by imp_class and then calls
-    this function for each group using the .apply() method.
-
-    This function sorts the group by the growth rate, trims the data, calculates the
-    mean growth rate for each variable, which is also called the "link".
-
-    However, if the group is not of a valid size, the link is set to 1.
-
-    Args:
-        group (pd.core.groupby.DataFrameGroupBy): Imputation class group
-        link_vars ([string]): List of the linked variables.
-        config (Dict): Confuration settings
-
-    Returns:
-        pd.core.groupby.DataFrameGroupBy: Group with calculated links.
-    """
-    threshold_num = get_threshold_value(config)
-    for var in target_vars:
-        # Create mask to not use 0s in mean calculation
-        non_null_mask = pd.notnull(group[f"{var}_gr"])
-
-        # Sort the group by the growth rate and then trim
-        group = group.sort_values(f"{var}_gr")
-
-        group[f"{var}_gr_trim"] = False
-        trimmed_bounds, qa = trim_bounds(
-            group.loc[non_null_mask, :], f"{var}_gr", config
-        )
-        group.loc[non_null_mask, f"{var}_gr_trim"] = trimmed_bounds.loc[
-            :, f"{var}_gr_trim"
-        ].values
-
-        num_valid_vars = sum(~group[f"{var}_gr_trim"] & non_null_mask)
-
-        group[f"{var}_group_size"] = num_valid_vars
-
-        # If the group is a valid size, and there are non-null, non-zero values for this
-        # 'var', then calculate the mean
-        if num_valid_vars >= threshold_num:
-            group[f"{var}_link"] = group.loc[
-                ~group[f"{var}_gr_trim"] & non_null_mask, f"{var}_gr"
-            ].mean()
-        # Otherwise the link is set to 1
-        else:
-            group[f"{var}_link"] = 1.0
-    return group
-
-
 def apply_links(cf_df, links_df, target_vars, config, formtype):
     """Apply the links to the carried forwards values.
 
@@ -2,6 +2,7 @@
 """
 
 import logging
+import numpy as np
 import pandas as pd
 from typing import List, Union
 
@@ -11,49 +12,54 @@ ExpansionLogger = logging.getLogger(__name__)
 
 
 def evaluate_imputed_ixx(
-    group: pd.core.groupby.DataFrameGroupBy,
+    df: pd.DataFrame,
     master_col: str,
     break_down_cols: List[Union[str, int]],
 ) -> pd.DataFrame:
     """Evaluate the imputed 2xx or 3xx as the sum of all 2xx or 3xx
     over the sum of all 211 or 305 values, multiplied by the imputed 211.
+
+    The sums are calculated for every imputation class in one groupby, and
+    joined onto the rows where TMI has been applied.
     """
-    # Return the groupby object unaltered if there are no TMI values
-    # in the imputation class
-    TMI_mask = group["imp_marker"] == "TMI"
-    imputed_subgroup = group.loc[TMI_mask]
+    # Return the dataframe unaltered if there are no TMI values
+    TMI_mask = df["imp_marker"] == "TMI"
+    if not TMI_mask.any():
+        return df
 
-    if imputed_subgroup.empty:
-        return group
+    df = df.copy()
 
     # Make cols into str just in case coming through as ints
     bd_cols = [str(col) for col in break_down_cols]
 
-    # Sum the master column, e.g. "211" or "305" for the clear responders
+    # Sum the master column, e.g. "211" or "305", and the breakdown columns for
+    # the clear responders in each imputation class
     clear_statuses = ["Clear", "Clear - overridden"]
-    clear_mask = group["status"].isin(clear_statuses)
-    sum_master_q = group.loc[clear_mask, master_col].sum()  # scalar
-
-    # Find the imputed value for the master col for the current imputation class
-    # As this value is the same for the whole imputation class, we return the first
-    master_imp_val = group.loc[TMI_mask, f"{master_col}_imputed"].values[0]  # scalar
+    clear_mask = df["status"].isin(clear_statuses)
+    sums = df[[master_col] + bd_cols].where(clear_mask).groupby(df["imp_class"]).sum()
+
+    # Find the imputed value for the master col for each imputation class
+    # As this value is the same for the whole imputation class, we take the first
+    imputed_df = df.loc[TMI_mask]
+    master_imp_vals = imputed_df.drop_duplicates("imp_class").set_index("imp_class")[
+        f"{master_col}_imputed"
+    ]
+    master_imp_val = (
+        imputed_df["imp_class"]
+        .map(master_imp_vals)
+        .to_numpy(dtype=float, na_value=np.nan)[:, None]
+    )
 
     # Calculate the value to enter as the imputed value for the breakdown cols
-    for bd_col in bd_cols:
-        # Sum the breakdown q for the (clear) responders
-        sum_breakdown_q = group.loc[clear_mask, bd_col].sum()
+    class_sums = sums.reindex(imputed_df["imp_class"].to_numpy())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = class_sums[bd_cols].to_numpy() / class_sums[[master_col]].to_numpy()
+        imputed_values = np.where(master_imp_val > 0, ratios * master_imp_val, 0)
 
-        # calculate the imputed values
-        if master_imp_val > 0:
-            imputed_value = (sum_breakdown_q / sum_master_q) * master_imp_val
-        else:
-            imputed_value = 0
+    # Update the imputed break-down columns where TMI imputation has been applied
+    df.loc[TMI_mask, [f"{col}_imputed" for col in bd_cols]] = imputed_values
 
-        # Update the imputed break-down columns where TMI imputation has been applied
-        group.loc[TMI_mask, f"{bd_col}_imputed"] = imputed_value
-
-    # Returning updated group and updated QA dict
-    return group
+    return df
 
 
 def run_expansion(df: pd.DataFrame, config: dict):
@@ -84,12 +90,9 @@ def run_expansion(df: pd.DataFrame, config: dict):
     # Filter to exclude the same rows trimmed for 211_trim == False
     trimmed_211_df, nontrimmed_df = split_df_on_trim(filtered_df, "211_trim")
 
-    # Trimmed groups
-    non_trim_grouped = nontrimmed_df.groupby("imp_class", group_keys=False)
-
     # Calculate the imputation values for 2xx questions
-    result_211_df = non_trim_grouped.apply(
-        evaluate_imputed_ixx, "211", break_down_cols=breakdown_qs_2xx
+    result_211_df = evaluate_imputed_ixx(
+        nontrimmed_df, "211", break_down_cols=breakdown_qs_2xx
     )
 
     # Join the 211 expanded df (processed from untrimmed records) back on to
@@ -101,11 +104,8 @@ def run_expansion(df: pd.DataFrame, config: dict):
     # Filter to exclude the same rows trimmed for 305_trim == False
     trimmed_305_df, nontrimmed_df = split_df_on_trim(result_211_df, "305_trim")
 
-    # Groupby imp_class again
-    non_trim_grouped = nontrimmed_df.groupby("imp_class", group_keys=False)
-
-    result_211_305_df = non_trim_grouped.apply(
-        evaluate_imputed_ixx, "305", break_down_cols=breakdown_qs_3xx
+    result_211_305_df = evaluate_imputed_ixx(
+        nontrimmed_df, "305", break_down_cols=breakdown_qs_3xx
     )
 
     # Join the expanded df (processed from untrimmed records) back on to
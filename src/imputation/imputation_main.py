@@ -25,7 +25,7 @@ def run_imputation(
     manual_trimming_df: pd.DataFrame,
     backdata: pd.DataFrame,
     config: Dict[str, Any],
-    write_csv: Callable,
+    write_table: Callable,
     run_id: int,
 ) -> pd.DataFrame:
     """Run all the processes for the imputation module.
@@ -46,7 +46,8 @@ def run_imputation(
             which references should be manually trimmed in imputation
         backdata (pd.DataFrame): previous year's data
         config (dict): the configuration settings.
-        write_csv (Callable): function to write a dataframe to a csv file
+        write_table (Callable): function to write a dataframe to csv, parquet
+            and/or feather files
         run_id (int): unique identifier for the run
 
     Returns:
@@ -152,11 +153,18 @@ def run_imputation(
         schema_dict = load_schema(schema_path)
         trimming_qa_output = create_output_df(qa_df, schema_dict)
 
-        write_csv(os.path.join(qa_path, trim_qa_filename), trimming_qa_output)
-        write_csv(os.path.join(qa_path, full_imp_filename), imputed_df)
-        write_csv(os.path.join(qa_path, wrong_604_filename), wrong_604_qa_df)
-        write_csv(os.path.join(qa_path, links_filename), links_df)
-        write_csv(os.path.join(qa_path, trimmed_counts_filename), trim_counts_qa)
+        qa_formats = config["qa_output_formats"]["imputation_qa"]
+        write_table(
+            os.path.join(qa_path, trim_qa_filename), trimming_qa_output, qa_formats
+        )
+        write_table(os.path.join(qa_path, full_imp_filename), imputed_df, qa_formats)
+        write_table(
+            os.path.join(qa_path, wrong_604_filename), wrong_604_qa_df, qa_formats
+        )
+        write_table(os.path.join(qa_path, links_filename), links_df, qa_formats)
+        write_table(
+            os.path.join(qa_path, trimmed_counts_filename), trim_counts_qa, qa_formats
+        )
 
     # remove rows and columns no longer needed from the imputed dataframe
     imputed_df = hlp.tidy_imputation_dataframe(imputed_df, to_impute_cols)
@@ -164,12 +172,31 @@ def run_imputation(
     # Check the imputed values are consistent with breakdown cols summing to totals.
     run_breakdown_validation(imputed_df, config, check="imputed")
 
-    # optionally output backdata for imputation
+    return imputed_df
+
+
+def write_backdata(
+    imputed_df: pd.DataFrame,
+    config: Dict[str, Any],
+    write_csv: Callable,
+    run_id: int,
+) -> None:
+    """Optionally output the backdata for the next year's imputation.
+
+    The backdata is created from the imputed dataframe alone, so it is written
+    outside run_imputation, and also when imputation is loaded from a checkpoint.
+
+    Args:
+        imputed_df (pd.DataFrame): the dataframe returned by run_imputation
+        config (dict): the configuration settings.
+        write_csv (Callable): function to write a dataframe to a csv file
+        run_id (int): unique identifier for the run
+    """
     if config["global"]["output_backdata"]:
         ImputationMainLogger.info("Outputting backdata for imputation.")
+        tdate = datetime.now().strftime("%y-%m-%d")
+        survey_year = config["survey"]["survey_year"]
         backdata_path = config["imputation_paths"]["backdata_out_path"]
         backdata_filename = f"{survey_year}_backdata_{tdate}_v{run_id}.csv"
         new_backdata = hlp.create_new_backdata(imputed_df, config)
         write_csv(os.path.join(backdata_path, backdata_filename), new_backdata)
-
-    return imputed_df
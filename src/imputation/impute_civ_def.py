@@ -3,6 +3,7 @@ doesn't impact on the readability of the existing code. """
 import logging
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from typing import Dict, Tuple
 
 from src.imputation import tmi_imputation as tmi
@@ -144,6 +145,22 @@ def _get_random_civdef(ref: int, proportions: Tuple[float, float]) -> str:
     return value
 
 
+@lru_cache(maxsize=None)
+def _get_seeded_draws() -> np.ndarray:
+    """Get the first uniform draw of the NumPy RNG for each reference seed.
+
+    `_get_random_civdef` seeds the legacy NumPy RNG with `ref % 1000`, so there
+    are only 1000 possible draws. These are generated once, using a separate
+    RandomState for each seed so the global RNG state is left untouched.
+
+    Returns:
+        np.ndarray: The uniform draw for each seed, indexed by the seed.
+    """
+    return np.array(
+        [np.random.RandomState(seed).random_sample() for seed in range(1000)]
+    )
+
+
 def assign_random_civdef(
     df: pd.DataFrame, proportions: Tuple[float, float]
 ) -> pd.DataFrame:
@@ -153,6 +170,10 @@ def assign_random_civdef(
     Each assignment is based on a seed derived from the reference column, so will
     always be the same for the same reference, provided the proportions remain the same.
 
+    The values are the same as those given by `_get_random_civdef`, but the draws
+    for each seed are precomputed and compared with the cumulative proportions in
+    one array operation, as is done inside `np.random.choice`.
+
     Args:
         df (pd.DataFrame): The dataframe to create the imputed column within.
         proportions (Tuple[float, float]): The proportions of C and D.
@@ -160,10 +181,13 @@ def assign_random_civdef(
     Returns:
         pd.DataFrame: The updated dataframe.
     """
+    seeds = df["reference"].astype("int64").to_numpy() % 1000
+    draws = _get_seeded_draws()[seeds]
 
-    df["200_imputed"] = df["reference"].apply(
-        lambda x: _get_random_civdef(int(x), proportions)
-    )
+    cdf = np.cumsum(np.asarray(proportions, dtype="float64"))
+    cdf /= cdf[-1]
+
+    df["200_imputed"] = np.where(draws < cdf[0], "C", "D")
     return df
 
 
@@ -1,5 +1,6 @@
 """Module containing all functions relating to short form expansion."""
-from typing import List, Union
+from typing import List
+import numpy as np
 import pandas as pd
 import logging
 
@@ -12,81 +13,59 @@ formtype_long = "0001"
 formtype_short = "0006"
 
 
-def expansion_impute(
-    group: pd.core.groupby.DataFrameGroupBy,
-    master_col: str,
-    trim_col: str,
-    group_type: str,
-    threshold_num: int,
-    break_down_cols: List[Union[str, int]],
+def group_breakdown_ratios(
+    df: pd.DataFrame,
+    group_col: str,
+    master_values: List,
+    breakdown_dict: dict,
 ) -> pd.DataFrame:
-    """Calculate the expansion imputated values for short forms using long form data"""
-    group_copy = group.copy()
-
-    # Make cols into str just in case coming through as ints
-    bd_cols = [str(col) for col in break_down_cols]
-
-    # Make long and short masks
-    long_mask = group_copy["formtype"] == formtype_long
-    short_mask = group_copy["formtype"] == formtype_short
-
-    # Create mask for clear responders
+    """Calculate the breakdown ratios of the long form responders in each group.
+
+    The master and breakdown values of the clear, untrimmed long form responders
+    are summed in one groupby for every master value, along with the number of
+    responders with a positive master value.
+
+    Args:
+        df (pd.DataFrame): The dataframe to calculate the ratios from.
+        group_col (str): The column to group by, "200" or "imp_class".
+        master_values (List): The master columns, e.g. "211" or "305".
+        breakdown_dict (dict): The breakdown columns of each master column.
+
+    Returns:
+        pd.DataFrame: The ratio of the sum of each breakdown to the sum of its
+            master, or 0 where the master sums to 0, under (master, breakdown)
+            columns, and the number of positive responders under
+            (master, "num_positive") columns, with a row for each group.
+    """
+    long_mask = df["formtype"] == formtype_long
     clear_statuses = ["Clear", "Clear - overridden"]
-    clear_mask = group_copy["status"].isin(clear_statuses)
-
-    # Create a mask to exclude trimmed values
-    exclude_trim_mask = group_copy[trim_col].isin([False])
-
-    # Create a mask to exclude short froms imputed by MoR or CF
-    excl_mor_mask = group_copy["imp_marker"].isin(["R", "TMI", "constructed"])
+    long_clear_mask = long_mask & df["status"].isin(clear_statuses)
 
-    # Masks to select correct records for summing
-    long_responder_mask = clear_mask & long_mask & exclude_trim_mask
-    to_expand_mask = short_mask & excl_mor_mask
-
-    # Condition for positive values in the master column
-    pos_cond = group_copy[master_col] > 0
-    # Calculate the number of non-zero long-form clear responders in the master column
-    threshold_check = len(group_copy.loc[(long_responder_mask & pos_cond), master_col])
-
-    # If there are fewer than "threshold_num" non-zero clear responders in the
-    # imputation class then do not attempt to calculate the breakdowns at the imputation
-    # class level. In this case the values previously calculated in the
-    # "civil defence fallback" group will be used instead.
-
-    if (group_type == "imp_class_group") & (threshold_check <= threshold_num):
-        return group_copy
-
-    # Get long forms only for summing the master_col (scalar value)
-    sum_master_q_lng = group_copy.loc[long_responder_mask, master_col].sum()
-
-    # We calculate breakdown values for both responder and imputed short form rows
-    # Get the master (e.g. 211) value for all short form rows (will be a vector)
-    # Note: the _imputed columns contain both original and imputed values.
-    master_col_imputed = f"{master_col}_imputed"
-    returned_master_vals = group_copy.loc[to_expand_mask, master_col_imputed]
-
-    # Calculate the imputation columns for the breakdown questions
-    for bd_col in bd_cols:
-        # Sum the breakdown q for the (clear) responders
-        sum_breakdown_q = group_copy.loc[long_responder_mask, bd_col].sum()
-
-        # Calculate the values of the imputation column
-        if sum_master_q_lng > 0:
-            scale_factor = sum_breakdown_q / sum_master_q_lng
-        else:
-            scale_factor = 0
+    # Mask out the values of all but the responders, so they are not summed
+    responder_values = {}
+    for master_value in master_values:
+        # the "305" case is based on different trimming
+        trim_col = "305_trim" if master_value == "305" else "211_trim"
+        responder_mask = long_clear_mask & df[trim_col].isin([False])
 
-        imputed_sf_vals = scale_factor * returned_master_vals
+        bd_cols = [str(col) for col in breakdown_dict[master_value]]
+        for col in [master_value] + bd_cols:
+            responder_values[(master_value, col)] = df[col].where(responder_mask)
+        responder_values[(master_value, "num_positive")] = responder_mask & (
+            df[master_value] > 0
+        )
 
-        # Write imputed value to all records
-        group_copy.loc[to_expand_mask, f"{bd_col}_imputed"] = imputed_sf_vals
+    sums = pd.DataFrame(responder_values).groupby(df[group_col]).sum()
 
-    # Indicate how the short_form expansion has been computed, whether with the
-    # civil and defence fallback, or by imputation class.
-    group_copy[f"{master_col}_sf_exp_grouping"] = group_type
+    ratios = {}
+    for master_value in master_values:
+        master_sum = sums[(master_value, master_value)]
+        for bd_col in [str(col) for col in breakdown_dict[master_value]]:
+            ratio = sums[(master_value, bd_col)] / master_sum
+            ratios[(master_value, bd_col)] = ratio.where(master_sum > 0, 0)
+        ratios[(master_value, "num_positive")] = sums[(master_value, "num_positive")]
 
-    return group_copy
+    return pd.DataFrame(ratios)
 
 
 # @df_change_func_wrap
@@ -96,7 +75,17 @@ def apply_expansion(
     breakdown_dict: dict,
     threshold_num: int = 3,
 ):
-    # Renaming this df to use in the for loop
+    """Calculate the expansion imputed breakdown values of the short forms.
+
+    The breakdown values of the short forms are their imputed master value
+    multiplied by the ratio of the breakdown to the master for the long form
+    responders in their imputation class. If there are "threshold_num" or fewer
+    non-zero responders in the imputation class, the ratio for the civil or
+    defence group is used instead.
+
+    The ratios of every group are calculated at once, and joined onto the short
+    forms to expand.
+    """
     expanded_df = df.copy()
 
     # Cast nulls in the boolean trim columns to False
@@ -104,48 +93,53 @@ def apply_expansion(
         ["211_trim", "305_trim"]
     ].fillna(False)
 
-    for master_value in master_values:
-        # exclude the "305" case which will be based on different trimming
-        if master_value == "305":
-            trim_col = "305_trim"
-        else:
-            trim_col = "211_trim"
-
-        SFExpansionLogger.debug(f"Processing exansion imputation for {master_value}")
-
-        # for a first pass, group by civil or defence only
-        groupby_obj_cd = expanded_df.groupby("200", group_keys=False)
+    # Join the ratios of the civil or defence group and of the imputation class
+    # onto each row
+    cd_ratios = group_breakdown_ratios(
+        expanded_df, "200", master_values, breakdown_dict
+    ).reindex(expanded_df["200"].to_numpy())
+    imp_class_ratios = group_breakdown_ratios(
+        expanded_df, "imp_class", master_values, breakdown_dict
+    ).reindex(expanded_df["imp_class"].to_numpy())
 
-        # Calculate the imputation values for master question
-        expanded_df = groupby_obj_cd.apply(
-            expansion_impute,
-            master_value,
-            trim_col,
-            "civil_defence_fallback",
-            threshold_num,
-            break_down_cols=breakdown_dict[master_value],
-        )  # returns a dataframe
-
-        expanded_df.reset_index(drop=True, inplace=True)
-
-        # For the second pass, group by imputation class
-        groupby_obj_impcl = expanded_df.groupby("imp_class", group_keys=False)
-
-        # Calculate the imputation values for master question
-        expanded_df = groupby_obj_impcl.apply(
-            expansion_impute,
-            master_value,
-            trim_col,
-            "imp_class_group",
-            threshold_num,
-            break_down_cols=breakdown_dict[master_value],
-        )  # returns a dataframe
+    # Short forms imputed by MoR or TMI, or constructed, are expanded
+    short_mask = expanded_df["formtype"] == formtype_short
+    to_expand_mask = (
+        short_mask
+        & expanded_df["imp_marker"].isin(["R", "TMI", "constructed"])
+        & expanded_df["200"].notna()
+    ).to_numpy()
 
-        expanded_df.reset_index(drop=True, inplace=True)
+    for master_value in master_values:
+        SFExpansionLogger.debug(f"Processing exansion imputation for {master_value}")
+        bd_cols = [str(col) for col in breakdown_dict[master_value]]
+        ratio_cols = [(master_value, col) for col in bd_cols]
+
+        # Fall back to the civil or defence group where there are too few
+        # non-zero responders in the imputation class
+        num_positive = imp_class_ratios[(master_value, "num_positive")]
+        use_imp_class = (num_positive > threshold_num).to_numpy()
+        ratios = np.where(
+            use_imp_class[:, None],
+            imp_class_ratios[ratio_cols].to_numpy(),
+            cd_ratios[ratio_cols].to_numpy(),
+        )
+
+        # Indicate how the short_form expansion has been computed, whether with
+        # the civil and defence fallback, or by imputation class.
+        expanded_df[f"{master_value}_sf_exp_grouping"] = np.where(
+            use_imp_class, "imp_class_group", "civil_defence_fallback"
+        )
+
+        # Note: the _imputed columns contain both original and imputed values.
+        master_vals = expanded_df.loc[
+            to_expand_mask, f"{master_value}_imputed"
+        ].to_numpy(dtype=float, na_value=np.nan)
+        expanded_df.loc[to_expand_mask, [f"{col}_imputed" for col in bd_cols]] = (
+            ratios[to_expand_mask] * master_vals[:, None]
+        )
 
     # Calculate the headcount_m and headcount_f imputed values by summing
-    short_mask = expanded_df["formtype"] == formtype_short
-
     expanded_df.loc[short_mask, "headcount_tot_m_imputed"] = (
         expanded_df["headcount_res_m_imputed"]
         + expanded_df["headcount_tec_m_imputed"]
@@ -203,7 +197,7 @@ def run_sf_expansion(df: pd.DataFrame, config: dict) -> pd.DataFrame:
     # (this is the minimum viable number in an imputation class)
     threshold_num = config["imputation"]["sf_expansion_threshold"]
 
-    # Run the `expansion_impute` function in a for-loop via `apply_expansion`
+    # Calculate the short form breakdowns via `apply_expansion`
     expanded_df = apply_expansion(
         filtered_df,
         master_values,
@@ -358,6 +358,177 @@ def create_mean_dict(
     return mean_dict, df, full_qa
 
 
+def flag_trims_vectorised(
+    df: pd.DataFrame,
+    variable: str,
+    config: Dict[str, Any],
+    use_tiebreaks: bool = True,
+) -> pd.Series:
+    """Flag the rows to be trimmed for a variable across all imputation classes.
+
+    This is the vectorised equivalent of applying `sort_df` and `trim_bounds` to
+    each imputation class in turn. Rows are ranked within their class by the
+    target variable (ascending), employees (descending) and reference (ascending),
+    and the same positional bounds as `trim_bounds` are then applied to the ranks.
+
+    Args:
+        df (pd.DataFrame): The clear responses with valid imputation classes.
+        variable (str): The target variable to flag trimmed rows for.
+        config (Dict[str, Any]): The pipeline configuration settings.
+        use_tiebreaks (bool): Whether to break ties in the variable using
+            employees and reference. If False, ties keep their original order.
+            Defaults to True.
+
+    Returns:
+        pd.Series: Bool series, aligned to df, which is True for trimmed rows.
+    """
+    trim_threshold = config["imputation"]["trim_threshold"]
+    lower_perc = config["imputation"]["lower_trim_perc"]
+    upper_perc = config["imputation"]["upper_trim_perc"]
+
+    if use_tiebreaks:
+        sorted_df = df.sort_values(
+            by=["imp_class", variable, "employees", "reference"],
+            ascending=[True, True, False, True],
+        )
+    else:
+        sorted_df = df.sort_values(by=["imp_class", variable], ascending=True)
+    grp = sorted_df.groupby("imp_class", sort=False)
+
+    # position of each row within its sorted imputation class
+    position = grp.cumcount()
+    class_size = grp[variable].transform("size")
+    num_positive = (sorted_df[variable] > 0).groupby(sorted_df["imp_class"]).transform(
+        "sum"
+    )
+
+    remove_lower = np.ceil(num_positive * (lower_perc / 100))
+    remove_upper = np.ceil(num_positive * (upper_perc / 100))
+
+    # trim_bounds keeps the (inclusive) label slice between these two positions
+    keep_mask = (position >= remove_lower - 1) & (
+        position <= class_size - remove_upper
+    )
+    trim_mask = (num_positive > trim_threshold) & ~keep_mask
+
+    return trim_mask.reindex(df.index)
+
+
+def create_mean_dict_vectorised(
+    df: pd.DataFrame,
+    target_variable_list: List[str],
+    config: Dict[str, Any],
+) -> Tuple[Dict, pd.DataFrame, pd.DataFrame]:
+    """Calculate trimmed means for all target variables and classes at once.
+
+    Produces the same mean dictionary, QA dataframe and trim counts as
+    `create_mean_dict`, but computes the trimming flags, means and counts with
+    grouped operations over the whole clear dataframe instead of looping over
+    each target variable and imputation class.
+
+    Args:
+        df (pd.DataFrame): The dataframe for imputation.
+        target_variable_list (List(str)): A list of target variables for which the
+            mean is to be evaluated.
+        config: Dict[str, Any]: The pipeline configuration settings.
+
+    Returns:
+        Tuple[Dict, pd.DataFrame, pd.DataFrame]
+    """
+    TMILogger.debug("Creating mean dictionaries (vectorised)")
+    trim_threshold = config["imputation"]["trim_threshold"]
+
+    # Create an empty dict to store means
+    mean_dict = dict.fromkeys(target_variable_list)
+
+    # Filter for clear statuses
+    clear_statuses = ["210", "211"]
+    filtered_df = filter_by_column_content(df, "statusencoded", clear_statuses)
+
+    # Filter out imputation classes that are missing either "200" or "201"
+    filtered_df = filtered_df[~(filtered_df["imp_class"].str.contains("nan"))]
+
+    qa_df = filtered_df.sort_index(kind="stable")
+
+    classes = qa_df["imp_class"]
+    class_size = classes.value_counts().sort_index()
+
+    trim_qa_dfs = []
+    for i, var in enumerate(target_variable_list):
+        trim_mask = flag_trims_vectorised(qa_df, var, config)
+        values = qa_df[var].astype("float")
+        kept_values = values.where(~trim_mask)
+
+        if i == 0:
+            # the QA trim check is taken from the first target variable
+            num_positive = (values > 0).groupby(classes).transform("sum")
+            qa_df["trim_check"] = np.where(
+                num_positive > trim_threshold,
+                "above_trim_threshold",
+                "below_trim_threshold",
+            )
+        qa_df[f"{var}_trim"] = trim_mask
+
+        class_stats = pd.DataFrame(
+            {
+                "mean": kept_values.groupby(classes).mean(),
+                "count": kept_values.groupby(classes).count(),
+                "trimmed_count": (~trim_mask).groupby(classes).sum(),
+                "zero_count": (values == 0).groupby(classes).sum(),
+            }
+        ).reindex(class_size.index)
+
+        var_means = {}
+        for imp_class, mean, count in zip(
+            class_stats.index, class_stats["mean"], class_stats["count"]
+        ):
+            var_means[f"{var}_{imp_class}_mean"] = mean
+            var_means[f"{var}_{imp_class}_count"] = count
+        mean_dict[var] = var_means
+
+        trim_qa = pd.DataFrame(
+            {
+                f"{var}_trimmed_count": class_stats["trimmed_count"].values,
+                f"{var}_zero_count": class_stats["zero_count"].values,
+                "imp_class": class_size.index,
+                "clear_class_size": class_size.values,
+            },
+            index=[0] * len(class_size),
+        )
+        trim_qa_dfs.append(trim_qa)
+
+    full_qa = pd.concat(trim_qa_dfs, axis=0)
+    qa_df["qa_index"] = qa_df.index
+    qa_df = qa_df.reset_index(drop=True)
+
+    return mean_dict, qa_df, full_qa
+
+
+def calculate_means(
+    df: pd.DataFrame,
+    target_variable_list: List[str],
+    config: Dict[str, Any],
+) -> Tuple[Dict, pd.DataFrame, pd.DataFrame]:
+    """Calculate TMI means using the engine selected in the config.
+
+    The vectorised engine is used when `vectorised_tmi` is set in the imputation
+    section of the config, otherwise the class-by-class `create_mean_dict` is used.
+    The same setting selects how the means are applied, see `impute_means`.
+
+    Args:
+        df (pd.DataFrame): The dataframe for imputation.
+        target_variable_list (List(str)): A list of target variables for which the
+            mean is to be evaluated.
+        config: Dict[str, Any]: The pipeline configuration settings.
+
+    Returns:
+        Tuple[Dict, pd.DataFrame, pd.DataFrame]
+    """
+    if config["imputation"]["vectorised_tmi"]:
+        return create_mean_dict_vectorised(df, target_variable_list, config)
+    return create_mean_dict(df, target_variable_list, config)
+
+
 def apply_tmi(
     df: pd.DataFrame, target_variables: list, mean_dict: dict
 ) -> pd.DataFrame:
@@ -411,6 +582,116 @@ def apply_tmi(
     return final_df
 
 
+def create_mean_table(
+    mean_dict: Dict, target_variables: List[str]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Convert the dictionary of TMI means to a table with a row per imp_class.
+
+    Args:
+        mean_dict (Dict): A dictionary of means, as created by `create_mean_dict`.
+        target_variables (list): The target variables for TMI imputation.
+
+    Returns:
+        pd.DataFrame: The mean for each imputation class (rows) and variable.
+        pd.DataFrame: Bool table showing whether a mean exists for the class and
+            variable, since a mean can itself be null.
+    """
+    var_means = {}
+    for var in target_variables:
+        prefix, suffix = f"{var}_", "_mean"
+        var_means[var] = pd.Series(
+            {
+                key[len(prefix) : -len(suffix)]: value
+                for key, value in (mean_dict[var] or {}).items()
+                if key.endswith(suffix)
+            },
+            dtype="float",
+        )
+
+    mean_table = pd.DataFrame(var_means, columns=target_variables)
+    found_table = pd.DataFrame(
+        {var: pd.Series(True, index=means.index) for var, means in var_means.items()},
+        index=mean_table.index,
+        columns=target_variables,
+    )
+    found_table = found_table.fillna(False).astype(bool)
+
+    return mean_table, found_table
+
+
+def apply_tmi_vectorised(
+    df: pd.DataFrame, target_variables: list, mean_dict: dict
+) -> pd.DataFrame:
+    """Replace the unclear statuses with the mean values in a single operation.
+
+    This gives the same result as `apply_tmi`, but rather than updating the
+    dataframe for each variable and imputation class in turn, the means are
+    arranged as a table with a row for each imputation class and broadcast onto
+    all the rows requiring imputation at once.
+
+    Args:
+        df (pd.DataFrame): The dataframe to add imputed values to.
+        target_variables (list): The target variables for TMI imputation.
+        mean_dict (Dict): A dictionary of means.
+
+    Returns:
+        pd.DataFrame: The passed dataframe with TMI imputation applied.
+    """
+    df = df.copy()
+
+    # Exclude imputation classes where 200 or 201 are missing, as in apply_tmi
+    to_impute_mask = df["status"].isin(["Form sent out", "Check needed"]) & ~(
+        df["imp_class"].str.contains("nan")
+    )
+    if not to_impute_mask.any():
+        return df
+
+    imp_classes = df.loc[to_impute_mask, "imp_class"]
+    imputed_cols = [f"{var}_imputed" for var in target_variables]
+
+    mean_table, found_table = create_mean_table(mean_dict, target_variables)
+    class_means = mean_table.reindex(imp_classes).to_numpy(dtype="float")
+    class_found = found_table.reindex(imp_classes).fillna(False).to_numpy(dtype=bool)
+
+    # where no mean exists for the class the original value is used
+    original_values = df.loc[to_impute_mask, target_variables].to_numpy(dtype="float")
+    current_values = df.loc[to_impute_mask, imputed_cols].to_numpy(dtype="float")
+
+    new_values = np.where(class_found, class_means, original_values)
+    # null values never overwrite existing ones, in line with DataFrame.update
+    new_values = np.where(np.isnan(new_values), current_values, new_values)
+
+    df.loc[to_impute_mask, imputed_cols] = new_values
+    # the marker is set from the last target variable, as in apply_tmi
+    df.loc[to_impute_mask, "imp_marker"] = np.where(
+        class_found[:, -1], "TMI", "No mean found"
+    )
+
+    return df
+
+
+def impute_means(
+    df: pd.DataFrame,
+    target_variables: list,
+    mean_dict: dict,
+    config: Dict[str, Any],
+) -> pd.DataFrame:
+    """Apply the TMI means using the engine selected in the config.
+
+    Args:
+        df (pd.DataFrame): The dataframe to add imputed values to.
+        target_variables (list): The target variables for TMI imputation.
+        mean_dict (Dict): A dictionary of means.
+        config (Dict[str, Any]): The pipeline configuration settings.
+
+    Returns:
+        pd.DataFrame: The passed dataframe with TMI imputation applied.
+    """
+    if config["imputation"]["vectorised_tmi"]:
+        return apply_tmi_vectorised(df, target_variables, mean_dict)
+    return apply_tmi(df, target_variables, mean_dict)
+
+
 def run_longform_tmi(
     longform_df: pd.DataFrame,
     config: Dict[str, Any],
@@ -435,14 +716,14 @@ def run_longform_tmi(
     df = tmi_pre_processing(df, lf_target_variables)
 
     TMILogger.info("Starting TMI mean calculations.")
-    mean_dict, qa_df, trim_counts_qa = create_mean_dict(df, lf_target_variables, config)
+    mean_dict, qa_df, trim_counts_qa = calculate_means(df, lf_target_variables, config)
     trim_counts_qa["formtype"] = "0001"
 
     qa_df.set_index("qa_index", drop=True, inplace=True)
     qa_df = qa_df.drop("trim_check", axis=1)
 
     # apply the imputed values to the statuses requiring imputation
-    tmi_df = apply_tmi(df, lf_target_variables, mean_dict)
+    tmi_df = impute_means(df, lf_target_variables, mean_dict, config)
 
     tmi_df.loc[qa_df.index, "211_trim"] = qa_df["211_trim"]
     tmi_df.loc[qa_df.index, "305_trim"] = qa_df["305_trim"]
@@ -480,14 +761,14 @@ def run_shortform_tmi(
 
     df = tmi_pre_processing(to_impute_df, sf_target_variables)
 
-    mean_dict, qa_df, trim_counts_qa = create_mean_dict(df, sf_target_variables, config)
+    mean_dict, qa_df, trim_counts_qa = calculate_means(df, sf_target_variables, config)
     trim_counts_qa["formtype"] = "0006"
 
     qa_df.set_index("qa_index", drop=True, inplace=True)
     qa_df = qa_df.drop("trim_check", axis=1)
 
     # apply the imputed values to the statuses requiring imputation
-    tmi_df = apply_tmi(df, sf_target_variables, mean_dict)
+    tmi_df = impute_means(df, sf_target_variables, mean_dict, config)
 
     tmi_df.loc[qa_df.index, "211_trim"] = qa_df["211_trim"]
     tmi_df.loc[qa_df.index, "305_trim"] = qa_df["305_trim"]
@@ -21,7 +21,7 @@ def run_mapping(
     postcode_mapper,
     config: dict,
     rd_read_csv: Callable,
-    rd_write_csv: Callable,
+    rd_write_table: Callable,
     rd_file_exists: Callable,
     run_id: int,
 ):
@@ -33,7 +33,8 @@ def run_mapping(
         postcode_mapper (pd.DataFrame): The postcode mapper dataframe.
         config (dict): The configuration settings.
         rd_read_csv (Callable): Function to read a csv file.
-        rd_write_csv (Callable): Function to write a dataframe to a csv file.
+        rd_write_table (Callable): Function to write a dataframe to csv, parquet
+            and/or feather files.
         rd_file_exists (Callable): Function to check if a file exists.
         run_id (int): Unique identifier for the run.
 
@@ -127,7 +128,11 @@ def run_mapping(
         full_responses_filename = (
             f"{survey_year}_full_responses_mapped_{tdate}_v{run_id}.csv"
         )
-        rd_write_csv(os.path.join(qa_path, full_responses_filename), full_responses)
+        rd_write_table(
+            os.path.join(qa_path, full_responses_filename),
+            full_responses,
+            config["qa_output_formats"]["mapping_qa"],
+        )
     MappingMainLogger.info("Finished Mapping QA calculation.")
 
     if config["global"]["output_mapping_ni_qa"] and not ni_full_responses.empty:
@@ -135,8 +140,10 @@ def run_mapping(
         full_responses_NI_filename = (
             f"{survey_year}_full_responses_ni_mapped_{tdate}_v{run_id}.csv"
         )
-        rd_write_csv(
-            os.path.join(qa_path, full_responses_NI_filename), ni_full_responses
+        rd_write_table(
+            os.path.join(qa_path, full_responses_NI_filename),
+            ni_full_responses,
+            config["qa_output_formats"]["mapping_ni_qa"],
         )
     MappingMainLogger.info("Finished Mapping NI QA calculation.")
 
@@ -1,5 +1,6 @@
 """Apply outlier detection to the dataset."""
 import logging
+import numpy as np
 import pandas as pd
 from typing import List
 import math
@@ -55,23 +56,40 @@ def filter_valid(df: pd.DataFrame, value_col: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The filtered dataframe
     """
-    sample_cond = df.selectiontype == "P"
-    status_cond = df["status"].isin(["Clear", "Clear - overridden"])
     pos_cond = df[value_col] > 0
-    ins_cond = df["instance"] == 0
 
-    filtered_df = df[sample_cond & status_cond & pos_cond & ins_cond].copy()
+    filtered_df = df[valid_responses(df) & pos_cond].copy()
 
     if filtered_df.empty:
-        AutoOutlierLogger.error(
-            f"column {value_col} has no valid returns for outliers."
-            "This column should not be considered for outliers."
-        )
-        raise ValueError
+        _no_valid_returns(value_col)
 
     return filtered_df
 
 
+def valid_responses(df: pd.DataFrame) -> pd.Series:
+    """Get the rows of PRN sampled data with a clear status, at instance 0.
+
+    Args:
+        df (pd.DataFrame): The dataframe of responses.
+
+    Returns:
+        pd.Series: Boolean mask of the valid responses.
+    """
+    sample_cond = df.selectiontype == "P"
+    status_cond = df["status"].isin(["Clear", "Clear - overridden"])
+    ins_cond = df["instance"] == 0
+    return sample_cond & status_cond & ins_cond
+
+
+def _no_valid_returns(value_col: str):
+    """Log and raise an error for a column with no valid returns."""
+    AutoOutlierLogger.error(
+        f"column {value_col} has no valid returns for outliers."
+        "This column should not be considered for outliers."
+    )
+    raise ValueError
+
+
 def flag_outliers(
     df: pd.DataFrame, upper_clip: float, lower_clip: float, value_col: str
 ) -> pd.DataFrame:
@@ -86,52 +104,70 @@ def flag_outliers(
         pd.DataFrame: The same dataframe with a new boolean column indicating
                         whether the column 'value_col' is an outlier.
     """
+    return flag_all_outliers(df, upper_clip, lower_clip, [value_col])
+
+
+def flag_all_outliers(
+    df: pd.DataFrame,
+    upper_clip: float,
+    lower_clip: float,
+    flag_value_cols: List[str],
+) -> pd.DataFrame:
+    """Create Boolean columns to flag outliers in all the given columns at once.
+
+    The valid, positive values of every column are counted and ranked within
+    their cell number and period in one groupby. The flag of a valid response is
+    given to every row of that reference in the same cell number and period.
+
+    Args:
+        df (pd.DataFrame): The dataframe used for finding outliers
+        upper_clip (float): The percentage for upper clipping as float
+        lower_clip (float): The percentage for lower clipping as float
+        flag_value_cols (List[str]): The names of the columns to flag
+    Returns:
+        pd.DataFrame: The same dataframe with a boolean column for each column
+                        in flag_value_cols indicating whether it is an outlier.
+    """
     # Define groups for outliers: cell number and period
     groupby_cols = ["period", "cellnumber"]
 
     # Define RU reference column
     ruref_col = "reference"
 
-    # Filter for valid sampled data and positive values in the value column
-    filtered_df = filter_valid(df, value_col)
+    # Only the valid sampled data with positive values are used, others are null
+    valid = valid_responses(df).to_numpy()
+    valid_df = df.loc[valid, groupby_cols + flag_value_cols]
+    values = valid_df[flag_value_cols]
+    values = values.where((values > 0).fillna(False))
+    for value_col in flag_value_cols:
+        if values[value_col].isnull().all():
+            _no_valid_returns(value_col)
 
-    # Add group count - how many RU refs there are in a cell, perod
-    filtered_df["group_count"] = filtered_df.groupby(groupby_cols)[value_col].transform(
-        "count"
-    )  # noqa
+    # Group count and rank of each value in its cell and period, for all columns
+    grouped = values.groupby([valid_df[col] for col in groupby_cols])
+    group_count = grouped.transform("count").to_numpy(dtype=float)
+    group_rank = grouped.rank(method="first", ascending=True).to_numpy(dtype=float)
 
     # Rank margins
-    filtered_df["high"] = filtered_df["group_count"] * upper_clip
-    filtered_df["high_rounded"] = filtered_df.apply(
-        lambda row: normal_round(row["high"]), axis=1
-    )
-    filtered_df["upper_band"] = filtered_df["group_count"] - filtered_df["high_rounded"]
-
-    filtered_df["low"] = filtered_df["group_count"] * lower_clip
-    filtered_df["lower_band"] = filtered_df.apply(
-        lambda row: normal_round(row["low"]), axis=1
-    )
+    upper_band = group_count - normal_round_array(group_count * upper_clip)
+    lower_band = normal_round_array(group_count * lower_clip)
 
-    # Ranks of RU refs in each group, depending on their value
-    filtered_df["group_rank"] = filtered_df.groupby(groupby_cols)[value_col].rank(
-        method="first", ascending=True
-    )
+    # Outlier conditions. Null ranks, for values which are not valid, are False
+    outlier_cond = (group_rank > upper_band) | (group_rank <= lower_band)
 
-    # Outlier conditions
-    outlier_cond = (filtered_df["group_rank"] > filtered_df["upper_band"]) | (
-        filtered_df["group_rank"] <= filtered_df["lower_band"]
+    # Share the flags between the rows of each reference in a cell and period
+    ref_ids = (
+        df.groupby(groupby_cols + [ruref_col], sort=False, dropna=False)
+        .ngroup()
+        .to_numpy()
     )
+    ref_flags = np.zeros((ref_ids.max() + 1, len(flag_value_cols)), dtype=bool)
+    outlier_rows, outlier_cols = np.nonzero(outlier_cond)
+    ref_flags[ref_ids[valid][outlier_rows], outlier_cols] = True
 
-    # Create outlier flag
-    filtered_df[f"{value_col}_outlier_flag"] = outlier_cond
-
-    # Select columns that would be joined back to main df
-    cols_sel = groupby_cols + [ruref_col, f"{value_col}_outlier_flag"]
-    filtered_df = filtered_df[cols_sel]
-
-    # merge back to the original df
-    df = df.merge(filtered_df, how="left", on=groupby_cols + [ruref_col])
-    df[f"{value_col}_outlier_flag"] = df[f"{value_col}_outlier_flag"].fillna(False)
+    # Create outlier flags
+    for i, value_col in enumerate(flag_value_cols):
+        df[f"{value_col}_outlier_flag"] = ref_flags[ref_ids, i]
 
     return df
 
@@ -167,12 +203,14 @@ def log_outlier_info(df: pd.DataFrame, value_col: str):
         df (pd.DataFrame): The dataframe used for finding outliers
         value_col (str): The name of the col outliers are calculated for
     """
-    filtered_df = filter_valid(df, value_col)
+    valid = valid_responses(df) & (df[value_col] > 0)
+    if not valid.any():
+        _no_valid_returns(value_col)
 
     flag_col = f"{value_col}_outlier_flag"
 
-    num_flagged = filtered_df[filtered_df[flag_col]][flag_col].count()
-    tot_nonzero = filtered_df[value_col].count()
+    num_flagged = (valid & df[flag_col]).sum()
+    tot_nonzero = df.loc[valid, value_col].count()
 
     msg = (
         f"{num_flagged} outliers were detected out of a total of "
@@ -216,12 +254,11 @@ def run_auto_flagging(
     # Validate the outlier configuration settings
     validate_config(upper_clip, lower_clip, flag_value_cols)
 
-    # loop through all columns to be flagged for outliers
-    for value_col in flag_value_cols:
-        # Call function to add a flag for auto outliers in column value_col
-        df = flag_outliers(df, upper_clip, lower_clip, value_col)
+    # Add a flag for auto outliers in each of the columns
+    df = flag_all_outliers(df, upper_clip, lower_clip, flag_value_cols)
 
-        # Log infomation on the number of outliers in column value_col
+    # Log infomation on the number of outliers in each column
+    for value_col in flag_value_cols:
         log_outlier_info(df, value_col)
 
     # create 'master' outlier column- which is True if any of the other
@@ -269,3 +306,15 @@ def normal_round(x: float) -> int:
         return f
     else:
         return f + 1
+
+
+def normal_round_array(x: np.ndarray) -> np.ndarray:
+    """Round an array as normal_round does, so that halves round up.
+
+    Args:
+        x (np.ndarray): Fractional numbers to be rounded
+    Returns:
+        np.ndarray: Rounded values, as floats so null values are kept
+    """
+    f = np.floor(x)
+    return np.where(x - f < 0.5, f, f + 1)
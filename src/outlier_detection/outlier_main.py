@@ -14,7 +14,7 @@ def run_outliers(
     df: pd.DataFrame,
     df_manual_supplied: pd.DataFrame,
     config: Dict[str, Any],
-    write_csv: Callable,
+    write_table: Callable,
     run_id: int,
 ) -> pd.DataFrame:
     """
@@ -33,8 +33,9 @@ def run_outliers(
         df (pd.DataFrame): The main dataset where outliers are to be calculated.
         df_manual_supplied (pd.DataFrame): Dataframe with manual outlier flags
         config (dict): The configuration settings.
-        write_csv (Callable): Function to write to a csv file.
-            This will be the s3, hdfs or network version depending on settings.
+        write_table (Callable): Function to write to csv, parquet and/or feather
+            files. This will be the s3, hdfs or network version depending on
+            settings.
         run_id (int): The current run id
 
     Returns:
@@ -64,8 +65,10 @@ def run_outliers(
         file_path = (
             auto_outlier_path + f"/{survey_year}_auto_outlier_{tdate}_v{run_id}.csv"
         )
-        write_csv(file_path, filtered_df)
-        OutlierMainLogger.info("Finished writing CSV to %s", auto_outlier_path)
+        write_table(
+            file_path, filtered_df, config["qa_output_formats"]["auto_outliers"]
+        )
+        OutlierMainLogger.info("Finished writing file to %s", auto_outlier_path)
     else:
         OutlierMainLogger.info("Skipping the output of the automatic outliers file")
 
@@ -90,7 +93,11 @@ def run_outliers(
     if config["global"]["output_outlier_qa"]:
         OutlierMainLogger.info("Starting output of Outlier QA data...")
         filename = f"{survey_year}_outliers_qa_{tdate}_v{run_id}.csv"
-        write_csv(f"{outlier_qa_path}/{filename}", flagged_outlier_df)
+        write_table(
+            f"{outlier_qa_path}/{filename}",
+            flagged_outlier_df,
+            config["qa_output_formats"]["outlier_qa"],
+        )
         OutlierMainLogger.info("Finished QA output of outliers data.")
     else:
         OutlierMainLogger.info("Skipping output of Outlier QA data...")
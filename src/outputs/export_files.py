@@ -4,9 +4,11 @@ the output folder to the outgoing folder, along with their manifest file."""
 
 import os
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import toml
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 import getpass
 
@@ -18,6 +20,10 @@ from src.outputs.manifest_output import Manifest
 OutgoingLogger = logging.getLogger(__name__)
 
 
+class TransferError(Exception):
+    pass
+
+
 # config_path = os.path.join("src", "developer_config.yaml")
 
 
@@ -116,9 +122,9 @@ def get_file_choice(paths, config: dict):
     return selection_dict
 
 
-def check_files_exist(file_list: List, config: dict, isfile: callable):
+def check_files_exist(file_list: List, config: dict, isfile_many: callable):
     """Check that all the files in the file list exist using
-    the imported isfile function."""
+    the imported isfile_many function, which checks every file at once."""
 
     # Check if the output dirs supplied are string, change to list if so
 
@@ -127,11 +133,12 @@ def check_files_exist(file_list: List, config: dict, isfile: callable):
     if isinstance(file_list, str):
         file_list = [file_list]
 
-    # Check the existence of every file using is_file
+    # Check the existence of every file using isfile_many
+    OutgoingLogger.debug(f"Using {platform} isfile_many function")
+    files_exist = isfile_many([str(Path(file)) for file in file_list])
     for file in file_list:
         file_path = Path(file)  # Changes to path if str
-        OutgoingLogger.debug(f"Using {platform} isfile function")
-        if not isfile(str(file_path)):
+        if not files_exist[str(file_path)]:
             OutgoingLogger.error(
                 f"File {file} does not exist. Check existence and spelling"
             )
@@ -157,6 +164,138 @@ def transfer_files(source, destination, method, logger, copy_files, move_files):
     logger.info(f"Files {source} successfully {past_tense} to {destination}.")
 
 
+def transfer_verified(
+    expected: dict,
+    dst_path: str,
+    md5sum: callable,
+) -> bool:
+    """
+    Check a transferred file matches its manifest entry, by its md5sum.
+
+    Args:
+        expected (dict): The manifest entry of the file, with its "md5sum".
+        dst_path (str): The path the file was transferred to.
+        md5sum (callable): Function to get the md5sum of a file.
+
+    Returns:
+        bool: True if the transferred file matches the manifest entry.
+    """
+    return md5sum(dst_path) == expected["md5sum"]
+
+
+def transfer_file_verified(
+    source: str,
+    destination: str,
+    method: str,
+    expected: dict,
+    logger: logging.Logger,
+    copy_files: callable,
+    move_files: callable,
+    isfile: callable,
+    md5sum: callable,
+    retries: int = 2,
+) -> dict:
+    """
+    Transfer a file and check it against its manifest entry, retrying failed
+    transfers.
+
+    A moved file whose source no longer exists cannot be sent again, so its
+    transfer is not retried.
+
+    Args:
+        source (str): The source file path.
+        destination (str): The destination folder.
+        method (str): The method to use for transferring files ("copy" or "move").
+        expected (dict): The manifest entry of the file.
+        logger (logging.Logger): The logger to use for logging the action.
+        retries (int): The number of times a failed transfer is retried.
+
+    Returns:
+        dict: The timing report of the transfer.
+
+    Raises:
+        TransferError: If the file could not be transferred intact.
+    """
+    # the path the hdfs and s3 mods transfer the file to, inside the destination
+    # folder, without any trailing slashes
+    dst_path = f"{str(destination).rstrip('/')}/{os.path.basename(str(source))}"
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            transfer_files(source, destination, method, logger, copy_files, move_files)
+            if transfer_verified(expected, dst_path, md5sum):
+                return {
+                    "file": str(source),
+                    "sizeBytes": int(expected["sizeBytes"]),
+                    "attempts": attempt,
+                    "seconds": time.perf_counter() - start,
+                }
+            error = "the transferred file does not match the manifest"
+        except Exception as e:
+            error = str(e)
+        logger.warning(f"Transfer {attempt} of {source} failed: {error}")
+        if not isfile(str(source)):
+            break
+    raise TransferError(f"{source} could not be transferred to {destination}")
+
+
+def transfer_files_parallel(
+    manifest_files: Dict[str, dict],
+    destination: str,
+    method: str,
+    logger: logging.Logger,
+    copy_files: callable,
+    move_files: callable,
+    isfile: callable,
+    md5sum: callable,
+    max_workers: int = 4,
+    retries: int = 2,
+) -> List[dict]:
+    """
+    Transfer files at the same time, checking each against its manifest entry,
+    and log a timing report for each file.
+
+    Args:
+        manifest_files (Dict[str, dict]): The manifest entry of each file, keyed
+            on its source path.
+        destination (str): The destination folder.
+        method (str): The method to use for transferring files ("copy" or "move").
+        logger (logging.Logger): The logger to use for logging the action.
+        max_workers (int): The number of files transferred at the same time.
+        retries (int): The number of times a failed transfer is retried.
+
+    Returns:
+        List[dict]: The timing report of each transfer, in the order given.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                transfer_file_verified,
+                source,
+                destination,
+                method,
+                expected,
+                logger,
+                copy_files,
+                move_files,
+                isfile,
+                md5sum,
+                retries,
+            )
+            for source, expected in manifest_files.items()
+        ]
+        report = [future.result() for future in futures]
+
+    for row in report:
+        size_mb = row["sizeBytes"] / 1024**2
+        logger.info(
+            f"Transferred {row['file']}: {size_mb:.1f}MB in {row['seconds']:.2f}s "
+            f"({size_mb / max(row['seconds'], 1e-6):.1f}MB/s, "
+            f"{row['attempts']} attempt(s))"
+        )
+    return report
+
+
 def get_username():
     """
     Retrieves the username of the currently logged-in user.
@@ -256,7 +395,7 @@ def run_export(user_config_path: str, dev_config_path: str):
     file_select_dict = get_file_choice(paths, config)
 
     # Check that files exist
-    check_files_exist(list(file_select_dict.values()), config, mods.rd_isfile)
+    check_files_exist(list(file_select_dict.values()), config, mods.rd_isfile_many)
 
     # Creating a manifest object using the Manifest class in manifest_output.py
     manifest = Manifest(
@@ -271,23 +410,43 @@ def run_export(user_config_path: str, dev_config_path: str):
         isfile_func=mods.rd_isfile,
         read_header_func=mods.rd_read_header,
         string_to_file_func=mods.rd_write_string_to_file,
+        file_info_func=mods.rd_file_info,
     )
 
     schemas_header_dict = get_schema_headers(config)
 
-    # Add the short form output file to the manifest object
-    for file_name, file_path in file_select_dict.items():
-        manifest.add_file(
-            file_path,
-            column_header=schemas_header_dict[f"{file_name}_schema"],
-            validate_col_name_length=True,
-            sep=",",
-        )
+    # Add the selected output files to the manifest object
+    column_headers = {
+        file_path: schemas_header_dict[f"{file_name}_schema"]
+        for file_name, file_path in file_select_dict.items()
+    }
+    manifest.add_files(column_headers, validate_col_name_length=True, sep=",")
 
-    # Write the manifest file to the outgoing directory
+    # Write the manifest file to the outgoing directory. As delete_on_fail is
+    # not set, invalid headers are only recorded, and the files still exported.
     manifest.write_manifest()
 
-    # Move the manifest file to the outgoing folder
+    # Copy or Move files to outgoing folder, checking each against the manifest
+    file_transfer_method = config["export_choices"]["copy_or_move_files"]
+    export_settings = config["export_settings"]
+
+    manifest_files = dict(
+        zip(map(str, file_select_dict.values()), manifest.manifest["files"])
+    )
+    transfer_files_parallel(
+        manifest_files,
+        manifest.export_directory,
+        file_transfer_method,
+        OutgoingLogger,
+        mods.rd_copy_file,
+        mods.rd_move_file,
+        mods.rd_isfile,
+        mods.rd_md5sum,
+        max_workers=export_settings["max_workers"],
+        retries=export_settings["transfer_retries"],
+    )
+
+    # Move the manifest file to the outgoing folder, once every file is there
     manifest_file = mods.rd_search_file(manifest.outgoing_directory, "_manifest.json")
 
     manifest_path = os.path.join(manifest.outgoing_directory, manifest_file)
@@ -301,20 +460,6 @@ def run_export(user_config_path: str, dev_config_path: str):
         mods.rd_move_file,
     )
 
-    # Copy or Move files to outgoing folder
-    file_transfer_method = config["export_choices"]["copy_or_move_files"]
-
-    for file_path in file_select_dict.values():
-        file_path = os.path.join(file_path)
-        transfer_files(
-            file_path,
-            manifest.export_directory,
-            file_transfer_method,
-            OutgoingLogger,
-            mods.rd_copy_file,
-            mods.rd_move_file,
-        )
-
     log_exports(list(file_select_dict.values()), pipeline_run_datetime, OutgoingLogger)
 
     OutgoingLogger.info("Exporting files finished.")
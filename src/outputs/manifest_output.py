@@ -1,7 +1,9 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
+from typing import Dict
 
 
 # set up logging
@@ -28,6 +30,11 @@ class Manifest:
         datetime of the current pipeline run, used to version outputs
     dry_run
         when True, cleans up output files after a successful run
+    file_info_func
+        optional function returning the size, md5sum and header of a file in
+        one read. When not given, these are read with the separate functions.
+    max_workers
+        number of files read at the same time by add_files
     """
 
     def __init__(
@@ -44,6 +51,8 @@ class Manifest:
         string_to_file_func: callable,
         dry_run: bool = False,
         delete_on_fail=False,
+        file_info_func: callable = None,
+        max_workers: int = 4,
     ):
         self.outgoing_directory = outgoing_directory
         self.export_directory = export_directory
@@ -73,6 +82,7 @@ class Manifest:
         self.invalid_headers: list = []
         self.dry_run = dry_run
         self.delete_on_fail = delete_on_fail
+        self.max_workers = max_workers
 
         # Functions
         self.delete_file = delete_file_func
@@ -82,6 +92,34 @@ class Manifest:
         self.isfile = isfile_func
         self.read_header = read_header_func
         self.string_to_file = string_to_file_func
+        self.file_info = file_info_func
+
+    def _absolute_path(self, relative_file_path: str) -> str:
+        """Check a file to add exists in the outgoing folder, returning its path."""
+        if "outputs" not in str(relative_file_path):
+            raise ManifestError(
+                f"""File must be in a subdirectory of the outgoing directory:
+                    {relative_file_path}"""
+            )
+
+        absolute_file_path = os.path.join(self.outgoing_directory, relative_file_path)
+
+        if not self.isfile(absolute_file_path):
+            raise ManifestError(
+                f"""Cannot add file to manifest, file does not exist:
+                    {absolute_file_path}"""
+            )
+        return absolute_file_path
+
+    def _read_file_info(self, absolute_file_path: str) -> dict:
+        """Get the size, md5sum and header of a file."""
+        if self.file_info is not None:
+            return self.file_info(absolute_file_path)
+        return {
+            "size": self.stat_size(absolute_file_path),
+            "md5sum": self.md5sum(absolute_file_path),
+            "header": self.read_header(absolute_file_path),
+        }
 
     def add_file(
         self,
@@ -89,6 +127,7 @@ class Manifest:
         column_header: str,
         validate_col_name_length: bool = True,
         sep: str = ",",
+        file_info: dict = None,
     ):
         """
         Add a file in the outgoing folder to the manifest.
@@ -100,22 +139,16 @@ class Manifest:
             from outgoing directory to the file that you want to add to the manifest
         column_header
             the exact column header string
+        file_info
+            the size, md5sum and header of the file, if already read
         """
-        if "outputs" not in str(relative_file_path):
-            raise ManifestError(
-                f"""File must be in a subdirectory of the outgoing directory:
-                    {relative_file_path}"""
-            )
+        absolute_file_path = self._absolute_path(relative_file_path)
 
-        absolute_file_path = os.path.join(self.outgoing_directory, relative_file_path)
+        if file_info is None:
+            file_info = self._read_file_info(absolute_file_path)
 
-        if not self.isfile(absolute_file_path):
-            raise ManifestError(
-                f"""Cannot add file to manifest, file does not exist:
-                    {absolute_file_path}"""
-            )
         # Get the col headers from the file
-        file_header_string = self.read_header(absolute_file_path)
+        file_header_string = file_info["header"]
 
         # Cleanup file_header_list because \n is appearing in it
         file_header_string = file_header_string.replace("\n", "")
@@ -163,7 +196,7 @@ class Manifest:
                     "of 32: {col_above_max_len}\n"
                 )
         # Check that files are not more than 2.5Gb as nifi can't cope
-        file_size_bytes = int(self.stat_size(absolute_file_path))
+        file_size_bytes = int(file_info["size"])
         file_size_gb = file_size_bytes / 1024**3
         if file_size_gb > 2.5:
             raise ManifestError(
@@ -180,11 +213,46 @@ class Manifest:
             "file": os.path.basename(relative_file_path),
             "subfolder": relative_dir_str,
             "sizeBytes": file_size_bytes,
-            "md5sum": self.md5sum(absolute_file_path),
+            "md5sum": file_info["md5sum"],
             "header": column_header,
         }
         self.manifest["files"].append(file_manifest)
 
+    def add_files(
+        self,
+        column_headers: Dict[str, str],
+        validate_col_name_length: bool = True,
+        sep: str = ",",
+    ):
+        """
+        Add several files in the outgoing folder to the manifest.
+
+        The files are read at the same time, up to max_workers at once, so the
+        time taken is bound by the speed of the file system rather than the
+        number of files. The files are added to the manifest in the order given.
+
+        Parameters
+        ----------
+        column_headers
+            the exact column header string of each file, keyed on its path from
+            the outgoing directory
+        """
+        absolute_paths = [self._absolute_path(path) for path in column_headers]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            files_info = list(executor.map(self._read_file_info, absolute_paths))
+
+        for (relative_file_path, column_header), file_info in zip(
+            column_headers.items(), files_info
+        ):
+            self.add_file(
+                relative_file_path,
+                column_header,
+                validate_col_name_length=validate_col_name_length,
+                sep=sep,
+                file_info=file_info,
+            )
+
     def write_manifest(self):
         """
         Write outgoing file manifest to JSON in HDFS.
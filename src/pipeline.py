@@ -6,7 +6,9 @@ import pandas as pd
 # Our local modules
 from src.utils import runlog
 from src._version import __version__ as version
+from src.utils.checkpoints import StageCheckpointer
 from src.utils.config import config_setup
+from src.utils.mapper_cache import MapperCache
 from src.utils.wrappers import logger_creator
 from src.utils.path_helpers import filename_validation
 from src.staging.staging_main import run_staging
@@ -15,7 +17,7 @@ from src.freezing.freezing_main import run_freezing
 from src.northern_ireland.ni_main import run_ni
 from src.construction.construction_main import run_construction
 from src.mapping.mapping_main import run_mapping
-from src.imputation.imputation_main import run_imputation  # noqa
+from src.imputation.imputation_main import run_imputation, write_backdata  # noqa
 from src.outlier_detection.outlier_main import run_outliers
 from src.estimation.estimation_main import run_estimation
 from src.site_apportionment.site_apportionment_main import run_site_apportionment
@@ -79,6 +81,33 @@ def run_pipeline(user_config_path, dev_config_path):
     runlog_obj.write_mainlog()
 
     run_id = runlog_obj.run_id
+
+    # Set up the cache of mappers converted to feather
+    mapper_cache = MapperCache(
+        config,
+        mods.rd_file_exists,
+        mods.rd_mkdir,
+        mods.rd_read_csv,
+        mods.rd_read_feather,
+        mods.rd_write_feather,
+        mods.rd_stat_size,
+        mods.rd_md5sum,
+    )
+
+    # Set up the checkpoints of the outputs of each stage
+    checkpointer = StageCheckpointer(
+        config,
+        version,
+        mods.rd_file_exists,
+        mods.rd_isfile,
+        mods.rd_mkdir,
+        mods.rd_read_feather,
+        mods.rd_write_feather,
+        mods.rd_load_json,
+        mods.rd_write_string_to_file,
+        mods.rd_stat_size,
+        mods.rd_md5sum,
+    )
     MainLogger.info(f"Reading user config from {user_config_path}.")
     MainLogger.info(f"Reading developer config from {dev_config_path}.")
 
@@ -99,11 +128,14 @@ def run_pipeline(user_config_path, dev_config_path):
         civil_defence_detailed,
         sic_division_detailed,
         manual_trimming_df,
-    ) = run_staging(
+    ) = checkpointer.run_stage(
+        "staging",
+        run_staging,
         config,
         mods.rd_file_exists,
-        mods.rd_load_json,
+        mods.rd_open_file,
         mods.rd_read_csv,
+        mapper_cache.read_csv,
         mods.rd_write_csv,
         mods.rd_read_feather,
         mods.rd_write_feather,
@@ -112,7 +144,9 @@ def run_pipeline(user_config_path, dev_config_path):
 
     # Freezing module
     MainLogger.info("Starting Freezing module...")
-    full_responses = run_freezing(
+    full_responses = checkpointer.run_stage(
+        "freezing",
+        run_freezing,
         full_responses,
         config,
         mods.rd_write_csv,
@@ -136,8 +170,14 @@ def run_pipeline(user_config_path, dev_config_path):
     load_ni_data = config["global"]["load_ni_data"]
     if load_ni_data:
         MainLogger.info("Starting NI module...")
-        ni_df = run_ni(
-            config, mods.rd_file_exists, mods.rd_read_csv, mods.rd_write_csv, run_id
+        ni_df = checkpointer.run_stage(
+            "ni",
+            run_ni,
+            config,
+            mods.rd_file_exists,
+            mods.rd_read_csv,
+            mods.rd_write_csv,
+            run_id,
         )
         MainLogger.info("Finished NI Data Ingest.")
     else:
@@ -149,7 +189,9 @@ def run_pipeline(user_config_path, dev_config_path):
     MainLogger.info("Starting Construction module...")
     run_all_data_construction = config["global"]["run_all_data_construction"]
     if run_all_data_construction:
-        full_responses = run_construction(
+        full_responses = checkpointer.run_stage(
+            "construction",
+            run_construction,
             full_responses,
             config,
             mods.rd_file_exists,
@@ -162,34 +204,44 @@ def run_pipeline(user_config_path, dev_config_path):
 
     # Mapping module
     MainLogger.info("Starting Mapping...")
-    (mapped_df, ni_full_responses, itl_mapper) = run_mapping(
+    (mapped_df, ni_full_responses, itl_mapper) = checkpointer.run_stage(
+        "mapping",
+        run_mapping,
         full_responses,
         ni_df,
         postcode_mapper,
         config,
-        mods.rd_read_csv,
-        mods.rd_write_csv,
+        mapper_cache.read_csv,
+        mods.rd_write_table,
         mods.rd_file_exists,
         run_id,
     )
     MainLogger.info("Finished Mapping...")
+    MainLogger.info(
+        f"Mapper cache: {mapper_cache.hits} hits, {mapper_cache.misses} misses"
+    )
 
     # Imputation module
     MainLogger.info("Starting Imputation...")
-    imputed_df = run_imputation(
+    imputed_df = checkpointer.run_stage(
+        "imputation",
+        run_imputation,
         mapped_df,
         manual_trimming_df,
         backdata,
         config,
-        mods.rd_write_csv,
+        mods.rd_write_table,
         run_id,
     )
+    write_backdata(imputed_df, config, mods.rd_write_csv, run_id)
     MainLogger.info("Finished  Imputation...")
 
     # Perform postcode construction now imputation is complete
     run_postcode_construction = config["global"]["run_postcode_construction"]
     if run_postcode_construction:
-        imputed_df = run_construction(
+        imputed_df = checkpointer.run_stage(
+            "postcode_construction",
+            run_construction,
             imputed_df,
             config,
             mods.rd_file_exists,
@@ -206,21 +258,38 @@ def run_pipeline(user_config_path, dev_config_path):
 
     # Outlier detection module
     MainLogger.info("Starting Outlier Detection...")
-    outliered_responses_df = run_outliers(
-        imputed_df, manual_outliers, config, mods.rd_write_csv, run_id
+    outliered_responses_df = checkpointer.run_stage(
+        "outliers",
+        run_outliers,
+        imputed_df,
+        manual_outliers,
+        config,
+        mods.rd_write_table,
+        run_id,
     )
     MainLogger.info("Finished Outlier module.")
 
     # Estimation module
     MainLogger.info("Starting Estimation...")
-    estimated_responses_df = run_estimation(
-        outliered_responses_df, config, mods.rd_write_csv, run_id
+    estimated_responses_df = checkpointer.run_stage(
+        "estimation",
+        run_estimation,
+        outliered_responses_df,
+        config,
+        mods.rd_write_table,
+        run_id,
     )
     MainLogger.info("Finished Estimation module.")
 
     # Data processing: Apportionment to sites
-    apportioned_responses_df, intram_tot_dict = run_site_apportionment(
-        estimated_responses_df, config, mods.rd_write_csv, run_id
+    apportioned_responses_df, intram_tot_dict = checkpointer.run_stage(
+        "apportionment",
+        run_site_apportionment,
+        estimated_responses_df,
+        config,
+        mods.rd_write_csv,
+        mods.rd_write_table,
+        run_id,
     )
 
     MainLogger.info("Finished Site Apportionment module.")
@@ -1,8 +1,9 @@
 # Standard Library Imports
-from typing import Tuple, List, Dict, Union, Any
+from typing import Tuple, List, Dict, Union, Any, Iterator
 import logging
 
 # Third Part Imports
+import numpy as np
 import pandas as pd
 
 # Local Imports
@@ -415,6 +416,109 @@ def weight_values(
     return df
 
 
+def _cartesian_indices(
+    site_keys: np.ndarray, category_keys: np.ndarray, num_keys: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the row positions of the Cartesian product of sites and categories.
+
+    The rows are sorted by their key, and the pairs of sites and categories for
+    each key are found with index repeats, rather than merging the dataframes.
+
+    Args:
+        site_keys (np.ndarray): The key number of each site, from 0 to num_keys.
+        category_keys (np.ndarray): The key number of each category.
+        num_keys (int): The number of keys.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The position of the site, the
+            key and the position of the category of each row of the product.
+    """
+    site_order = np.argsort(site_keys, kind="stable")
+    category_order = np.argsort(category_keys, kind="stable")
+    num_categories = np.bincount(category_keys, minlength=num_keys)
+    category_start = np.cumsum(num_categories) - num_categories
+
+    # Each site is repeated once for each category with the same key
+    sorted_site_keys = site_keys[site_order]
+    repeats = num_categories[sorted_site_keys]
+    site_rows = np.repeat(site_order, repeats)
+
+    # The categories of each key are listed in turn for each of its sites
+    block_start = np.repeat(np.cumsum(repeats) - repeats, repeats)
+    within_block = np.arange(len(site_rows)) - block_start
+    category_rows = category_order[
+        np.repeat(category_start[sorted_site_keys], repeats) + within_block
+    ]
+    return site_rows, np.repeat(sorted_site_keys, repeats), category_rows
+
+
+def iter_apportioned_sites(
+    sites_df: pd.DataFrame,
+    category_df: pd.DataFrame,
+    value_cols: List[str],
+    cols_in_order: List[str],
+    batch_size: int = 10000,
+) -> Iterator[pd.DataFrame]:
+    """Apportion the values of each product class across sites, a batch at a time.
+
+    This gives the same rows as create_cartesian_product followed by
+    weight_values, but only the columns in cols_in_order are built, and only for
+    batch_size references and periods at a time, so the full product with every
+    site and category column is never held in memory.
+
+    Args:
+        sites_df (pd.DataFrame): The sites of each reference, with "site_weight".
+        category_df (pd.DataFrame): The product classes and values of each
+            reference.
+        value_cols (List[str]): The columns to be weighted.
+        cols_in_order (List[str]): The columns of the apportioned dataframe.
+        batch_size (int): The number of references and periods in each batch.
+
+    Yields:
+        pd.DataFrame: The apportioned rows of each batch of references.
+    """
+    # Number the references and periods, shared between sites and categories
+    all_keys = pd.concat(
+        [sites_df[groupby_cols], category_df[groupby_cols]], ignore_index=True
+    )
+    key_ids = all_keys.groupby(groupby_cols, sort=True, dropna=False).ngroup()
+    key_ids = key_ids.to_numpy()
+    num_keys = int(key_ids.max()) + 1 if len(key_ids) else 0
+    site_keys = key_ids[: len(sites_df)]
+    category_keys = key_ids[len(sites_df) :]
+
+    site_rows, row_keys, category_rows = _cartesian_indices(
+        site_keys, category_keys, num_keys
+    )
+
+    site_out_cols = [col for col in cols_in_order if col in sites_df.columns]
+    category_out_cols = [
+        col
+        for col in cols_in_order
+        if col not in sites_df.columns and col in category_df.columns
+    ]
+    sites_part = sites_df[site_out_cols]
+    category_part = category_df[category_out_cols]
+    weights = sites_df["site_weight"].to_numpy()
+
+    # The rows are in key order, so each batch of keys is a slice of the rows
+    batch_keys = np.unique(row_keys)[::batch_size]
+    batch_bounds = np.append(np.searchsorted(row_keys, batch_keys), len(row_keys))
+    for start, stop in zip(batch_bounds[:-1], batch_bounds[1:]):
+        batch_sites = site_rows[start:stop]
+        batch_df = pd.concat(
+            [
+                sites_part.take(batch_sites).reset_index(drop=True),
+                category_part.take(category_rows[start:stop]).reset_index(drop=True),
+            ],
+            axis=1,
+        )
+        batch_df[value_cols] = batch_df[value_cols].multiply(
+            weights[batch_sites], axis=0
+        )
+        yield batch_df[cols_in_order]
+
+
 def sort_rows_order_cols(df: pd.DataFrame, cols_in_order: List[str]) -> pd.DataFrame:
     """
     Sorts the DataFrame by the specified columns in ascending order.
@@ -536,17 +640,18 @@ def run_apportion_sites(
     # Calculate weights
     sites_df = calc_weights_for_sites(sites_df, groupby_cols)
 
-    #  Merge codes to sites to create a Cartesian product
-    df_cart = create_cartesian_product(sites_df, category_df)
-
-    # Apply weights
-    df_cart = weight_values(df_cart, value_cols, "site_weight")
-
-    # Restore the original order of columns
-    df_cart = df_cart[orig_cols]
+    # Apportion the values of the codes to the sites, in batches of references,
+    # with the original order of columns
+    apportioned_batches = iter_apportioned_sites(
+        sites_df,
+        category_df,
+        value_cols,
+        orig_cols,
+        batch_size=config["apportionment"]["batch_size"],
+    )
 
     # Append the apportionned data back to the remaining unchanged data
-    df_out = pd.concat([df_out, df_cart], ignore_index=True)
+    df_out = pd.concat([df_out, *apportioned_batches], ignore_index=True)
 
     # Sort by period, ref, instance in ascending order.
     df_out = sort_rows_order_cols(df_out, orig_cols)
@@ -17,6 +17,7 @@ def run_site_apportionment(
     df: pd.DataFrame,
     config: Dict[str, Any],
     write_csv: Callable,
+    write_table: Callable,
     run_id: int,
 ) -> pd.DataFrame:
     """Run the apportionment to sites module.
@@ -32,6 +33,8 @@ def run_site_apportionment(
         intram_tot_dict (dict): Dictionary with the intramural totals.
         write_csv (Callable): Function to write to a csv file.
             This will be the hdfs or network version depending on settings.
+        write_table (Callable): Function to write to csv, parquet and/or feather
+            files. This will be the hdfs or network version depending on settings.
         run_id (int): The current run id
     Returns:
         df_out (pd.DataFrame): Percentages filled in for short forms and applied
@@ -64,7 +67,11 @@ def run_site_apportionment(
         tdate = datetime.now().strftime("%y-%m-%d")
         survey_year = config["survey"]["survey_year"]
         filename = f"{survey_year}_estimated_apportioned_{tdate}_v{run_id}.csv"
-        write_csv(f"{qa_path}/{filename}", df_out)
+        write_table(
+            f"{qa_path}/{filename}",
+            df_out,
+            config["qa_output_formats"]["apportionment_qa"],
+        )
 
     SitesMainLogger.info("Finished apportionment to sites.")
     return df_out, intram_tot_dict
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 import logging
@@ -30,9 +31,9 @@ def check_log_unreal_postcodes(
 
     # Clean postcodes to match the masterlist
     checks_validation_df = validation_df.copy()
-    checks_validation_df["postcodes_harmonised"] = checks_validation_df[
-        "postcodes_harmonised"
-    ].apply(format_postcodes)
+    checks_validation_df["postcodes_harmonised"] = format_postcode_series(
+        checks_validation_df["postcodes_harmonised"]
+    )
 
     # Create a list of postcodes not found in masterlist in col "postcodes_harmonised"
     unreal_postcodes = check_pcs_real(
@@ -83,6 +84,53 @@ def format_postcodes(postcode: str):
             return formatted_postcode + " " * spaces_needed
 
 
+def format_postcode_series(postcodes: pd.Series) -> pd.Series:
+    """Formats a series of postcodes to eight characters and capitalise.
+
+    This gives the same output as applying format_postcodes to each postcode, but
+    uses vectorised string methods, and each distinct postcode is only formatted
+    once.
+
+    Args:
+        postcodes (pd.Series): Postcodes to format
+
+    Returns:
+        formatted_postcodes (pd.Series): Postcodes in correct format, or None
+            where the postcode is missing or too long.
+    """
+    codes, uniques = pd.factorize(postcodes.astype(object))
+    cleaned = (
+        pd.Series(uniques, dtype=object)
+        .str.upper()
+        .str.strip()
+        .str.replace(" ", "", regex=False)
+    )
+    lengths = cleaned.str.len()
+
+    formatted_postcodes = pd.Series(None, index=cleaned.index, dtype=object)
+
+    # Short postcodes have spaces added at the end
+    short_cond = lengths < 5
+    formatted_postcodes[short_cond] = cleaned[short_cond].str.ljust(8)
+
+    # Otherwise spaces are added before the last three characters
+    long_cond = (lengths >= 5) & (lengths < 8)
+    formatted_postcodes[long_cond] = (
+        cleaned[long_cond].str[:-3].str.ljust(5) + cleaned[long_cond].str[-3:]
+    )
+
+    # Map the formatted postcodes back to each row, where -1 is a missing postcode
+    formatted_postcodes = pd.Series(
+        pd.api.extensions.take(
+            formatted_postcodes.to_numpy(), codes, allow_fill=True, fill_value=None
+        ),
+        index=postcodes.index,
+        name=postcodes.name,
+    )
+
+    return formatted_postcodes
+
+
 def get_masterlist(postcode_masterlist) -> pd.Series:
     """This function converts the masterlist dataframe to a Pandas series
 
@@ -181,8 +229,8 @@ def update_full_responses(
         ),
         other=None,
     )
-    df["postcodes_harmonised"] = df["postcodes_harmonised"].apply(format_postcodes)
-    df["601"] = df["601"].apply(format_postcodes)
+    df["postcodes_harmonised"] = format_postcode_series(df["postcodes_harmonised"])
+    df["601"] = format_postcode_series(df["601"])
 
     return df
 
@@ -226,11 +274,10 @@ def run_full_postcode_process(
 
     # Create a copy to work from and add temp "postcode_source" column
     validation_df = df.copy()
-    validation_df["postcode_source"] = validation_df.apply(
-        lambda row: "column '601'"
-        if pd.notna(row["601"])
-        else "column 'referencepostcode' (IDBR)",
-        axis=1,
+    validation_df["postcode_source"] = np.where(
+        validation_df["601"].notna(),
+        "column '601'",
+        "column 'referencepostcode' (IDBR)",
     )
 
     # Check for unreal entries in postcodes_harmonised column
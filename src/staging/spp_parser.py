@@ -1,11 +1,22 @@
+import codecs
+import json
+import re
+from typing import Dict, IO, Iterator, List, Tuple
+
+import numpy as np
 import pandas as pd
-from typing import Tuple
 
 from src.utils.wrappers import exception_wrap, time_logger_wrap
 import logging
 
 spp_parser_logger = logging.getLogger(__name__)
 
+# The arrays in the snapshot that are parsed into dataframes
+SNAPSHOT_ARRAYS = ["contributors", "responses"]
+
+# Read the snapshot file in chunks of this many bytes
+DEFAULT_CHUNK_SIZE = 2**20
+
 
 @exception_wrap
 @time_logger_wrap
@@ -31,3 +42,188 @@ def parse_snap_data(snapdata: dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
     spp_parser_logger.info("SPP Snapshot data successfully loaded...")
 
     return contributors_df, responses_df
+
+
+class ColumnBuffer:
+    """Collect JSON records into a list per column.
+
+    Records are added one at a time, and keys missing from a record are filled
+    with NaN, as when building a dataframe from a list of dicts. Short repeated
+    strings (e.g. question codes and statuses) are shared between records rather
+    than stored once per record.
+    """
+
+    max_memo_size = 100000
+    max_memo_len = 64
+
+    def __init__(self):
+        self.columns: Dict[str, List] = {}
+        self.num_rows = 0
+        self._memo: Dict[str, str] = {}
+
+    def append(self, record: dict):
+        """Add a record to the buffer."""
+        for key, value in record.items():
+            if key not in self.columns:
+                self.columns[key] = [np.nan] * self.num_rows
+            if isinstance(value, str) and len(value) <= self.max_memo_len:
+                value = self._share_string(value)
+            self.columns[key].append(value)
+        self.num_rows += 1
+
+        # pad any columns missing from this record
+        if len(record) != len(self.columns):
+            for column in self.columns.values():
+                if len(column) < self.num_rows:
+                    column.append(np.nan)
+
+    def _share_string(self, value: str) -> str:
+        """Return an equal string already in the buffer, where there is one."""
+        shared = self._memo.get(value)
+        if shared is None:
+            if len(self._memo) < self.max_memo_size:
+                self._memo[value] = value
+            return value
+        return shared
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert the buffer to a dataframe, emptying the buffer."""
+        df = pd.DataFrame(self.columns)
+        self.columns, self.num_rows, self._memo = {}, 0, {}
+        return df
+
+
+class JsonStream:
+    """Decode JSON values one at a time from a file read in chunks.
+
+    The file can be opened in text or binary mode, so this works with local file
+    handles, pydoop HDFS files and s3 streaming bodies alike. Only the unparsed
+    part of the current chunk is held in memory.
+    """
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, file: IO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._chunks = self._read_chunks(file, chunk_size)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    @staticmethod
+    def _read_chunks(file: IO, chunk_size: int) -> Iterator[str]:
+        """Read a file as text chunks, decoding bytes as utf-8 if needed."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                yield decoder.decode(b"", final=True)
+                return
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            yield chunk
+
+    def _fill(self) -> bool:
+        """Read the next chunk into the buffer, returning False at end of file."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at end of file."""
+        while True:
+            self._pos = self._whitespace.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid snapshot JSON: expected '{char}', got '{found}'")
+        self._pos += 1
+
+    def decode_value(self):
+        """Decode the next JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a value ending the buffer may be incomplete, e.g. a number
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_array(self) -> Iterator:
+        """Decode the items of a JSON array one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self.peek() != ",":
+                break
+            self._pos += 1
+        self.expect("]")
+
+
+@exception_wrap
+@time_logger_wrap
+def parse_snap_stream(
+    file: IO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Parse the contributors and responses from an open SPP snapshot file.
+
+    This gives the same dataframes as `parse_snap_data`, but the snapshot is read
+    in chunks and each record is moved into a column buffer as soon as it is
+    decoded, so the whole snapshot is never held in memory as a dict.
+
+    Args:
+        file (IO): The open snapshot file, in text or binary mode.
+        chunk_size (int): The number of bytes to read from the file at a time.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The contributers and responders dataframes
+    """
+    stream = JsonStream(file, chunk_size)
+    buffers = {key: ColumnBuffer() for key in SNAPSHOT_ARRAYS}
+    found = set()
+
+    stream.expect("{")
+    while stream.peek() != "}":
+        key = stream.decode_value()
+        stream.expect(":")
+        if key in buffers:
+            for record in stream.iter_array():
+                buffers[key].append(record)
+            found.add(key)
+        else:
+            # other top level items, such as the snapshot id, are skipped
+            stream.decode_value()
+        if stream.peek() == ",":
+            stream.expect(",")
+    stream.expect("}")
+
+    missing = [key for key in SNAPSHOT_ARRAYS if key not in found]
+    if missing:
+        raise KeyError(f"Snapshot is missing {missing}")
+
+    contributors_df = buffers["contributors"].to_frame()
+    responses_df = buffers["responses"].to_frame()
+
+    spp_parser_logger.info("SPP Snapshot data successfully loaded...")
+
+    return contributors_df, responses_df
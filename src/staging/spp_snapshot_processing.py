@@ -1,5 +1,6 @@
 from src.utils.wrappers import validate_dataframe_not_empty
 from typing import List
+import numpy as np
 import pandas as pd
 import logging
 
@@ -43,6 +44,69 @@ def create_contextual_dataframe(
     return contextual_df
 
 
+def create_wide_response_dataframe(
+    df: pd.DataFrame, unique_id_cols: List[str]
+) -> pd.DataFrame:
+    """Reshape long responses to one column per questioncode without pivot_table.
+
+    The unique id columns and the questioncodes are factorised to integer codes,
+    and the position of the first non-null response for each cell is scattered
+    into a preallocated array. Each question column is then taken from the
+    responses in one step. This gives the same result as create_response_dataframe
+    but avoids the slow "first" aggregation in pivot_table.
+
+    Arguments:
+        df -- DataFrame of long responses to reshape
+        unique_id_cols -- List of column names that uniquely identify the data
+
+    Returns:
+        response_df -- Response DataFrame
+    """
+    # Only non-null responses with an id are reshaped, as in pivot_table
+    is_valid = df["response"].notna().to_numpy()
+    for col in unique_id_cols:
+        is_valid &= df[col].notna().to_numpy()
+    valid_df = df.loc[is_valid, unique_id_cols + ["questioncode", "response"]]
+
+    # Integer codes for each column of the wide dataframe, where -1 is a null code
+    col_codes, questioncodes = pd.factorize(valid_df["questioncode"], sort=True)
+    valid_df = valid_df.loc[col_codes >= 0]
+    col_codes = col_codes[col_codes >= 0]
+
+    # Integer codes for each row of the wide dataframe, in sorted order
+    row_codes = valid_df.groupby(unique_id_cols).ngroup().to_numpy()
+
+    # Keep the first response for each cell, as aggfunc="first" does
+    cell_codes = row_codes * len(questioncodes) + col_codes
+    _, first_responses = np.unique(cell_codes, return_index=True)
+
+    # Scatter the positions of the responses into the wide array
+    _, first_rows = np.unique(row_codes, return_index=True)
+    positions = np.full((len(first_rows), len(questioncodes)), -1, dtype=np.intp)
+    positions[row_codes[first_responses], col_codes[first_responses]] = (
+        first_responses
+    )
+
+    response_df = valid_df[unique_id_cols].iloc[first_rows].reset_index(drop=True)
+    responses = valid_df["response"].array
+    response_df = pd.concat(
+        [
+            response_df,
+            pd.DataFrame(
+                {
+                    question: pd.api.extensions.take(
+                        responses, positions[:, i], allow_fill=True
+                    )
+                    for i, question in enumerate(questioncodes)
+                }
+            ),
+        ],
+        axis=1,
+    )
+    response_df = response_df.astype({"instance": "Int64"})
+    return response_df
+
+
 @validate_dataframe_not_empty
 def full_responses(contributors: pd.DataFrame, responses: pd.DataFrame) -> pd.DataFrame:
 
@@ -50,6 +114,10 @@ def full_responses(contributors: pd.DataFrame, responses: pd.DataFrame) -> pd.Da
     format allowing for easier manipulation later in pipeline - notably through
     having each questioncode as its own column.
 
+    The responses are reshaped directly from the long responses table, and the
+    contributor data is joined once for each reference and instance rather than
+    onto every long response row.
+
     Arguments:
         contributors -- DataFrame containing contributor data for BERD
                         from SPP Snapshot file
@@ -71,14 +139,14 @@ def full_responses(contributors: pd.DataFrame, responses: pd.DataFrame) -> pd.Da
 
     responses_dropped = responses_dropped.astype({"instance": "Int64"})
 
-    merged_df = contributors_dropped.merge(
-        responses_dropped, on=["reference", "survey", "period"], how="outer"
-    )
-    # Create contextual df by dropping "questioncode" and "response" cols. Remove dupes
-    contextual_df = create_contextual_dataframe(merged_df, unique_id_cols)
+    # Join the contributor data onto each reference and instance that responded
+    instances_df = create_contextual_dataframe(responses_dropped, unique_id_cols)
+    contextual_df = contributors_dropped.merge(
+        instances_df, on=["reference", "survey", "period"], how="outer"
+    ).drop_duplicates()
 
-    # Create a response dataframe using pivot_table to reshape the data
-    response_df = create_response_dataframe(merged_df, unique_id_cols)
+    # Create a response dataframe with one column per questioncode
+    response_df = create_wide_response_dataframe(responses_dropped, unique_id_cols)
 
     full_responses = response_df.merge(contextual_df, on=unique_id_cols, how="outer")
 
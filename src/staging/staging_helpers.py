@@ -146,7 +146,7 @@ def load_snapshot_feather(feather_file, read_feather):
 
 def load_val_snapshot_json(
     snapshot_path: str,
-    load_json: Callable,
+    open_file: Callable,
     config: dict,
 ) -> Tuple[pd.DataFrame, str]:
     """
@@ -159,12 +159,15 @@ def load_val_snapshot_json(
         dataframes into a full responses dataframe, and validates the full
         responses dataframe against a combined schema.
 
+    The snapshot is parsed incrementally as it is read, so the whole JSON file
+        is never loaded into memory as a dictionary.
+
     Args:
         snapshot_path (str): The path to the JSON file containing the snapshot
         data.
-        load_json (function): The function to use to load the JSON file.
+        open_file (function): The function to use to open the JSON file for
+        reading, from the network, HDFS or s3 mods.
         config (dict): A dictionary containing configuration options.
-        loaded from a network or HDFS.
 
     Returns:
         tuple: A tuple containing the full responses dataframe and the response
@@ -172,10 +175,9 @@ def load_val_snapshot_json(
     """
     StagingHelperLogger.info("Loading SPP snapshot data from json file")
 
-    # Load data from JSON file
-    snapdata = load_json(snapshot_path)
-
-    contributors_df, responses_df = spp_parser.parse_snap_data(snapdata)
+    # Parse the contributors and responses while reading the JSON file
+    with open_file(snapshot_path) as snapshot_file:
+        contributors_df, responses_df = spp_parser.parse_snap_stream(snapshot_file)
 
     # Get response rate
     res_rate = "{:.2f}".format(processing.response_rate(contributors_df, responses_df))
@@ -18,8 +18,9 @@ StagingMainLogger = logging.getLogger(__name__)
 def run_staging(  # noqa: C901
     config: dict,
     rd_file_exists: callable,
-    rd_load_json: callable,
+    rd_open_file: callable,
     rd_read_csv: callable,
+    rd_read_mapper: callable,
     rd_write_csv: callable,
     rd_read_feather: Callable,
     rd_write_feather: Callable,
@@ -38,10 +39,12 @@ def run_staging(  # noqa: C901
         config (dict): The pipeline configuration
         rd_file_exists (Callable): Function to check if file exists
             Avaible in s3, hdfs or network version depending "platform".
-        rd_load_json (Callable): Function to load a json file.
+        rd_open_file (Callable): Function to open a file for reading in chunks.
             Avaible in s3, hdfs or network version depending "platform".
         rd_read_csv (Callable): Function to read a csv file.
             Avaible in s3, hdfs or network version depending "platform".
+        rd_read_mapper (Callable): Function to read a mapper csv file, served
+            from the mapper cache when the csv is unchanged.
         rd_write_csv (Callable): Function to write to a csv file.
             Avaible in s3, hdfs or network version depending "platform".
         rd_read_feather (Callable): Function to read feather files to Pandas
@@ -106,7 +109,7 @@ def run_staging(  # noqa: C901
             # Read in postcode mapper (needed later in the pipeline)
             postcode_mapper = config["mapping_paths"]["postcode_mapper"]
             rd_file_exists(postcode_mapper, raise_error=True)
-            postcode_mapper = rd_read_csv(postcode_mapper)
+            postcode_mapper = rd_read_mapper(postcode_mapper)
 
         else:  # Read from JSON
             # Check data file exists, raise an error if it does not.
@@ -118,7 +121,7 @@ def run_staging(  # noqa: C901
             rd_file_exists(snapshot_path, raise_error=True)
             full_responses, response_rate = helpers.load_val_snapshot_json(
                 snapshot_path,
-                rd_load_json,
+                rd_open_file,
                 config,
             )
 
@@ -143,7 +146,7 @@ def run_staging(  # noqa: C901
                 full_responses,
                 run_id,
                 rd_file_exists,
-                rd_read_csv,
+                rd_read_mapper,
                 rd_write_csv,
             )
 
@@ -168,7 +171,7 @@ def run_staging(  # noqa: C901
         # Read in postcode mapper (needed later in the pipeline)
         postcode_mapper = config["mapping_paths"]["postcode_mapper"]
         rd_file_exists(postcode_mapper, raise_error=True)
-        postcode_mapper = rd_read_csv(postcode_mapper)
+        postcode_mapper = rd_read_mapper(postcode_mapper)
 
     # Staging of the main snapshot data is now complete
     StagingMainLogger.info("Staging of main snapshot data complete.")
@@ -229,7 +232,7 @@ def run_staging(  # noqa: C901
             config,
             StagingMainLogger,
             rd_file_exists,
-            rd_read_csv,
+            rd_read_mapper,
         )
 
         # Loading SIC division detailed mapper
@@ -238,7 +241,7 @@ def run_staging(  # noqa: C901
             config,
             StagingMainLogger,
             rd_file_exists,
-            rd_read_csv,
+            rd_read_mapper,
         )
 
         pg_detailed_mapper = helpers.load_validate_mapper(
@@ -246,7 +249,7 @@ def run_staging(  # noqa: C901
             config,
             StagingMainLogger,
             rd_file_exists,
-            rd_read_csv,
+            rd_read_mapper,
         )
 
         # seaparate PNP data from full_responses (BERD data)
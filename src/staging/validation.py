@@ -1,7 +1,10 @@
 import os
 import toml
+import warnings
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 import logging
 from src.utils.wrappers import time_logger_wrap, exception_wrap
@@ -104,27 +107,185 @@ def check_data_shape(
     return cols_match
 
 
-def validate_data_with_schema(survey_df: pd.DataFrame, schema_path: str):  # noqa: C901
-    """Takes the schema from the toml file and validates the survey data df.
+def _parse_schema_dtypes(file_path: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse the deduced data type of each column from a toml schema.
 
     Args:
-        survey_df (pd.DataFrame): Survey data in a pd.df format
-        schema_path (str): path to the schema toml (should be in config folder)
+        file_path (str): Path to the schema toml.
+
+    Returns:
+        tuple: Pairs of column name and data type, in schema order.
     """
-    ValidationLogger.info(f"Starting validation with {schema_path}")
-    # Load schema from toml
-    dtypes_schema = load_schema(schema_path)
+    dtypes_schema = load_schema(file_path)
 
     if not dtypes_schema:
-        raise FileNotFoundError(f"File at {schema_path} does not exist. Check path")
+        raise FileNotFoundError(f"File at {file_path} does not exist. Check path")
 
-    # Create a dict for dtypes only
-    dtypes_dict = {
-        column_nm: dtypes_schema[column_nm]["Deduced_Data_Type"]
+    return tuple(
+        (column_nm, dtypes_schema[column_nm]["Deduced_Data_Type"])
         for column_nm in dtypes_schema.keys()
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_cached_schema_dtypes(
+    file_path: str, modified_time: float
+) -> Tuple[Tuple[str, str], ...]:
+    """Parse the data types from a toml schema, cached by path and modified time."""
+    ValidationLogger.debug(f"Parsing schema {file_path}")
+    return _parse_schema_dtypes(file_path)
+
+
+def load_schema_dtypes(*schema_paths: str) -> Dict[str, str]:
+    """Load the deduced data type of each column from one or more toml schemas.
+
+    Each schema file is only parsed once, and is parsed again if it is modified.
+    Where a column is in more than one schema, the data type from the first
+    schema is used.
+
+    Args:
+        *schema_paths (str): Paths to the schema tomls.
+
+    Returns:
+        dict: The data type of each column in the schemas.
+    """
+    dtypes = {}
+    for schema_path in schema_paths:
+        if os.path.isfile(schema_path):
+            schema_dtypes = _load_cached_schema_dtypes(
+                schema_path, os.path.getmtime(schema_path)
+            )
+        else:
+            schema_dtypes = _parse_schema_dtypes(schema_path)
+
+        for column, dtype in schema_dtypes:
+            dtypes.setdefault(column, dtype)
+
+    return dtypes
+
+
+# Schema data types which can be set while reading a csv. Numeric columns are left
+# to be inferred, so that values which are not numbers are coerced and logged by
+# validate_data_with_schema rather than failing the read.
+READ_CSV_DTYPES = {"str": str, "category": "category"}
+
+
+def schema_read_csv_kwargs(schema_path: str) -> Dict[str, Any]:
+    """Derive the read_csv usecols and dtype arguments from a toml schema.
+
+    Only the columns in the schema are read, and text columns are read with their
+    schema data type, rather than being inferred and converted afterwards.
+
+    Args:
+        schema_path (str): Path to the schema toml.
+
+    Returns:
+        dict: The usecols and dtype keyword arguments for read_csv.
+    """
+    dtypes = load_schema_dtypes(schema_path)
+    read_dtypes = {
+        column: READ_CSV_DTYPES[dtype]
+        for column, dtype in dtypes.items()
+        if dtype in READ_CSV_DTYPES
     }
+    return {"usecols": list(dtypes), "dtype": read_dtypes}
+
+
+def _group_columns_by_dtype(dtypes: Dict[str, str]) -> Dict[str, List[str]]:
+    """Group the columns to cast by their data type, keeping the column order."""
+    dtype_groups = {}
+    for column, dtype in dtypes.items():
+        dtype_groups.setdefault(dtype, []).append(column)
+    return dtype_groups
+
+
+def _replace_columns(survey_df: pd.DataFrame, cast_df: pd.DataFrame):
+    """Replace columns of survey_df in place with those in cast_df.
+
+    Setting the columns one at a time copies the rest of the data each time, so
+    the columns are dropped together and then inserted back in their positions.
+    """
+    positions = [survey_df.columns.get_loc(column) for column in cast_df.columns]
+
+    with warnings.catch_warnings():
+        # Each inserted column is its own block, which pandas warns about
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        survey_df.drop(columns=cast_df.columns, inplace=True)
+        for position, column in sorted(zip(positions, cast_df.columns)):
+            survey_df.insert(position, column, cast_df[column])
+
+
+def _coerce_to_numeric(survey_df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Convert whole columns to numbers, logging how many values were coerced.
+
+    Args:
+        survey_df (pd.DataFrame): Survey data in a pd.df format
+        columns (list): The columns to convert
+
+    Returns:
+        pd.DataFrame: The converted columns, where values which are not numbers
+            are NaN.
+    """
+    original_df = survey_df[columns]
+    numeric_df = original_df.apply(pd.to_numeric, errors="coerce")
+
+    coerced_counts = (numeric_df.isna() & original_df.notna()).sum()
+    for column, count in coerced_counts[coerced_counts > 0].items():
+        ValidationLogger.warning(
+            f"{count} values in column '{column}' are not numeric and were set to NaN"
+        )
+
+    return numeric_df
+
+
+def _cast_columns(
+    survey_df: pd.DataFrame,
+    cast_df: pd.DataFrame,
+    dtype: str,
+    raise_errors: bool = False,
+):
+    """Cast a group of columns to one data type and replace them in survey_df.
+
+    The group is cast at once. If that fails, the columns are cast individually
+    so that only the columns which cannot be cast are left as they are.
+
+    Args:
+        survey_df (pd.DataFrame): Survey data in a pd.df format
+        cast_df (pd.DataFrame): The columns of survey_df to cast
+        dtype (str): The data type to cast the columns to
+        raise_errors (bool): Whether to raise errors rather than log them
+    """
+    try:
+        cast_df = cast_df.astype(dtype)
+    except Exception:
+        if raise_errors:
+            raise
+        cast_columns = {}
+        for column in cast_df.columns:
+            try:
+                cast_columns[column] = cast_df[column].astype(dtype)
+            except Exception as e:
+                ValidationLogger.error(e)
+                cast_columns[column] = cast_df[column]
+        cast_df = pd.DataFrame(cast_columns, index=cast_df.index)
+
+    _replace_columns(survey_df, cast_df)
+
+
+def validate_data_with_schema(survey_df: pd.DataFrame, schema_path: str):  # noqa: C901
+    """Takes the schema from the toml file and validates the survey data df.
+
+    Columns with the same data type are converted together, and the number of
+    values which could not be converted to numbers is logged for each column.
+
+    Args:
+        survey_df (pd.DataFrame): Survey data in a pd.df format
+        schema_path (str): path to the schema toml (should be in config folder)
+    """
+    ValidationLogger.info(f"Starting validation with {schema_path}")
+    # Load data types from the schema toml
+    dtypes_dict = load_schema_dtypes(schema_path)
 
-    # Cast each column individually and catch any errors
     for column in dtypes_dict.keys():
         # Fix for the columns which contain empty strings. We want to cast as NaN
         if dtypes_dict[column] == "pd.NA":
@@ -132,30 +293,37 @@ def validate_data_with_schema(survey_df: pd.DataFrame, schema_path: str):  # noq
             survey_df[column] = np.nan
             dtypes_dict[column] = "float64"
 
-        try:
-            if dtypes_dict[column] == "Int64":
-                # Convert non-integer string to NaN
-                survey_df[column] = survey_df[column].apply(
-                    pd.to_numeric, errors="coerce"
-                )
-                # Cast columns to Int64
-                survey_df[column] = survey_df[column].astype(pd.Int64Dtype())
-            elif dtypes_dict[column] == "str":
-                survey_df[column] = survey_df[column].astype("string")
-            elif "datetime" in dtypes_dict[column]:
+    # Log any columns in the schema which are missing from the data
+    missing_columns = set(dtypes_dict) - set(survey_df.columns)
+    for column in missing_columns:
+        ValidationLogger.error(f"Column '{column}' is missing from the data")
+    dtypes_dict = {
+        column: dtype
+        for column, dtype in dtypes_dict.items()
+        if column not in missing_columns
+    }
+
+    # Cast each group of columns with the same data type and catch any errors
+    for dtype, columns in _group_columns_by_dtype(dtypes_dict).items():
+        if dtype == "Int64":
+            # Convert non-integer string to NaN, then cast columns to Int64
+            numeric_df = _coerce_to_numeric(survey_df, columns)
+            _cast_columns(survey_df, numeric_df, pd.Int64Dtype())
+        elif dtype == "str":
+            _cast_columns(survey_df, survey_df[columns], "string")
+        elif "datetime" in dtype:
+            for column in columns:
                 try:
                     survey_df[column] = pd.to_datetime(
                         survey_df[column], errors="coerce", dayfirst=True
                     )
                 except TypeError:
-                    raise TypeError(
+                    ValidationLogger.error(
                         f"Failed to convert column '{column}' to datetime. Please check"
                         " the data."
                     )
-            else:
-                survey_df[column] = survey_df[column].astype(dtypes_dict[column])
-        except Exception as e:
-            ValidationLogger.error(e)
+        else:
+            _cast_columns(survey_df, survey_df[columns], dtype)
     ValidationLogger.info("Validation successful")
 
 
@@ -166,30 +334,22 @@ def combine_schemas_validate_full_df(
 ):
     """Takes the schemas from the toml file and validates the survey data df.
 
+    Columns with the same data type are converted together, and the number of
+    values which could not be converted to numbers is logged for each column.
+
     Args:
         survey_df (pd.DataFrame): Survey data in a pd.df format
         contributor_schema (str): path to the schema toml (should be in config folder)
         wide_response_schema (str): path to the schema toml (should be in config folder)
     """
 
-    # Load schemas from toml
+    # Load data types from both schema tomls
     ValidationLogger.info("Loading contributer and wide schemas from toml")
-    dtypes_con_schema = load_schema(contributor_schema)
-    dtypes_res_schema = load_schema(wide_response_schema)
-
-    # Create all unique keys from both schema
-    full_columns_list = set(dtypes_con_schema) | set(dtypes_res_schema)
-
-    # Create a dict for dtypes only
-    dtypes = {
-        column_nm: dtypes_con_schema[column_nm]["Deduced_Data_Type"]
-        if column_nm in dtypes_con_schema
-        else dtypes_res_schema[column_nm]["Deduced_Data_Type"]
-        for column_nm in full_columns_list
-    }
+    schema_dtypes = load_schema_dtypes(contributor_schema, wide_response_schema)
+
+    # Create a dict of dtypes for the columns in the data
+    dtypes = {column: schema_dtypes[column] for column in survey_df.columns}
 
-    # Cast each column individually and catch any errors
-    ValidationLogger.info("Starting data type casting process")
     for column in survey_df.columns:
         # Fix for the columns which contain empty strings. We want to cast as NaN
         if dtypes[column] == "pd.NA":
@@ -197,28 +357,35 @@ def combine_schemas_validate_full_df(
             survey_df[column] = np.nan
             dtypes[column] = "float64"
 
-            # Try to cast each column to the required data type
-
-        if dtypes[column] == "Int64":
-            # Convert non-integer string to NaN
-            survey_df[column] = survey_df[column].apply(pd.to_numeric, errors="coerce")
-            # Cast columns to Int64
-            survey_df[column] = survey_df[column].astype("Int64")
-        elif dtypes[column] == "float64":
+    # Cast each group of columns with the same data type
+    ValidationLogger.info("Starting data type casting process")
+    for dtype, columns in _group_columns_by_dtype(dtypes).items():
+        if dtype in ["Int64", "float64"]:
             # Convert non-integer string to NaN
-            survey_df[column] = survey_df[column].apply(pd.to_numeric, errors="coerce")
-            # Cast columns to float64
-            survey_df[column] = survey_df[column].astype("float64", errors="ignore")
-        elif dtypes[column] == "str":
-            survey_df[column] = survey_df[column].astype("string")
-        elif pd.api.types.is_datetime64tz_dtype(survey_df[column]):
-            # Remove timezone information because some columns values are
-            # time-zone (tz) aware. To make the column homogeneous, we remove the
-            # tz info where it exists.
-            survey_df[column] = survey_df[column].dt.tz_localize(None)
-            survey_df[column] = survey_df[column].astype(dtypes[column])
+            numeric_df = _coerce_to_numeric(survey_df, columns)
+            if dtype == "Int64":
+                _cast_columns(survey_df, numeric_df, "Int64", raise_errors=True)
+            else:
+                _replace_columns(
+                    survey_df, numeric_df.astype("float64", errors="ignore")
+                )
+        elif dtype == "str":
+            _cast_columns(survey_df, survey_df[columns], "string", raise_errors=True)
         else:
-            survey_df[column] = survey_df[column].astype(dtypes[column])
+            cast_df = survey_df[columns]
+            tz_columns = [
+                column
+                for column in columns
+                if pd.api.types.is_datetime64tz_dtype(cast_df[column])
+            ]
+            if tz_columns:
+                # Remove timezone information because some columns values are
+                # time-zone (tz) aware. To make the column homogeneous, we remove the
+                # tz info where it exists.
+                cast_df = cast_df.copy()
+                for column in tz_columns:
+                    cast_df[column] = cast_df[column].dt.tz_localize(None)
+            _cast_columns(survey_df, cast_df, dtype, raise_errors=True)
     ValidationLogger.info("Finished data type casting process")
 
 
@@ -1,5 +1,6 @@
 """Function to validate the breakdown totals."""
 import logging
+import numpy as np
 import pandas as pd
 
 from typing import Tuple
@@ -95,12 +96,40 @@ def remove_all_nulls_rows(df: pd.DataFrame, config: dict) -> pd.DataFrame:
     return rows_to_validate
 
 
+def _failure_messages(
+    rows_to_validate: pd.DataFrame, failed: np.ndarray, descriptions: list
+) -> Tuple[str, int]:
+    """
+    Create the messages for the rows which fail each check.
+
+    Args:
+        rows_to_validate (pd.DataFrame): The dataframe that was checked.
+        failed (np.ndarray): Boolean array with a row for each row checked and a
+            column for each check, True where the row fails the check.
+        descriptions (list): The description of the failure for each check.
+
+    Returns:
+        tuple(str, int)
+    """
+    references = rows_to_validate["reference"].to_numpy()
+    instances = rows_to_validate["instance"].to_numpy()
+    # np.nonzero returns the failures row by row, then check by check
+    msg = "".join(
+        f"{descriptions[check]} for reference: {references[row]}, instance"
+        f" {instances[row]}.\n "
+        for row, check in zip(*np.nonzero(failed))
+    )
+    return msg, int(failed.sum())
+
+
 def equal_validation(
     rows_to_validate: pd.DataFrame, equals_checks: dict
 ) -> pd.DataFrame:
     """
     Check where the sum of some columns should equal another column.
 
+    Rows where the columns of a check are all null or all zero pass that check.
+
     Args:
         rows_to_validate (pd.DataFrame): The dataframe to check.
         equals_checks (dict): The dictionary of columns to check.
@@ -110,28 +139,21 @@ def equal_validation(
     """
     BreakdownValidationLogger.info("Doing breakdown total checks...")
 
-    msg = ""
-    count = 0
-    for index, row in rows_to_validate.iterrows():
-        for key, columns in equals_checks.items():
-            total_column = columns[-1]
-            breakdown_columns = columns[:-1]
-            if (
-                rows_to_validate[columns].isnull().all(axis=1).iloc[index]
-                or (rows_to_validate[columns] == 0).all(axis=1).iloc[index]
-            ):
-                continue
-            if not (
-                rows_to_validate[breakdown_columns].sum(axis=1)
-                == rows_to_validate[total_column]
-            ).iloc[index]:
-                msg += (
-                    f"Columns {breakdown_columns} do not equal column"
-                    f" {total_column} for reference: {row['reference']}, instance"
-                    f" {row['instance']}.\n "
-                )
-                count += 1
-    return msg, count
+    failed = np.zeros((len(rows_to_validate), len(equals_checks)), dtype=bool)
+    descriptions = []
+    for i, columns in enumerate(equals_checks.values()):
+        total_column = columns[-1]
+        breakdown_columns = columns[:-1]
+        values = rows_to_validate[columns]
+        skip = values.isnull().all(axis=1) | (values == 0).all(axis=1)
+        equal = values[breakdown_columns].sum(axis=1) == values[total_column]
+        failed[:, i] = ~(
+            skip.to_numpy(dtype=bool) | equal.to_numpy(dtype=bool, na_value=False)
+        )
+        descriptions.append(
+            f"Columns {breakdown_columns} do not equal column {total_column}"
+        )
+    return _failure_messages(rows_to_validate, failed, descriptions)
 
 
 def greater_than_validation(
@@ -155,21 +177,20 @@ def greater_than_validation(
         "check14": ["209", "221"],
         "check15": ["211", "202"],
     }
-    for index, row in rows_to_validate.iterrows():
-        for key, columns in greater_than_checks.items():
-            should_be_greater = columns[0]
-            should_not_be_greater = columns[1]
-            if (
-                rows_to_validate[should_not_be_greater]
-                > rows_to_validate[should_be_greater]
-            ).all():
-                msg += (
-                    f"Column {should_not_be_greater} is greater than"
-                    f" {should_be_greater} for reference: {row['reference']}, instance"
-                    f" {row['instance']}.\n "
-                )
-                count += 1
-    return msg, count
+    failed = np.zeros((len(rows_to_validate), len(greater_than_checks)), dtype=bool)
+    descriptions = []
+    for i, columns in enumerate(greater_than_checks.values()):
+        should_be_greater = columns[0]
+        should_not_be_greater = columns[1]
+        failed[:, i] = (
+            rows_to_validate[should_not_be_greater]
+            > rows_to_validate[should_be_greater]
+        ).to_numpy(dtype=bool, na_value=False)
+        descriptions.append(
+            f"Column {should_not_be_greater} is greater than {should_be_greater}"
+        )
+    check_msg, check_count = _failure_messages(rows_to_validate, failed, descriptions)
+    return msg + check_msg, count + check_count
 
 
 def get_breakdown_errors(df: pd.DataFrame, to_check: dict) -> pd.DataFrame:
@@ -0,0 +1,301 @@
+"""Checkpointing of the outputs of each pipeline stage.
+
+Each stage of the pipeline is given a key, which is a hash of the key of the
+previous stage, the pipeline version, the config and the size and md5sum of the
+input files the stage reads. The outputs of the stage are saved to feather files
+under that key, so a later run with the same key can load them instead of running
+the stage again. As the key of each stage includes the key of the stage before
+it, changing an input or a setting reruns that stage and every stage after it.
+
+The settings which only switch outputs on or off are left out of the key, so a
+run where only the outputs have changed loads every stage up to run_outputs from
+its checkpoint. A stage with one of its own QA outputs switched on always runs,
+so that the QA files are written, as does a stage run in a mode which writes
+files other than its outputs, such as freezing.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, List
+
+import pandas as pd
+
+CheckpointLogger = logging.getLogger(__name__)
+
+# The order the stages run in the pipeline
+STAGES = [
+    "staging",
+    "freezing",
+    "ni",
+    "construction",
+    "mapping",
+    "imputation",
+    "postcode_construction",
+    "outliers",
+    "estimation",
+    "apportionment",
+    "outputs",
+]
+
+# The config sections holding the paths of the input files read by each stage
+STAGE_INPUT_PATHS = {
+    "staging": ["staging_paths", "mapping_paths"],
+    "freezing": ["freezing_paths"],
+    "ni": ["ni_paths"],
+    "construction": ["construction_paths"],
+    "mapping": ["mapping_paths"],
+    "postcode_construction": ["construction_paths"],
+}
+
+# The global settings for the QA outputs written by each stage
+STAGE_QA_OUTPUTS = {
+    "staging": ["output_full_responses", "output_pnp_full_responses"],
+    "ni": ["output_ni_full_responses"],
+    "mapping": ["output_mapping_qa", "output_mapping_ni_qa"],
+    "imputation": ["output_imputation_qa"],
+    "outliers": ["output_auto_outliers", "output_outlier_qa"],
+    "estimation": ["output_estimation_qa"],
+    "apportionment": ["output_apportionment_qa", "output_status_filtered"],
+}
+
+
+# The global settings for the modes in which a stage writes files for review
+# besides its outputs, so it always runs while any of them is on
+STAGE_FILE_MODES = {
+    "freezing": [
+        "run_with_snapshot_and_freeze",
+        "run_updates_and_freeze",
+        "load_updated_snapshot_for_comparison",
+    ],
+}
+
+
+def _json_default(value: Any) -> Any:
+    """Convert numpy scalars so they can be written to json."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} cannot be saved in a checkpoint")
+
+
+def _columnless_frame(num_rows: int) -> pd.DataFrame:
+    """Rebuild a dataframe without columns, saved by its number of rows."""
+    if num_rows == 0:
+        return pd.DataFrame()
+    return pd.DataFrame(index=pd.RangeIndex(num_rows))
+
+
+class StageCheckpointer:
+    """Saves the outputs of each pipeline stage, and reloads them when unchanged.
+
+    Args:
+        config (dict): The pipeline configuration.
+        version (str): The version of the pipeline.
+        file_exists_func (Callable): Function to check if a file exists.
+        isfile_func (Callable): Function to check if a path is a file.
+        mkdir_func (Callable): Function to create a directory.
+        read_feather_func (Callable): Function to read a feather file.
+        write_feather_func (Callable): Function to write a feather file.
+        load_json_func (Callable): Function to load a json file.
+        write_string_func (Callable): Function to write bytes to a file.
+        stat_size_func (Callable): Function to get the size of a file in bytes.
+        md5sum_func (Callable): Function to get the md5sum of a file.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        version: str,
+        file_exists_func: Callable,
+        isfile_func: Callable,
+        mkdir_func: Callable,
+        read_feather_func: Callable,
+        write_feather_func: Callable,
+        load_json_func: Callable,
+        write_string_func: Callable,
+        stat_size_func: Callable,
+        md5sum_func: Callable,
+    ):
+        # config based attrs
+        checkpoint_config = config["checkpoints"]
+        self.enabled = checkpoint_config["use_checkpoints"]
+        self.force_rerun = checkpoint_config["force_rerun"]
+        resume_from = checkpoint_config["resume_from"]
+        self.resume_from = None if resume_from in [None, "None"] else resume_from
+        if self.resume_from is not None and self.resume_from not in STAGES:
+            raise ValueError(
+                f"checkpoints:resume_from must be one of {STAGES}, "
+                f"not {self.resume_from}."
+            )
+        self.checkpoint_path = config["checkpoint_paths"]["stage_outputs_path"]
+        self.config = config
+        self.version = version
+        # attrs containing callables
+        self.file_exists_func = file_exists_func
+        self.isfile_func = isfile_func
+        self.mkdir_func = mkdir_func
+        self.read_feather_func = read_feather_func
+        self.write_feather_func = write_feather_func
+        self.load_json_func = load_json_func
+        self.write_string_func = write_string_func
+        self.stat_size_func = stat_size_func
+        self.md5sum_func = md5sum_func
+        # the key of the last stage run or loaded
+        self.key = ""
+        # the size and md5sum of each input file, read once per run
+        self._fingerprints = {}
+
+    def _create_folder(self):
+        """Create the folder for the checkpoints if it doesn't exist."""
+        for folder in [os.path.dirname(self.checkpoint_path), self.checkpoint_path]:
+            if not self.file_exists_func(folder):
+                self.mkdir_func(folder)
+
+    def _settings(self) -> dict:
+        """Return the config without the checkpoint and output settings."""
+        settings = {
+            section: values
+            for section, values in self.config.items()
+            if section not in ["checkpoints", "qa_output_formats"]
+        }
+        settings["global"] = {
+            setting: value
+            for setting, value in self.config["global"].items()
+            if not setting.startswith("output_")
+        }
+        return settings
+
+    def _input_fingerprints(self, stage: str) -> dict:
+        """Return the size and md5sum of each input file read by a stage."""
+        fingerprints = {}
+        for section in STAGE_INPUT_PATHS.get(stage, []):
+            for path in self.config.get(section, {}).values():
+                if not isinstance(path, str) or not path:
+                    continue
+                if path not in self._fingerprints:
+                    if not self.isfile_func(path):
+                        continue
+                    self._fingerprints[path] = [
+                        str(self.stat_size_func(path)),
+                        self.md5sum_func(path),
+                    ]
+                fingerprints[path] = self._fingerprints[path]
+        return fingerprints
+
+    def stage_key(self, stage: str) -> str:
+        """Return the key of a stage, following on from the key of the last stage.
+
+        Args:
+            stage (str): The name of the stage.
+
+        Returns:
+            str: A hash of the previous key, settings and input files of the stage.
+        """
+        key_items = {
+            "stage": stage,
+            "previous": self.key,
+            "version": self.version,
+            "settings": self._settings(),
+            "inputs": self._input_fingerprints(stage),
+        }
+        key_json = json.dumps(key_items, sort_keys=True, default=_json_default)
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def _use_checkpoint(self, stage: str) -> bool:
+        """Whether a saved checkpoint may be loaded for a stage."""
+        if self.resume_from is not None and (
+            STAGES.index(stage) >= STAGES.index(self.resume_from)
+        ):
+            return False
+        file_settings = STAGE_QA_OUTPUTS.get(stage, []) + STAGE_FILE_MODES.get(
+            stage, []
+        )
+        return not any(self.config["global"].get(setting) for setting in file_settings)
+
+    def _save(self, stage: str, key: str, outputs: Any):
+        """Save the outputs of a stage as feather files, with a json manifest."""
+        is_tuple = isinstance(outputs, tuple)
+        manifest = {"stage": stage, "tuple": is_tuple, "outputs": []}
+        self._create_folder()
+        for i, output in enumerate(outputs if is_tuple else (outputs,)):
+            if not isinstance(output, pd.DataFrame):
+                manifest["outputs"].append({"value": output})
+                continue
+            # feather files must have columns, so frames without any, such as
+            # the empty placeholder frames, are recorded by their length only
+            if len(output.columns) == 0:
+                manifest["outputs"].append({"columnless_rows": len(output)})
+                continue
+            filepath = f"{self.checkpoint_path}/{stage}_{key}_{i}.feather"
+            # feather files can only hold a default index, so any other index
+            # is saved as columns and restored when the file is loaded
+            if output.index.equals(pd.RangeIndex(len(output))):
+                index_names = None
+                output = output.reset_index(drop=True)
+            else:
+                index_names = list(output.index.names)
+                output = output.reset_index()
+            self.write_feather_func(filepath, output)
+            manifest["outputs"].append({"file": filepath, "index": index_names})
+        # the manifest is written last, so that it only exists once all the
+        # outputs of the stage have been saved
+        manifest_json = json.dumps(manifest, default=_json_default)
+        self.write_string_func(
+            manifest_json.encode("utf-8"), f"{self.checkpoint_path}/{stage}_{key}.json"
+        )
+
+    def _load(self, stage: str, key: str) -> Any:
+        """Load the outputs of a stage saved by _save."""
+        manifest = self.load_json_func(f"{self.checkpoint_path}/{stage}_{key}.json")
+        outputs: List[Any] = []
+        for output in manifest["outputs"]:
+            if "columnless_rows" in output:
+                outputs.append(_columnless_frame(output["columnless_rows"]))
+                continue
+            if "file" not in output:
+                outputs.append(output["value"])
+                continue
+            df = self.read_feather_func(output["file"])
+            if output["index"] is not None:
+                index_columns = df.columns[: len(output["index"])].tolist()
+                df = df.set_index(index_columns)
+                df.index.names = output["index"]
+            outputs.append(df)
+        return tuple(outputs) if manifest["tuple"] else outputs[0]
+
+    def run_stage(self, stage: str, stage_func: Callable, *args, **kwargs) -> Any:
+        """Run a stage of the pipeline, or load its outputs from a checkpoint.
+
+        Args:
+            stage (str): The name of the stage, one of STAGES.
+            stage_func (Callable): The function which runs the stage.
+            *args: Positional arguments passed to stage_func.
+            **kwargs: Keyword arguments passed to stage_func.
+
+        Returns:
+            Any: The outputs of stage_func.
+        """
+        # With force_rerun, no checkpoints are loaded or saved, so the input
+        # files, which can be very large, are not read to find the stage keys
+        if not self.enabled or self.force_rerun:
+            return stage_func(*args, **kwargs)
+
+        key = self.stage_key(stage)
+        manifest_path = f"{self.checkpoint_path}/{stage}_{key}.json"
+        if self._use_checkpoint(stage) and self.file_exists_func(manifest_path):
+            try:
+                outputs = self._load(stage, key)
+                CheckpointLogger.info(f"Loaded {stage} outputs from checkpoint {key}")
+                self.key = key
+                return outputs
+            except Exception as e:
+                CheckpointLogger.warning(f"Checkpoint for {stage} not loaded: {e}")
+
+        outputs = stage_func(*args, **kwargs)
+        try:
+            self._save(stage, key, outputs)
+            CheckpointLogger.info(f"Saved {stage} outputs to checkpoint {key}")
+        except Exception as e:
+            CheckpointLogger.warning(f"Checkpoint for {stage} not saved: {e}")
+        self.key = key
+        return outputs
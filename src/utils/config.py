@@ -28,6 +28,7 @@ def config_setup(user_config_path: str, dev_config_path: str) -> Dict:
         "estimation",
         "apportionment",
         "outputs",
+        "checkpoint",
     ]
     combined_config = update_config_with_paths(combined_config, modules)
 
@@ -0,0 +1,57 @@
+"""Chunked reading of file metadata for the manifest and file checks.
+
+Files are read a chunk at a time, so the memory used does not grow with the size
+of the file. stream_file_info finds the size, md5sum and header of a file in a
+single pass, rather than reading the file once for each.
+"""
+import hashlib
+from typing import BinaryIO
+
+# The number of bytes read from a file at a time
+FILE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# The most bytes kept as the header of a file without a line ending
+MAX_HEADER_SIZE = 1024 * 1024
+
+
+def md5_stream(stream: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE) -> str:
+    """Get the md5sum of a binary stream, reading it a chunk at a time.
+
+    Args:
+        stream (BinaryIO): The open binary stream to hash.
+        chunk_size (int): The number of bytes read at a time.
+
+    Returns:
+        str: The hex md5sum of the stream.
+    """
+    md5 = hashlib.md5()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        md5.update(chunk)
+    return md5.hexdigest()
+
+
+def stream_file_info(stream: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE) -> dict:
+    """Get the size, md5sum and header of a binary stream in one pass.
+
+    Args:
+        stream (BinaryIO): The open binary stream to read.
+        chunk_size (int): The number of bytes read at a time.
+
+    Returns:
+        dict: The "size" in bytes, the hex "md5sum", and the first line of the
+            stream as the "header", without its line ending.
+    """
+    md5 = hashlib.md5()
+    size = 0
+    first_line = bytearray()
+    header_complete = False
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        md5.update(chunk)
+        size += len(chunk)
+        if not header_complete:
+            end = chunk.find(b"\n")
+            first_line += chunk if end < 0 else chunk[:end]
+            header_complete = end >= 0 or len(first_line) >= MAX_HEADER_SIZE
+    header = bytes(first_line[:MAX_HEADER_SIZE]).decode("utf-8", errors="replace")
+    header = header.rstrip("\r")
+    return {"size": size, "md5sum": md5.hexdigest(), "header": header}
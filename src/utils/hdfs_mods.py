@@ -14,10 +14,13 @@ import logging
 import subprocess
 import os
 import pathlib
-from typing import List, Union
+from typing import Dict, Iterator, List, Union
 
 import yaml
 
+from src.utils.file_info import md5_stream, stream_file_info
+from src.utils.hdfs_session import HdfsSession
+from src.utils.table_formats import write_table
 from src.utils.wrappers import time_logger_wrap
 
 try:
@@ -31,24 +34,47 @@ except ImportError:
 # set up logging
 rd_logger = logging.getLogger(__name__)
 
+# The connection shared by the file operations below. Without pydoop, or if
+# the connection fails, the operations run as hadoop fs commands instead.
+_session = HdfsSession(hdfs.hdfs if HDFS_AVAILABLE else None)
+
+
+def _read_csv_chunks(filepath: str, **kwargs) -> Iterator[pd.DataFrame]:
+    """Reads a csv from HDFS in chunks, keeping the file open until every
+    chunk has been read."""
+    with hdfs.open(filepath, "r") as file:
+        try:
+            yield from pd.read_csv(file, **kwargs)
+        except Exception:
+            rd_logger.error(f"Could not read specified file: {filepath}")
+            rd_logger.info("The following arguments failed: " + str(kwargs))
+            raise ValueError
+
 
 def rd_read_csv(filepath: str, **kwargs) -> pd.DataFrame:
-    """Reads a csv from HDFS into a Pandas Dataframe using pydoop. 
-    If "thousands" argument is not specified, sets it to ",". 
+    """Reads a csv from HDFS into a Pandas Dataframe using pydoop.
+    If "thousands" argument is not specified, sets it to ",".
     Allows to use any additional keyword arguments of Pandas read_csv method.
 
     Args:
         filepath (str): Filepath (Specified in config)
-        kwargs: Optional dictionary of Pandas read_csv arguments
+        kwargs: Optional dictionary of Pandas read_csv arguments, for example
+            engine="pyarrow", chunksize to read the file in chunks, or the usecols
+            and dtype from schema_read_csv_kwargs.
     Returns:
-        pd.DataFrame: Dataframe created from csv
+        pd.DataFrame: Dataframe created from csv, or an iterator of Dataframes
+            if chunksize is given
     """
+    # If "thousands" argument is not specified, set it to ",". The pyarrow engine
+    # does not support the "thousands" argument.
+    if "thousands" not in kwargs and kwargs.get("engine") != "pyarrow":
+        kwargs["thousands"] = ","
+
+    if "chunksize" in kwargs:
+        return _read_csv_chunks(filepath, **kwargs)
+
     # Open the file in read mode inside Hadoop context
     with hdfs.open(filepath, "r") as file:
-        # If "thousands" argument is not specified, set it to ","
-        if "thousands" not in kwargs:
-            kwargs["thousands"] = ","
-        
         # Read the scv file using the path and keyword arguments
         try:
             df = pd.read_csv(file, **kwargs)
@@ -90,6 +116,18 @@ def rd_load_json(filepath: str) -> dict:
     return datadict
 
 
+def rd_open_file(filepath: str):
+    """Function to open a file in HDFS for reading in binary mode.
+
+    The returned file object can be used as a context manager, and read in chunks
+    so that large files do not have to be loaded into memory at once.
+
+    Args:
+        filepath (string): The filepath in Hue
+    """
+    return hdfs.open(filepath, "rb")
+
+
 def rd_file_exists(filepath: str, raise_error=False) -> bool:
     """Function to check file exists in hdfs.
 
@@ -191,6 +229,59 @@ def rd_read_feather(filepath):
     return df
 
 
+def _write_parquet(filepath: str, data: pd.DataFrame):
+    """Function to write dataframe as parquet file in HDFS"""
+    with hdfs.open(filepath, "wb") as file:
+        data.to_parquet(file, index=False)
+
+
+def rd_write_table(
+    filepath: str, data: pd.DataFrame, file_formats: List[str] = None
+) -> List[str]:
+    """Function to write dataframe to csv, parquet and/or feather in HDFS
+
+    See table_formats.write_table, which falls back to csv where the data cannot
+    be written in a columnar format.
+
+    Args:
+        filepath (str): Filepath (Specified in config)
+        data (pd.DataFrame): Data to be stored
+        file_formats (List[str], optional): Any of "csv", "parquet" and
+            "feather". Defaults to ["csv"].
+
+    Returns:
+        List[str]: The paths of the files written.
+    """
+    return write_table(
+        filepath,
+        data,
+        file_formats,
+        write_csv=rd_write_csv,
+        write_feather=rd_write_feather,
+        write_parquet=_write_parquet,
+        delete_file=rd_delete_file,
+    )
+
+
+def rd_read_table(filepath: str, **kwargs) -> pd.DataFrame:
+    """Function to read a csv, parquet or feather file from HDFS
+
+    The format is taken from the extension of the filepath.
+
+    Args:
+        filepath (str): Filepath (Specified in config)
+        kwargs: Optional keyword arguments for the Pandas read function
+    Returns:
+        pd.DataFrame: Dataframe created from the file
+    """
+    if not filepath.endswith((".parquet", ".feather")):
+        return rd_read_csv(filepath, **kwargs)
+    with hdfs.open(filepath, "rb") as file:
+        if filepath.endswith(".parquet"):
+            return pd.read_parquet(file, **kwargs)
+        return pd.read_feather(file, **kwargs)
+
+
 def _perform(
     command,
     shell: bool = False,
@@ -228,51 +319,77 @@ def _perform(
 
 def rd_delete_file(path: str):
     """
-    Delete a file. Uses 'hadoop fs -rm'.
+    Delete a file. Uses 'hadoop fs -rm' if there is no HDFS connection.
 
     Returns
     -------
     True for successfully completed operation. Else False.
     """
-    command = ["hadoop", "fs", "-rm", path]
-    return _perform(command)
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-rm", path]
+        return _perform(command)
+
+    info = _session.path_info(path)
+    if info is None or info["kind"] != "file":
+        return False
+    try:
+        _session.fs.delete(path, recursive=False)
+        return True
+    except IOError:
+        return False
 
 
 def rd_md5sum(path: str):
     """
-    Get md5sum of a specific file on HDFS.
+    Get md5sum of a specific file on HDFS, reading the file a chunk at a time.
     """
-    return _perform(
-        f"hadoop fs -cat {path} | md5sum",
-        shell=True,
-        str_output=True,
-        ignore_error=True,
-    ).split(" ")[0]
+    with hdfs.open(path, "rb") as file:
+        return md5_stream(file)
 
 
-def rd_stat_size(path: str):
+def rd_file_info(path: str) -> dict:
     """
-    Runs stat command on a file or directory to get the size in bytes.
+    Get the size, md5sum and header of a file on HDFS, reading the file once.
+
+    Returns
+    -------
+    A dict with the "size" in bytes, the "md5sum" and the "header" of the file.
     """
-    command = ["hadoop", "fs", "-du", "-s", path]
-    return _perform(command, str_output=True).split(" ")[0]
+    with hdfs.open(path, "rb") as file:
+        return stream_file_info(file)
+
+
+def rd_stat_size(path: str) -> int:
+    """
+    Get the size in bytes of a file, or of all the files in a directory.
+    Uses 'hadoop fs -du -s' if there is no HDFS connection.
+    """
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-du", "-s", path]
+        return int(_perform(command, str_output=True).split(" ")[0])
+    return int(_session.disk_usage(path))
 
 
 def rd_isdir(path: str) -> bool:
     """
-    Test if directory exists. Uses 'hadoop fs -test -d'.
+    Test if directory exists. Uses 'hadoop fs -test -d' if there is no HDFS
+    connection.
 
     Returns
     -------
     True for successfully completed operation. Else False.
     """
-    command = ["hadoop", "fs", "-test", "-d", path]
-    return _perform(command)
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-test", "-d", path]
+        return _perform(command)
+    info = _session.path_info(path)
+    return info is not None and info["kind"] == "directory"
 
 
 def rd_isfile(path: str) -> bool:
     """
-    Test if file exists. Uses 'hadoop fs -test -f.
+    Test if file exists. Uses 'hadoop fs -test -f' if there is no HDFS
+    connection.
 
     Returns
     -------
@@ -286,8 +403,28 @@ def rd_isfile(path: str) -> bool:
     if path is None:
         return False
 
-    command = ["hadoop", "fs", "-test", "-f", path]
-    return _perform(command)
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-test", "-f", path]
+        return _perform(command)
+    info = _session.path_info(path)
+    return info is not None and info["kind"] == "file"
+
+
+def rd_isfile_many(paths: List[str]) -> Dict[str, bool]:
+    """
+    Test if each of many files exists, over a single HDFS connection.
+
+    Returns
+    -------
+    A dict of True if the file exists, else False, keyed on each path.
+    """
+    if _session.fs is None:
+        return {path: rd_isfile(path) for path in paths}
+    infos = _session.path_info_many(paths)
+    return {
+        path: info is not None and info["kind"] == "file"
+        for path, info in infos.items()
+    }
 
 
 def rd_read_header(path: str):
@@ -314,33 +451,61 @@ def rd_write_string_to_file(content: bytes, path: str):
 
 def rd_copy_file(src_path: str, dst_path: str):
     """
-    Copy a file from one location to another. Uses 'hadoop fs -cp'.
+    Copy a file from one location to another. Uses 'hadoop fs -cp' if there is
+    no HDFS connection.
     """
-    command = ["hadoop", "fs", "-cp", src_path, dst_path]
-    return _perform(command)
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-cp", src_path, dst_path]
+        return _perform(command)
+    try:
+        _session.fs.copy(
+            src_path, _session.fs, _session.destination(src_path, dst_path)
+        )
+        return True
+    except IOError:
+        return False
 
 
 def rd_move_file(src_path: str, dst_path: str):
     """
-    Move a file from one location to another. Uses 'hadoop fs -mv'.
+    Move a file from one location to another. Uses 'hadoop fs -mv' if there is
+    no HDFS connection.
     """
-    command = ["hadoop", "fs", "-mv", src_path, dst_path]
-    return _perform(command)
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-mv", src_path, dst_path]
+        return _perform(command)
+    try:
+        _session.fs.rename(src_path, _session.destination(src_path, dst_path))
+        return True
+    except IOError:
+        return False
+
+
+def _list_paths(path: str, order=None) -> List[str]:
+    """List the paths in a directory, sorted by name or modification time as
+    by 'hadoop fs -ls'."""
+    if _session.fs is None:
+        command = ["hadoop", "fs", "-ls", path]
+        if order:
+            ord_dict = {"newest": "-t", "oldest": "-t -r"}
+            command = ["hadoop", "fs", "-ls", ord_dict[order], path]
+        files_as_str = _perform(command, str_output=True)
+
+        # Breaking up the returned string, and stripping down to just paths
+        return [line.split()[-1] for line in files_as_str.strip().split("\n")[1:]]
+
+    infos = sorted(_session.list_directory(path), key=lambda info: info["name"])
+    if order:
+        infos.sort(key=lambda info: info["last_mod"], reverse=order == "newest")
+    return [info["name"] for info in infos]
 
 
 def rd_list_files(path: str, ext: str = None, order=None):
     """
-    List files in a directory. Uses 'hadoop fs -ls'.
+    List files in a directory. Uses 'hadoop fs -ls' if there is no HDFS
+    connection.
     """
-    # Forming the command line command and executing
-    command = ["hadoop", "fs", "-ls", path]
-    if order:
-        ord_dict = {"newest": "-t", "oldest": "-t -r"}
-        command = ["hadoop", "fs", "-ls", ord_dict[order], path]
-    files_as_str = _perform(command, str_output=True)
-
-    # Breaking up the returned string, and stripping down to just paths of files
-    file_paths = [line.split()[-1] for line in files_as_str.strip().split("\n")[1:]]
+    file_paths = _list_paths(path, order)
 
     # Filtering the files to just those with the required extension
     if ext:
@@ -351,18 +516,23 @@ def rd_list_files(path: str, ext: str = None, order=None):
 
 
 def rd_search_file(dir_path, ending):
-    """Find a file in a directory with a specific ending using grep and hadoop fs -ls.
+    """Find a file in a directory with a specific ending using grep and hadoop fs -ls,
+    or the HDFS connection if there is one.
 
     Args:
         dir_path (_type_): _description_
         ending (_type_): _description_
     """
-    target_file = _perform(
-        f"hadoop fs -ls {dir_path} | grep {ending}",
-        shell=True,
-        str_output=True,
-        ignore_error=True,
-    )
+    if _session.fs is None:
+        target_file = _perform(
+            f"hadoop fs -ls {dir_path} | grep {ending}",
+            shell=True,
+            str_output=True,
+            ignore_error=True,
+        )
+    else:
+        matches = [path for path in _list_paths(dir_path) if ending in path]
+        target_file = matches[-1] if matches else ""
 
     # Handle case where file does not exist
     if not target_file:
@@ -0,0 +1,114 @@
+"""A long-lived connection to HDFS, shared by the functions in hdfs_mods.
+
+Each `hadoop fs` command starts a new JVM, which takes seconds, so running one
+command per file operation makes the export step slow. The HdfsSession connects
+to HDFS once, through pydoop, and the file operations in hdfs_mods are run as
+calls on that connection.
+
+If pydoop is not available, or the connection fails, the session is marked as
+unavailable and hdfs_mods falls back to the `hadoop fs` commands.
+
+Only the connection methods get_path_info, list_directory, delete, copy, rename
+and close are used, so the session can be tested with a stand-in filesystem.
+"""
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+HdfsSessionLogger = logging.getLogger(__name__)
+
+
+class HdfsSession:
+    """Lazily opened connection to HDFS, reused for every file operation.
+
+    Args:
+        connect_func (Callable, optional): Function returning a pydoop hdfs
+            connection. If None, the session is unavailable.
+    """
+
+    def __init__(self, connect_func: Optional[Callable]):
+        self.connect_func = connect_func
+        self.available = connect_func is not None
+        self._fs = None
+
+    @property
+    def fs(self):
+        """The connection to HDFS, or None if the session is unavailable."""
+        if self._fs is None and self.available:
+            try:
+                self._fs = self.connect_func()
+            except Exception as e:
+                HdfsSessionLogger.warning(
+                    f"Could not connect to HDFS, using hadoop fs commands: {e}"
+                )
+                self.available = False
+        return self._fs
+
+    def path_info(self, path: str) -> Optional[dict]:
+        """Get the info of a path, with its "kind", "size" and "last_mod".
+
+        Args:
+            path (str): The path on HDFS.
+
+        Returns:
+            dict: The path info, or None if the path does not exist.
+        """
+        try:
+            return self.fs.get_path_info(path)
+        except IOError:
+            return None
+
+    def path_info_many(self, paths: List[str]) -> Dict[str, Optional[dict]]:
+        """Get the info of many paths over the one connection.
+
+        Args:
+            paths (List[str]): The paths on HDFS.
+
+        Returns:
+            Dict[str, Optional[dict]]: The info of each path, or None for the
+                paths which do not exist.
+        """
+        return {path: self.path_info(path) for path in paths}
+
+    def list_directory(self, path: str) -> List[dict]:
+        """List the info of each path in a directory, with "name" as the path.
+
+        The names returned by pydoop include the scheme and host of the namenode,
+        which are removed to match the paths listed by `hadoop fs -ls`.
+        """
+        infos = self.fs.list_directory(path)
+        return [{**info, "name": urlparse(info["name"]).path} for info in infos]
+
+    def disk_usage(self, path: str) -> int:
+        """Get the total size in bytes of a file, or of every file in a directory.
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+        """
+        info = self.path_info(path)
+        if info is None:
+            raise FileNotFoundError(f"{path} does not exist on HDFS")
+        if info["kind"] != "directory":
+            return info["size"]
+        total = 0
+        for child in self.list_directory(path):
+            if child["kind"] == "directory":
+                total += self.disk_usage(child["name"])
+            else:
+                total += child["size"]
+        return total
+
+    def destination(self, src_path: str, dst_path: str) -> str:
+        """Get the path a file is copied or moved to, which is inside dst_path
+        if it is a directory, as with `hadoop fs -cp` and `hadoop fs -mv`."""
+        info = self.path_info(dst_path)
+        if info is not None and info["kind"] == "directory":
+            return os.path.join(dst_path, os.path.basename(src_path))
+        return dst_path
+
+    def close(self):
+        """Close the connection, if open. The next operation reconnects."""
+        if self._fs is not None:
+            self._fs.close()
+            self._fs = None
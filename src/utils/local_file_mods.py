@@ -11,18 +11,31 @@ import os
 import pandas as pd
 import logging
 import pathlib
-import hashlib
 import shutil
-from typing import Union
+from typing import Dict, Iterator, List, Union
 
 import yaml
 
+from src.utils.file_info import md5_stream, stream_file_info
+from src.utils.table_formats import write_table
 from src.utils.wrappers import time_logger_wrap
 
 # Set up logger
 LocalModLogger = logging.getLogger(__name__)
 
 
+def _read_csv_chunks(filepath: str, **kwargs) -> Iterator[pd.DataFrame]:
+    """Reads a csv file from a local drive in chunks, keeping the file open
+    until every chunk has been read."""
+    with open(filepath, "r", encoding="utf-8") as file:
+        try:
+            yield from pd.read_csv(file, **kwargs)
+        except Exception:
+            LocalModLogger.error(f"Could not read specified file: {filepath}")
+            LocalModLogger.info("The following arguments failed: " + str(kwargs))
+            raise ValueError
+
+
 def rd_read_csv(filepath: str, **kwargs) -> pd.DataFrame:
     """Reads a csv file from a local Windows drive or a network drive into a
     Pandas Dataframe using Python open() function.
@@ -31,17 +44,24 @@ def rd_read_csv(filepath: str, **kwargs) -> pd.DataFrame:
 
     Args:
         filepath (str): Filepath
-        kwargs: Optional dictionary of Pandas read_csv arguments
+        kwargs: Optional dictionary of Pandas read_csv arguments, for example
+            engine="pyarrow", chunksize to read the file in chunks, or the usecols
+            and dtype from schema_read_csv_kwargs.
     Returns:
-        pd.DataFrame: Dataframe created from csv
+        pd.DataFrame: Dataframe created from csv, or an iterator of Dataframes
+            if chunksize is given
     """
+    # If "thousands" argument is not specified, set it to ",". The pyarrow engine
+    # does not support the "thousands" argument.
+    if "thousands" not in kwargs and kwargs.get("engine") != "pyarrow":
+        kwargs["thousands"] = ","
+
+    if "chunksize" in kwargs:
+        return _read_csv_chunks(filepath, **kwargs)
+
     # Open the file in read mode
     with open(filepath, "r", encoding="utf-8") as file:
 
-        # If "thousands" argument is not specified, set it to ","
-        if "thousands" not in kwargs:
-            kwargs["thousands"] = ","
-
         # Read the scv file using the path and keyword arguments
         try:
             df = pd.read_csv(file, **kwargs)
@@ -84,6 +104,21 @@ def rd_load_json(filepath: str) -> dict:
     return data
 
 
+def rd_open_file(filepath: str):
+    """Open a file on a local network drive for reading in binary mode.
+
+    The returned file object can be used as a context manager, and read in chunks
+    so that large files do not have to be loaded into memory at once.
+
+    Args:
+        filepath (string): The filepath
+
+    Returns:
+        A binary file object.
+    """
+    return open(filepath, "rb")
+
+
 def rd_file_exists(filepath: str, raise_error=False) -> bool:
     """Function to check if a file exists on a local network drive
 
@@ -189,6 +224,57 @@ def rd_read_feather(filepath):
     return df
 
 
+def _write_parquet(filepath: str, data: pd.DataFrame):
+    """Writes a Pandas Dataframe to a parquet file on a local drive"""
+    data.to_parquet(filepath, index=False)
+
+
+def rd_write_table(
+    filepath: str, data: pd.DataFrame, file_formats: List[str] = None
+) -> List[str]:
+    """Writes a Pandas Dataframe to csv, parquet and/or feather on a local drive
+
+    See table_formats.write_table, which falls back to csv where the data cannot
+    be written in a columnar format.
+
+    Args:
+        filepath (str): Filepath
+        data (pd.DataFrame): Data to be stored
+        file_formats (List[str], optional): Any of "csv", "parquet" and
+            "feather". Defaults to ["csv"].
+
+    Returns:
+        List[str]: The paths of the files written.
+    """
+    return write_table(
+        filepath,
+        data,
+        file_formats,
+        write_csv=rd_write_csv,
+        write_feather=rd_write_feather,
+        write_parquet=_write_parquet,
+        delete_file=rd_delete_file,
+    )
+
+
+def rd_read_table(filepath: str, **kwargs) -> pd.DataFrame:
+    """Reads a csv, parquet or feather file from a local drive into a Dataframe
+
+    The format is taken from the extension of the filepath.
+
+    Args:
+        filepath (str): Filepath
+        kwargs: Optional keyword arguments for the Pandas read function
+    Returns:
+        pd.DataFrame: Dataframe created from the file
+    """
+    if filepath.endswith(".parquet"):
+        return pd.read_parquet(filepath, **kwargs)
+    if filepath.endswith(".feather"):
+        return pd.read_feather(filepath, **kwargs)
+    return rd_read_csv(filepath, **kwargs)
+
+
 def rd_delete_file(path: str):
     """
     Delete a file on the local file system.
@@ -213,7 +299,20 @@ def rd_md5sum(path: str):
     The md5sum of the file.
     """
     with open(path, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()
+        return md5_stream(f)
+
+
+def rd_file_info(path: str) -> dict:
+    """
+    Get the size, md5sum and header of a file on the local file system, reading
+    the file once.
+
+    Returns
+    -------
+    A dict with the "size" in bytes, the "md5sum" and the "header" of the file.
+    """
+    with open(path, "rb") as f:
+        return stream_file_info(f)
 
 
 def rd_stat_size(path: str):
@@ -252,6 +351,17 @@ def rd_isfile(path: str) -> bool:
     return os.path.isfile(path)
 
 
+def rd_isfile_many(paths: List[str]) -> Dict[str, bool]:
+    """
+    Test if each of many files exists on the local file system.
+
+    Returns
+    -------
+    A dict of True if the file exists, else False, keyed on each path.
+    """
+    return {path: rd_isfile(path) for path in paths}
+
+
 def rd_read_header(path: str):
     """
     Reads the first line of a file on the local file system.
@@ -0,0 +1,115 @@
+"""Columnar cache for the mapper csv files read by the pipeline.
+
+Mappers such as the ONS postcode masterlist are large csv files which rarely
+change between runs, but are parsed from text every time the pipeline runs. The
+MapperCache converts each mapper to a feather file the first time it is read,
+and serves the feather copy on later runs for as long as the source csv is
+unchanged.
+
+The cached copy is keyed on the size and md5sum of the source csv, so editing or
+replacing a mapper produces a new cache file and the stale copy is never read.
+"""
+import logging
+import os
+from typing import Callable
+
+import pandas as pd
+
+MapperCacheLogger = logging.getLogger(__name__)
+
+
+class MapperCache:
+    """Serves mapper csv files from a feather copy when the csv is unchanged.
+
+    Args:
+        config (dict): The pipeline configuration.
+        file_exists_func (Callable): Function to check if a file exists.
+        mkdir_func (Callable): Function to create a directory.
+        read_csv_func (Callable): Function to read a csv file.
+        read_feather_func (Callable): Function to read a feather file.
+        write_feather_func (Callable): Function to write a feather file.
+        stat_size_func (Callable): Function to get the size of a file in bytes.
+        md5sum_func (Callable): Function to get the md5sum of a file.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        file_exists_func: Callable,
+        mkdir_func: Callable,
+        read_csv_func: Callable,
+        read_feather_func: Callable,
+        write_feather_func: Callable,
+        stat_size_func: Callable,
+        md5sum_func: Callable,
+    ):
+        # config based attrs
+        self.enabled = config["global"]["cache_mappers"]
+        self.cache_path = config["mapping_paths"]["mapper_cache_path"]
+        # attrs containing callables
+        self.file_exists_func = file_exists_func
+        self.mkdir_func = mkdir_func
+        self.read_csv_func = read_csv_func
+        self.read_feather_func = read_feather_func
+        self.write_feather_func = write_feather_func
+        self.stat_size_func = stat_size_func
+        self.md5sum_func = md5sum_func
+        # cache statistics
+        self.hits = 0
+        self.misses = 0
+
+    def _create_folder(self):
+        """Create the folder for the cached mappers if it doesn't exist."""
+        if not self.file_exists_func(self.cache_path):
+            self.mkdir_func(self.cache_path)
+
+    def cache_file_path(self, filepath: str) -> str:
+        """Return the path of the feather copy of the current version of a csv.
+
+        Args:
+            filepath (str): The path to the source csv file.
+
+        Returns:
+            str: The path to the feather file for this size and md5sum of the csv.
+        """
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        size = self.stat_size_func(filepath)
+        md5sum = self.md5sum_func(filepath)
+        return f"{self.cache_path}/{stem}_{size}_{md5sum}.feather"
+
+    def read_csv(self, filepath: str, **kwargs) -> pd.DataFrame:
+        """Read a mapper csv, using the cached feather copy where possible.
+
+        Reads that pass keyword arguments to read_csv bypass the cache, as the
+        feather copy only holds the result of reading the csv with the defaults.
+
+        Args:
+            filepath (str): The path to the mapper csv file.
+
+        Returns:
+            pd.DataFrame: The mapper read from the feather copy or the csv.
+        """
+        if not self.enabled or kwargs:
+            return self.read_csv_func(filepath, **kwargs)
+
+        cache_file = self.cache_file_path(filepath)
+        if self.file_exists_func(cache_file):
+            try:
+                df = self.read_feather_func(cache_file)
+                self.hits += 1
+                MapperCacheLogger.info(f"Mapper cache hit: read {cache_file}")
+                return df
+            except Exception as e:
+                # An unreadable copy is treated as a miss and overwritten below
+                MapperCacheLogger.warning(f"Cached mapper could not be read: {e}")
+
+        self.misses += 1
+        MapperCacheLogger.info(f"Mapper cache miss: reading {filepath}")
+        df = self.read_csv_func(filepath)
+        try:
+            self._create_folder()
+            self.write_feather_func(cache_file, df)
+            MapperCacheLogger.info(f"Mapper cached to {cache_file}")
+        except Exception as e:
+            MapperCacheLogger.warning(f"Mapper could not be cached: {e}")
+        return df
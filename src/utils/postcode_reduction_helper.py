@@ -13,6 +13,7 @@ import pandas as pd
 from typing import Callable
 from datetime import datetime
 
+from src.staging.validation import schema_read_csv_kwargs
 from src.utils.config import config_setup
 
 
@@ -64,12 +65,12 @@ def input_large_csv(
     # check the input paths are valid
     file_exists_func(in_file)
 
-    # The required columns
-    key_cols = ["pcd2", "itl"]
+    # The required columns and their data types are read from the schema
+    schema_path = "./config/postcode_masterlist_schema.toml"
 
     # read in the postcode lookup file
     print(f"Reading the postcode  lookup file {in_file}...")
-    df = read_csv_func(in_file, usecols=key_cols)
+    df = read_csv_func(in_file, **schema_read_csv_kwargs(schema_path))
 
     time_taken = (datetime.now() - start_time).total_seconds()
     print(f"Time taken to read in postcode lookup file: {time_taken} seconds")
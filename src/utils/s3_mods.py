@@ -9,22 +9,26 @@ Contains the following functions:
     rd_read_csv: Reads a CSV file from s3 to Pandas dataframe.
     rd_write_csv: Writes a Pandas Dataframe to csv in s3 bucket.
     rd_load_json: Loads a JSON file from s3 bucket to a Python dictionary.
+    rd_open_file: Opens a file in s3 bucket as a stream for reading in chunks.
     rd_file_exists: Checks if file exists in s3 using rdsa_utils.
     rd_mkdir(path: str): Creates a directory in s3 using rdsa_utils.
-
-To do:
-    Read  feather - possibly, not needed
-    Write to feather - possibly, not needed
+    rd_write_feather: Writes a Pandas Dataframe to a feather file in s3 bucket.
+    rd_read_feather: Reads a feather file from s3 bucket to Pandas dataframe.
+    rd_write_table: Writes a Pandas Dataframe to csv, parquet and/or feather.
+    rd_read_table: Reads a csv, parquet or feather file to Pandas dataframe.
+    rd_file_info: Gets the size, md5sum and header of a file in s3.
+    rd_isfile_many: Tests if each of many paths is a file in s3.
 """
 
 # Standard libraries
 import json
 import logging
+from typing import Dict, Iterator, List
 
 
 # Third party libraries
 import pandas as pd
-from io import StringIO, TextIOWrapper, BytesIO
+from io import TextIOWrapper, BytesIO
 
 
 # Local libraries
@@ -38,13 +42,33 @@ from rdsa_utils.cdp.helpers.s3_utils import (
     validate_bucket_name,
     validate_s3_file_path,
 )
+from src.utils.file_info import md5_stream, stream_file_info
 from src.utils.singleton_boto import SingletonBoto
+from src.utils.s3_multipart import (
+    MIN_PART_SIZE,
+    MultipartUploader,
+    write_csv_chunks,
+)
+from src.utils.table_formats import write_table
 # from src.utils.singleton_config import SingletonConfig
 
 # set up logging, boto3 client and s3 bucket
 s3_logger = logging.getLogger(__name__)
 s3_client = SingletonBoto.get_client()
 s3_bucket = SingletonBoto.get_bucket()
+s3_part_size, s3_max_workers = SingletonBoto.get_multipart_settings()
+s3_part_size = max(s3_part_size, MIN_PART_SIZE)
+
+
+def _read_csv_chunks(filepath: str, **kwargs) -> Iterator[pd.DataFrame]:
+    """Read a csv from s3 bucket in chunks, keeping the object body open until
+    every chunk has been read."""
+    with s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"] as file:
+        try:
+            yield from pd.read_csv(file, **kwargs)
+        except Exception as e:
+            s3_logger.error(f"Could not read specified file {filepath}. Error: {e}")
+            raise e
 
 
 # Read a CSV file into a Pandas dataframe
@@ -57,16 +81,22 @@ def rd_read_csv(filepath: str, **kwargs) -> pd.DataFrame:
 
     Args:
         filepath (str): Filepath (Specified in config)
-        kwargs: Optional dictionary of Pandas read_csv arguments
+        kwargs: Optional dictionary of Pandas read_csv arguments, for example
+            engine="pyarrow", chunksize to read the file in chunks, or the usecols
+            and dtype from schema_read_csv_kwargs.
     Returns:
-        pd.DataFrame: Dataframe created from csv
+        pd.DataFrame: Dataframe created from csv, or an iterator of Dataframes
+            if chunksize is given
     """
+    # If "thousands" argument is not specified, set it to ",". The pyarrow engine
+    # does not support the "thousands" argument.
+    if "thousands" not in kwargs and kwargs.get("engine") != "pyarrow":
+        kwargs["thousands"] = ","
 
-    with s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"] as file:
-        # If "thousands" argument is not specified, set it to ","
-        if "thousands" not in kwargs:
-            kwargs["thousands"] = ","
+    if "chunksize" in kwargs:
+        return _read_csv_chunks(filepath, **kwargs)
 
+    with s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"] as file:
         # Read the csv file using the path and keyword arguments
         try:
             df = pd.read_csv(file, **kwargs)
@@ -80,6 +110,9 @@ def rd_read_csv(filepath: str, **kwargs) -> pd.DataFrame:
 def rd_write_csv(filepath: str, data: pd.DataFrame) -> None:
     """Write a Pandas Dataframe to csv in an s3 bucket.
 
+    The dataframe is encoded a chunk of rows at a time and streamed to the bucket
+    with a multipart upload, so the whole csv is never held in memory.
+
     Args:
         filepath (str): The filepath to save the dataframe to.
         data (pd.DataFrame): THe dataframe to write to the passed path.
@@ -87,21 +120,12 @@ def rd_write_csv(filepath: str, data: pd.DataFrame) -> None:
     Returns:
         None
     """
-    # Create an Input-Output buffer
-    csv_buffer = StringIO()
-
-    # Write the dataframe to the buffer in the CSV format
-    data.to_csv(
-        csv_buffer, header=True, date_format="%Y-%m-%d %H:%M:%S.%f+00", index=False
-    )
-
-    # "Rewind" the stream to the start of the buffer
-    csv_buffer.seek(0)
-
-    # Write the buffer into the s3 bucket
-    _ = s3_client.put_object(
-        Bucket=s3_bucket, Body=csv_buffer.getvalue(), Key=filepath
-    )
+    with MultipartUploader(
+        s3_client, s3_bucket, filepath, s3_part_size, s3_max_workers
+    ) as uploader:
+        write_csv_chunks(
+            uploader, data, date_format="%Y-%m-%d %H:%M:%S.%f+00", index=False
+        )
     return None
 
 
@@ -122,6 +146,21 @@ def rd_load_json(filepath: str) -> dict:
     return datadict
 
 
+def rd_open_file(filepath: str):
+    """Open a file in an s3 bucket as a stream for reading in binary mode.
+
+    The returned streaming body can be used as a context manager, and read in
+    chunks so that large files do not have to be downloaded into memory at once.
+
+    Args:
+        filepath (string): The filepath in Hue s3 bucket.
+
+    Returns:
+        botocore.response.StreamingBody: The body of the s3 object.
+    """
+    return s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"]
+
+
 def rd_file_exists(filepath: str, raise_error=False) -> bool:
     """Function to check file exists in s3.
 
@@ -166,14 +205,92 @@ def rd_mkdir(path: str) -> None:
     return None
 
 
-def rd_write_feather(filepath, df):
-    """Placeholder Function to write dataframe as feather file in HDFS"""
-    return None
+def rd_write_feather(filepath: str, df: pd.DataFrame) -> bool:
+    """Writes a Pandas Dataframe to a feather file in s3 bucket.
 
+    Args:
+        filepath (str): The filepath in s3 bucket.
+        df (pd.DataFrame): The data to write.
 
-def rd_read_feather(filepath):
-    """Placeholder Function to read feather file from HDFS"""
-    return None
+    Returns:
+        bool: True once the file has been written.
+    """
+    with BytesIO() as feather_buffer:
+        df.to_feather(feather_buffer)
+        s3_client.put_object(
+            Bucket=s3_bucket, Key=filepath, Body=feather_buffer.getvalue()
+        )
+    s3_logger.info(f"Dataframe written to {filepath} as feather file")
+    return True
+
+
+def rd_read_feather(filepath: str) -> pd.DataFrame:
+    """Reads a feather file from s3 bucket into a Pandas DataFrame.
+
+    Args:
+        filepath (str): The filepath in s3 bucket.
+
+    Returns:
+        pd.DataFrame: Dataframe created from the feather file.
+    """
+    file = s3_client.get_object(Bucket=s3_bucket, Key=filepath)
+    df = pd.read_feather(BytesIO(file["Body"].read()))
+    s3_logger.info(f"Dataframe read from {filepath} as feather file")
+    return df
+
+
+def _write_parquet(filepath: str, data: pd.DataFrame):
+    """Write a Pandas Dataframe to a parquet file in s3 bucket."""
+    with BytesIO() as buffer:
+        data.to_parquet(buffer, index=False)
+        s3_client.put_object(Bucket=s3_bucket, Key=filepath, Body=buffer.getvalue())
+
+
+def rd_write_table(
+    filepath: str, data: pd.DataFrame, file_formats: List[str] = None
+) -> List[str]:
+    """Write a Pandas Dataframe to csv, parquet and/or feather in s3 bucket.
+
+    See table_formats.write_table, which falls back to csv where the data cannot
+    be written in a columnar format.
+
+    Args:
+        filepath (str): The filepath in s3 bucket.
+        data (pd.DataFrame): Data to be stored
+        file_formats (List[str], optional): Any of "csv", "parquet" and
+            "feather". Defaults to ["csv"].
+
+    Returns:
+        List[str]: The paths of the files written.
+    """
+    return write_table(
+        filepath,
+        data,
+        file_formats,
+        write_csv=rd_write_csv,
+        write_feather=rd_write_feather,
+        write_parquet=_write_parquet,
+    )
+
+
+def rd_read_table(filepath: str, **kwargs) -> pd.DataFrame:
+    """Read a csv, parquet or feather file from s3 bucket into a Dataframe.
+
+    The format is taken from the extension of the filepath.
+
+    Args:
+        filepath (str): The filepath in s3 bucket.
+        kwargs: Optional keyword arguments for the Pandas read function
+    Returns:
+        pd.DataFrame: Dataframe created from the file
+    """
+    if not filepath.endswith((".parquet", ".feather")):
+        return rd_read_csv(filepath, **kwargs)
+    file = s3_client.get_object(Bucket=s3_bucket, Key=filepath)
+    with BytesIO(file["Body"].read()) as buffer:
+        if filepath.endswith(".parquet"):
+            return pd.read_parquet(buffer, **kwargs)
+        return pd.read_feather(buffer, **kwargs)
 
 
 def rd_file_size(filepath: str) -> int:
@@ -208,6 +325,10 @@ def rd_delete_file(filepath: str) -> bool:
 def rd_md5sum(filepath: str) -> str:
     """
     Get md5sum of a specific file on s3.
+
+    The ETag of a file is its md5sum, unless the file was written in parts, when
+    it contains a "-" and the file is read to calculate its md5sum instead.
+
     Args:
         filepath (string): The filepath in s3 bucket.
     Returns:
@@ -219,6 +340,9 @@ def rd_md5sum(filepath: str) -> str:
             Bucket=s3_bucket,
             Key=filepath
         )['ETag'][1:-1]
+        if "-" in md5result:
+            body = s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"]
+            md5result = md5_stream(body)
     except s3_client.exceptions.ClientError as e:
         s3_logger.error(f"Failed to compute the md5 checksum: {str(e)}")
         md5result = None
@@ -275,6 +399,19 @@ def rd_isfile(filepath: str) -> bool:
     return response
 
 
+def rd_isfile_many(filepaths: List[str]) -> Dict[str, bool]:
+    """
+    Test if each of many paths is a file in s3 bucket.
+
+    Args:
+        filepaths (List[str]): The filepaths in s3 bucket.
+    Returns:
+        Dict[str, bool]: True if the path is a file, false otherwise, keyed on
+            each path.
+    """
+    return {filepath: rd_isfile(filepath) for filepath in filepaths}
+
+
 def rd_stat_size(path: str) -> int:
     """
     Gets the file size of a file or directory in bytes.
@@ -308,21 +445,40 @@ def rd_read_header(path: str) -> str:
     return response
 
 
-def rd_write_string_to_file(content: bytes, filepath: str):
-    """
-    Writes a string into the specified file path
+def rd_file_info(filepath: str) -> dict:
     """
+    Gets the size, md5sum and header of a file on s3.
 
-    # Put context to a new Input-Output buffer
-    str_buffer = StringIO(content.decode("utf-8"))
+    The size and md5sum come from a single head_object call, so only the first
+    line of the file is read. If the file was written in parts, its ETag contains
+    a "-" and is not its md5sum, so the whole file is read once instead.
 
-    # "Rewind" the stream to the start of the buffer
-    str_buffer.seek(0)
+    Args:
+        filepath (string): The filepath in s3 bucket.
 
-    # Write the buffer into the s3 bucket
-    _ = s3_client.put_object(
-        Bucket=s3_bucket, Body=str_buffer.getvalue(), Key=filepath
-    )
+    Returns:
+        dict: The "size" in bytes, the "md5sum" and the "header" of the file.
+    """
+    response = s3_client.head_object(Bucket=s3_bucket, Key=filepath)
+    if "-" in response["ETag"]:
+        body = s3_client.get_object(Bucket=s3_bucket, Key=filepath)["Body"]
+        return stream_file_info(body)
+    return {
+        "size": response["ContentLength"],
+        "md5sum": response["ETag"][1:-1],
+        "header": rd_read_header(filepath),
+    }
+
+
+def rd_write_string_to_file(content: bytes, filepath: str):
+    """
+    Writes a string into the specified file path, streaming it to the bucket
+    in parts.
+    """
+    with MultipartUploader(
+        s3_client, s3_bucket, filepath, s3_part_size, s3_max_workers
+    ) as uploader:
+        uploader.write(content)
     return None
 
 
@@ -0,0 +1,181 @@
+"""Streaming multipart uploads to an s3 bucket.
+
+The MultipartUploader is a writable file-like object. Bytes written to it are
+collected into parts of a fixed size, and each full part is uploaded on a thread
+pool while the caller carries on writing. At most max_workers parts are held in
+memory and uploading at once, so the memory used does not grow with the size of
+the file.
+
+Files smaller than one part are uploaded with a single put_object call.
+
+Only the client methods put_object, create_multipart_upload, upload_part,
+complete_multipart_upload and abort_multipart_upload are used, so the uploader
+can be tested with a stand-in client.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+import pandas as pd
+
+MultipartLogger = logging.getLogger(__name__)
+
+# s3 rejects multipart uploads with parts, other than the last, below 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+# The number of rows of a dataframe encoded as csv at a time
+CSV_CHUNK_ROWS = 10000
+
+
+class MultipartUploader:
+    """Writable file-like object which uploads to s3 in parts.
+
+    Args:
+        client: The boto3 s3 client.
+        bucket (str): The s3 bucket to upload to.
+        key (str): The filepath in the s3 bucket.
+        part_size (int): The size of each uploaded part in bytes. Must be at least
+            5 MiB when uploading to s3.
+        max_workers (int): The number of parts uploaded at the same time.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        part_size: int = 16 * 1024 * 1024,
+        max_workers: int = 4,
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+        self.pending = deque()
+        self.executor = None
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        """Upload a single part, returning its number and ETag."""
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _collect_oldest(self):
+        """Wait for the oldest part being uploaded to finish."""
+        self.parts.append(self.pending.popleft().result())
+
+    def _submit_part(self, body: bytes):
+        """Start uploading a part, once there is a free worker."""
+        if self.upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key
+            )
+            self.upload_id = response["UploadId"]
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        if len(self.pending) >= self.max_workers:
+            self._collect_oldest()
+        part_number = len(self.parts) + len(self.pending) + 1
+        self.pending.append(self.executor.submit(self._upload_part, part_number, body))
+
+    def write(self, data: Union[bytes, str]) -> int:
+        """Add data to the upload, uploading each part as it fills.
+
+        Args:
+            data (Union[bytes, str]): The data to write. Strings are encoded as
+                utf-8.
+
+        Returns:
+            int: The number of bytes or characters written.
+        """
+        if self.closed:
+            raise ValueError(f"Upload to {self.key} is already closed.")
+        content = memoryview(data.encode("utf-8") if isinstance(data, str) else data)
+        # add the data a part at a time, so the buffer stays below two parts
+        for start in range(0, len(content), self.part_size):
+            self.buffer += content[start : start + self.part_size]
+            if len(self.buffer) >= self.part_size:
+                self._submit_part(bytes(self.buffer[: self.part_size]))
+                del self.buffer[: self.part_size]
+        return len(data)
+
+    def close(self):
+        """Upload the remaining data and complete the upload."""
+        if self.closed:
+            return
+        if self.upload_id is None:
+            # The data fits in one part, so there is no need for a multipart upload
+            self.client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer)
+            )
+        else:
+            try:
+                if self.buffer:
+                    self._submit_part(bytes(self.buffer))
+                while self.pending:
+                    self._collect_oldest()
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self.upload_id,
+                    MultipartUpload={"Parts": self.parts},
+                )
+            except Exception:
+                self.abort()
+                raise
+            self.executor.shutdown()
+        self.buffer = bytearray()
+        self.closed = True
+
+    def abort(self):
+        """Cancel the upload, removing any parts already uploaded."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        if self.upload_id is not None:
+            MultipartLogger.warning(f"Aborting multipart upload to {self.key}")
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            self.upload_id = None
+        self.buffer = bytearray()
+        self.closed = True
+
+
+def write_csv_chunks(
+    uploader: MultipartUploader,
+    data: pd.DataFrame,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    **kwargs,
+):
+    """Encode a dataframe as csv a chunk of rows at a time, writing each chunk.
+
+    Args:
+        uploader (MultipartUploader): The upload to write the csv to.
+        data (pd.DataFrame): The dataframe to write.
+        chunk_rows (int): The number of rows encoded at a time.
+        kwargs: Keyword arguments passed to Pandas to_csv.
+    """
+    # an empty dataframe still writes its header
+    for start in range(0, max(len(data), 1), chunk_rows):
+        chunk = data.iloc[start : start + chunk_rows]
+        uploader.write(chunk.to_csv(header=start == 0, **kwargs))
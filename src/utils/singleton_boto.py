@@ -8,6 +8,7 @@ import raz_client
 class SingletonBoto:
     _instance = None
     _bucket = None
+    _multipart_settings = (16 * 1024 * 1024, 4)
 
     def __init__(self):
         raise RuntimeError("This is a Singleton, invoke get_client() instead.")
@@ -21,6 +22,10 @@ class SingletonBoto:
                 ssl_file=config["s3"]["ssl_file"]
             )
             cls._bucket = config["s3"]["s3_bucket"]
+            cls._multipart_settings = (
+                config["s3"]["multipart_part_size_mb"] * 1024 * 1024,
+                config["s3"]["multipart_max_workers"],
+            )
             cls._instance = client
         return cls._instance
 
@@ -29,3 +34,8 @@ class SingletonBoto:
         if cls._bucket is None:
             raise RuntimeError("Bucket is not set. Call get_client() first.")
         return cls._bucket
+
+    @classmethod
+    def get_multipart_settings(cls):
+        """Return the part size in bytes and number of workers for uploads."""
+        return cls._multipart_settings
@@ -0,0 +1,72 @@
+"""Writing dataframes to csv, parquet and/or feather files on any platform.
+
+The format dispatch is shared by the rd_write_table functions of the local, hdfs
+and s3 mods, which pass in their own functions for writing each format.
+"""
+import logging
+import os
+from typing import Callable, List
+
+import pandas as pd
+
+TableFormatsLogger = logging.getLogger(__name__)
+
+TABLE_FORMATS = ["csv", "parquet", "feather"]
+
+
+def write_table(
+    filepath: str,
+    data: pd.DataFrame,
+    file_formats: List[str],
+    write_csv: Callable,
+    write_feather: Callable,
+    write_parquet: Callable,
+    delete_file: Callable = None,
+) -> List[str]:
+    """Write a Pandas Dataframe to csv, parquet and/or feather files.
+
+    The extension of the filepath is replaced by the extension of each format.
+    Parquet and feather files are compressed and keep the dtypes of the columns.
+    If the data cannot be written in a columnar format, for example because a
+    column mixes strings and numbers, it is written to csv instead.
+
+    Args:
+        filepath (str): Filepath
+        data (pd.DataFrame): Data to be stored
+        file_formats (List[str], optional): Any of "csv", "parquet" and
+            "feather". Defaults to ["csv"].
+        write_csv (Callable): Function to write a dataframe to a csv file.
+        write_feather (Callable): Function to write a dataframe to a feather file.
+        write_parquet (Callable): Function to write a dataframe to a parquet file.
+        delete_file (Callable, optional): Function to delete a file, used to
+            remove a partly written columnar file before falling back to csv.
+
+    Returns:
+        List[str]: The paths of the files written.
+
+    Raises:
+        ValueError: If a file format is not one of TABLE_FORMATS.
+    """
+    file_formats = ["csv"] if file_formats is None else file_formats
+    columnar_writers = {"parquet": write_parquet, "feather": write_feather}
+    stem = os.path.splitext(filepath)[0]
+    paths = []
+    for file_format in file_formats:
+        if file_format not in TABLE_FORMATS:
+            raise ValueError(f"File format {file_format} not one of {TABLE_FORMATS}")
+        path = f"{stem}.{file_format}"
+        if file_format != "csv":
+            try:
+                # feather files can only hold a default index
+                columnar_writers[file_format](path, data.reset_index(drop=True))
+                paths.append(path)
+                continue
+            except Exception as e:
+                TableFormatsLogger.warning(f"Could not write {path}, writing csv: {e}")
+                if delete_file is not None:
+                    delete_file(path)
+                path = f"{stem}.csv"
+        if path not in paths:
+            write_csv(path, data)
+            paths.append(path)
+    return paths
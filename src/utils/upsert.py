@@ -0,0 +1,148 @@
+"""Apply keyed changes to a dataframe in one pass.
+
+The rows of the changes are matched to the rows of the dataframe on their key
+columns. Matched rows are updated in place, one column at a time, so the rows
+which are not changed are not copied. Unmatched changes can be inserted, and rows
+can be removed, in the same pass.
+"""
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_categorical_dtype, is_numeric_dtype
+
+UpsertLogger = logging.getLogger(__name__)
+
+
+def match_rows(
+    df: pd.DataFrame, changes: pd.DataFrame, keys: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the row positions in df and in changes of each pair of matching keys.
+
+    Numeric keys of different types, such as float and Int64, are compared as
+    floats, as pandas cannot merge them directly when values are missing.
+    """
+    df_keys = df[keys].reset_index(drop=True)
+    change_keys = changes[keys].reset_index(drop=True)
+    for key in keys:
+        if (
+            df_keys[key].dtype != change_keys[key].dtype
+            and is_numeric_dtype(df_keys[key])
+            and is_numeric_dtype(change_keys[key])
+        ):
+            df_keys[key] = df_keys[key].astype("float64")
+            change_keys[key] = change_keys[key].astype("float64")
+
+    positions = pd.merge(
+        df_keys.assign(_row=np.arange(len(df))),
+        change_keys.assign(_change=np.arange(len(changes))),
+        on=keys,
+        how="inner",
+    )
+    return positions["_row"].to_numpy(), positions["_change"].to_numpy()
+
+
+def _categorical_safe_values(df: pd.DataFrame, col: str, values) -> np.ndarray:
+    """Get values which can be set in a column where either side is categorical.
+
+    A Categorical can only be set into a categorical column with identical
+    categories, so the values are set as plain values instead. Any values not
+    in the categories of a categorical column are added to its categories,
+    which keeps the column categorical, rather than upcasting it to object as
+    DataFrame.update does.
+    """
+    values = np.asarray(values, dtype=object)
+    if is_categorical_dtype(df[col]):
+        present = pd.Index(values[pd.notna(values)]).unique()
+        new_categories = present.difference(df[col].cat.categories)
+        if len(new_categories):
+            df[col] = df[col].cat.add_categories(new_categories)
+    return values
+
+
+def _update_matched(
+    df: pd.DataFrame,
+    changes: pd.DataFrame,
+    rows: np.ndarray,
+    change_rows: np.ndarray,
+    update_cols: List[str],
+    skip_missing: bool,
+):
+    """Update the matched rows of df in place, one column at a time."""
+    for col in update_cols:
+        # Taking the array keeps the dtype, so nullable values do not make the
+        # column an object column
+        values = changes[col].array[change_rows]
+        col_rows = rows
+        if skip_missing:
+            present = pd.notna(values)
+            values, col_rows = values[present], rows[present]
+        if len(col_rows):
+            if isinstance(values, pd.Categorical) or is_categorical_dtype(df[col]):
+                values = _categorical_safe_values(df, col, values)
+            df.iloc[col_rows, df.columns.get_loc(col)] = values
+
+
+def keyed_upsert(
+    df: pd.DataFrame,
+    changes: pd.DataFrame,
+    keys: List[str],
+    remove: pd.Series = None,
+    insert: bool = True,
+    skip_missing: bool = False,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Update, insert and remove the rows of a dataframe, matched on their keys.
+
+    The rows of df with the same keys as a row of changes are updated in place
+    with the values in changes, for the columns in both. The rows of changes
+    which match no row of df are added at the end, and the rows of df marked in
+    remove are dropped, unless they have been updated.
+
+    Args:
+        df (pd.DataFrame): The dataframe to change. Updated rows are changed in
+            place.
+        changes (pd.DataFrame): The changes, with the key columns and the columns
+            to update.
+        keys (List[str]): The columns which identify a row.
+        remove (pd.Series, optional): Boolean mask of the rows of df to remove.
+        insert (bool): Whether changes which match no row of df are added.
+        skip_missing (bool): Whether missing values in changes are skipped, so
+            the values in df are kept, as with DataFrame.update.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, int]]: The changed dataframe, and the
+            number of rows "inserted", "updated" and "removed".
+
+    Raises:
+        ValueError: If a row of df matches more than one row of changes.
+    """
+    rows, change_rows = match_rows(df, changes, keys)
+    if len(np.unique(rows)) < len(rows):
+        raise ValueError(f"Changes contain duplicate {keys} keys.")
+
+    update_cols = [
+        col for col in changes.columns if col in df.columns and col not in keys
+    ]
+    _update_matched(df, changes, rows, change_rows, update_cols, skip_missing)
+
+    counts = {"inserted": 0, "updated": len(rows), "removed": 0}
+
+    if remove is not None:
+        remove = remove.to_numpy(dtype=bool, na_value=False).copy()
+        remove[rows] = False
+        counts["removed"] = int(remove.sum())
+        if counts["removed"]:
+            df = df[~remove]
+
+    if insert:
+        new_rows = np.setdiff1d(np.arange(len(changes)), change_rows)
+        counts["inserted"] = len(new_rows)
+        if len(new_rows):
+            df = pd.concat([df, changes.iloc[new_rows]], ignore_index=True)
+
+    UpsertLogger.debug(
+        f"Upsert inserted {counts['inserted']}, updated {counts['updated']} and "
+        f"removed {counts['removed']} rows."
+    )
+    return df, counts
@@ -395,6 +395,22 @@ class TestPrepNewRows:
         # Check the output
         pd.testing.assert_frame_equal(output_rows_to_add, expected_rows_to_add), "Output is not as expected"
 
+    def test_prep_new_rows_missing_reference(self):
+        """Test prep_new_rows raises for new references not in the snapshot."""
+        rows_to_add = pd.DataFrame({
+            'reference': ['A', 'D'],
+            'formtype': [np.nan, np.nan],
+            'cellnumber': ['123', np.nan]
+        })
+        updated_snapshot_df = pd.DataFrame({
+            'reference': ['A', 'A'],
+            'formtype': ['0006', '0001'],
+            'cellnumber': ['789', '987']
+        })
+
+        with pytest.raises(ValueError, match=r"ref \['D'\]"):
+            prep_new_rows(rows_to_add, updated_snapshot_df)
+
 
 class TestReplaceValuesInConstruction:
     """Test for replace_values_in_construction()."""
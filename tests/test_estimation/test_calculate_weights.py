@@ -448,6 +448,37 @@ class TestCalcWeightWithMissingVals:
         )
 
 
+class TestCalcCellWeights:
+    """Test for calc_cell_weights."""
+
+    def test_calc_cell_weights(self):
+        """Test n and o count the filtered records and cells without any get 1."""
+        input_df = pd.DataFrame(
+            {
+                "reference": [1, 1, 2, 3, 4, 5],
+                "instance": [0, 1, 0, 0, 0, 0],
+                "709": [10, 10, 5, np.nan, 3, 8],
+                "cellnumber": [1, 1, 1, 1, 2, np.nan],
+                "uni_count": [12, 12, 12, 12, 6, 4],
+                "outlier": [False, False, True, False, False, False],
+            }
+        )
+        estimation_filter = pd.Series([True, True, True, True, False, True])
+
+        result = calw.calc_cell_weights(input_df, estimation_filter)
+
+        expected = pd.DataFrame(
+            {
+                "cellnumber": [1.0, 2.0],
+                "N": [12, 6],
+                "n": [2, 0],
+                "o": [1, 0],
+                "a_weight": [11.0, 1.0],
+            }
+        )
+        assert_frame_equal(result, expected)
+
+
 # One tests for outlier_weights:
 # test that all appropriate rows are given an a_weight = 1.0
 
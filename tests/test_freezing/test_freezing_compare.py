@@ -6,6 +6,7 @@ import logging
 
 from src.freezing.freezing_compare import get_amendments, get_additions
 from src.freezing.freezing_compare import bring_together_split_cases
+from src.freezing.freezing_compare import get_changed_records, record_hashes
 
 # create a test logger to pass to functions
 test_logger = logging.getLogger(__name__)
@@ -72,8 +73,8 @@ class TestGetAmendments:
     def create_test_expected_outcome_df(self) -> pd.DataFrame:
         """Create a test expected_outcome df."""
         input_cols = ["reference", "period", "instance", "203", "202", "200", "601", "203_diff", "202_diff", "200_diff", "601_diff", "accept_changes"]
+        # A is unchanged, as missing values in both snapshots are not a change
         data = [
-            ["A", 202412, 2.0, 1.0, 2.0, "A", None, 0.0, 0.0, None, None, False],
             ["B", 202412, None, None, 1.0, "A", "B", None, 0.0, "A", "B", False],
             ["C", 202412, 0.0, 2.0, 2.0, "A", "B", 1.0, 0.0, None, None, False],
             ["D", 202412, 1.0, 2.0, 3.0, "E", "D", 0.0, 0.0, "E", None, False],
@@ -103,6 +104,56 @@ class TestGetAmendments:
             expected_outcome_df, result
         )
 
+    def test_get_amendments_unchanged(self):
+        """Test records with no changes above the tolerance are skipped."""
+        input_frozen_df = self.create_test_frozen_df()
+        input_updated_df = input_frozen_df.copy()
+        # changes within the tolerance or outside the compared columns
+        input_updated_df.loc[0, "203"] = 1.000001
+        input_updated_df["other"] = "changed"
+
+        result = get_amendments(input_frozen_df, input_updated_df, test_logger)
+
+        assert result.empty
+        assert "accept_changes" in result.columns
+
+
+class TestGetChangedRecords:
+    """Tests for record_hashes() and get_changed_records()."""
+
+    def create_test_df(self) -> pd.DataFrame:
+        """Create a test df with every compared column."""
+        df = TestGetAmendments().create_test_frozen_df()
+        return df.drop(columns="201").assign(**{"201": "X"})
+
+    def test_record_hashes(self):
+        """Test records hash the same whatever the data types."""
+        input_df = self.create_test_df()
+        result = record_hashes(input_df)
+        converted_result = record_hashes(input_df.convert_dtypes())
+
+        assert list(result.columns) == [
+            "reference", "period", "instance", "record_hash", "row"
+        ]
+        assert result["record_hash"].equals(converted_result["record_hash"])
+        assert result["record_hash"].nunique() == 5
+
+    def test_get_changed_records(self):
+        """Test only new and changed records are selected for comparison."""
+        input_frozen_df = self.create_test_df()
+        input_updated_df = input_frozen_df.copy()
+        input_updated_df.loc[2, "202"] = 10.0
+        input_updated_df.loc[4, "601"] = "G"
+        new_row = input_updated_df.iloc[[0]].assign(reference="F")
+        input_updated_df = pd.concat([input_updated_df, new_row])
+
+        changed_frozen, changed_updated = get_changed_records(
+            input_frozen_df, input_updated_df, test_logger
+        )
+
+        assert changed_frozen["reference"].tolist() == ["C", "E"]
+        assert changed_updated["reference"].tolist() == ["C", "E", "F"]
+
 
 class TestGetAdditions:
     """Tests for get_additions()."""
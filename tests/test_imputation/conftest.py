@@ -17,6 +17,7 @@ def imputation_config() -> dict:
             "lower_trim_perc": 15,
             "upper_trim_perc": 15,
             "sf_expansion_threshold": 3,
+            "vectorised_tmi": True,
             "lf_target_vars": ["211", "emp_researcher", "emp_technician"],
             "sum_cols": ["emp_total"]
         },
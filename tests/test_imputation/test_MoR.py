@@ -5,15 +5,23 @@ import os
 
 # Third Party Imports
 import pytest
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 # Local Imports
-from src.imputation.MoR import run_mor
+from src.imputation.MoR import (
+    run_mor,
+    calculate_links,
+    get_threshold_value,
+    _order_links_columns,
+)
+from src.imputation.tmi_imputation import trim_bounds
 from src.imputation.imputation_helpers import get_imputation_cols
 
 # pytestmark = pytest.mark.runwip
 
+
 class TestRunMoRLongForm(object):
     """Tests for run_mor."""
 
@@ -60,12 +68,30 @@ class TestRunMoRLongForm(object):
             config=imputation_config
         )
         # select only the required columns for the result and the expected output
-        wanted_cols = ["reference", "instance", "imp_class", "211_link", "211_imputed", "emp_researcher_imputed", "emp_technician_imputed", "212_imputed", "214_imputed", "216_imputed"]
+        wanted_cols = [
+            "reference",
+            "instance",
+            "imp_class",
+            "211_link",
+            "211_imputed",
+            "emp_researcher_imputed",
+            "emp_technician_imputed",
+            "212_imputed",
+            "214_imputed",
+            "216_imputed",
+        ]
 
-        result_filter = (result_df.instance != 0) & (result_df.formtype == "0001") & (result_df["200"].notnull()) & (result_df.imp_marker.isin(["CF","MoR"]))
+        result_filter = (
+            (result_df.instance != 0)
+            & (result_df.formtype == "0001")
+            & (result_df["200"].notnull())
+            & (result_df.imp_marker.isin(["CF", "MoR"]))
+        )
         result_df = result_df.loc[result_filter][wanted_cols].round(4)
         result_df["211_link"] = result_df["211_link"].fillna(1)
-        result_df = result_df.sort_values(["reference", "instance"]).reset_index(drop=True)
+        result_df = result_df.sort_values(["reference", "instance"]).reset_index(
+            drop=True
+        )
 
         # round the expected output to 4 decimal places
         # Apply rounding only to the floating-point columns in the expected output
@@ -73,9 +99,9 @@ class TestRunMoRLongForm(object):
         expected_lf_mor_output[float_cols] = expected_lf_mor_output[float_cols].round(4)
         expected_lf_mor_output = expected_lf_mor_output[wanted_cols]
 
-        assert_frame_equal(result_df, expected_lf_mor_output, check_dtype=False, check_exact=False), (
-            "run_mor() not imputing data as expected."
-        )
+        assert_frame_equal(
+            result_df, expected_lf_mor_output, check_dtype=False, check_exact=False
+        ), "run_mor() not imputing data as expected."
 
 
 class TestRunMoRShortForm(object):
@@ -113,8 +139,8 @@ class TestRunMoRShortForm(object):
         input_sf_mor_df,
         sf_mor_backdata,
         expected_sf_mor_output,
-        imputation_config
-        ):
+        imputation_config,
+    ):
         """General tests for run_mor."""
         impute_vars = get_imputation_cols(imputation_config)
         result_df, qa = run_mor(
@@ -124,11 +150,27 @@ class TestRunMoRShortForm(object):
             config=imputation_config
         )
         # select only the required columns for the result and the expected output
-        wanted_cols = ["reference", "instance", "imp_class", "211_link", "211_imputed","212_imputed", "214_imputed", "216_imputed"]
+        wanted_cols = [
+            "reference",
+            "instance",
+            "imp_class",
+            "211_link",
+            "211_imputed",
+            "212_imputed",
+            "214_imputed",
+            "216_imputed",
+        ]
 
-        result_filter = (result_df.instance != 0) & (result_df.formtype == "0006") & (result_df["200"].notnull()) & (result_df.imp_marker.isin(["CF","MoR"]))
+        result_filter = (
+            (result_df.instance != 0)
+            & (result_df.formtype == "0006")
+            & (result_df["200"].notnull())
+            & (result_df.imp_marker.isin(["CF", "MoR"]))
+        )
         result_df = result_df.loc[result_filter][wanted_cols].round(4)
-        result_df = result_df.sort_values(["reference", "instance"]).reset_index(drop=True)
+        result_df = result_df.sort_values(["reference", "instance"]).reset_index(
+            drop=True
+        )
 
         # round the expected output to 4 decimal places
         # Apply rounding only to the floating-point columns in the expected output
@@ -136,6 +178,85 @@ class TestRunMoRShortForm(object):
         expected_sf_mor_output[float_cols] = expected_sf_mor_output[float_cols].round(4)
         expected_sf_mor_output = expected_sf_mor_output[wanted_cols]
 
-        assert_frame_equal(result_df, expected_sf_mor_output, check_dtype=False, check_exact=False), (
-            "run_mor() not imputing data as expected."
+        assert_frame_equal(
+            result_df, expected_sf_mor_output, check_dtype=False, check_exact=False
+        ), "run_mor() not imputing data as expected."
+
+
+def baseline_group_calc_link(group, target_vars, config):
+    """Trim and average the growth rates of one imp_class, as the previous MoR.
+
+    `baseline_calculate_links` groups the data by imp_class and then calls this
+    function for each group using the .apply() method. If the group is not of a
+    valid size, the link is set to 1.
+    """
+    threshold_num = get_threshold_value(config)
+    for var in target_vars:
+        non_null_mask = pd.notnull(group[f"{var}_gr"])
+
+        group = group.sort_values(f"{var}_gr")
+
+        group[f"{var}_gr_trim"] = False
+        trimmed_bounds, qa = trim_bounds(
+            group.loc[non_null_mask, :], f"{var}_gr", config
         )
+        group.loc[non_null_mask, f"{var}_gr_trim"] = trimmed_bounds.loc[
+            :, f"{var}_gr_trim"
+        ].values
+
+        num_valid_vars = sum(~group[f"{var}_gr_trim"] & non_null_mask)
+        group[f"{var}_group_size"] = num_valid_vars
+
+        if num_valid_vars >= threshold_num:
+            group[f"{var}_link"] = group.loc[
+                ~group[f"{var}_gr_trim"] & non_null_mask, f"{var}_gr"
+            ].mean()
+        else:
+            group[f"{var}_link"] = 1.0
+    return group
+
+
+def baseline_calculate_links(gr_df, target_vars, config):
+    """Calculate the links class by class, as the previous calculate_links."""
+    gr_df = gr_df.groupby("imp_class")
+    gr_df = gr_df.apply(baseline_group_calc_link, target_vars, config)
+    return _order_links_columns(gr_df, target_vars)
+
+
+class TestCalculateLinks(object):
+    """Tests for calculate_links."""
+
+    @pytest.fixture(scope="function")
+    def gr_df(self) -> pd.DataFrame:
+        """A synthetic dataframe of growth rates, with some null growth rates."""
+        rng = np.random.default_rng(3)
+        n = 2000
+        df = pd.DataFrame(
+            {
+                "reference": np.arange(n),
+                "imp_class": rng.choice([f"C_{i}" for i in range(20)] + ["D_1"], n),
+            }
+        )
+        for var in ["211", "305"]:
+            df[var] = rng.random(n) * 100
+            df[f"{var}_prev"] = rng.random(n) * 100
+            df.loc[rng.random(n) < 0.1, var] = 0
+            valid_mask = (df[f"{var}_prev"] != 0) & (df[var] != 0)
+            df.loc[valid_mask, f"{var}_gr"] = (
+                df.loc[valid_mask, var] / df.loc[valid_mask, f"{var}_prev"]
+            )
+        return df
+
+    @pytest.mark.parametrize("mor_threshold", [3, 100])
+    def test_matches_baseline(
+        self, gr_df, imputation_config, mor_threshold
+    ):
+        """Test the batched links reproduce the class-by-class links QA."""
+        imputation = {**imputation_config["imputation"], "mor_threshold": mor_threshold}
+        config = {"imputation": imputation}
+        target_vars = ["211", "305"]
+
+        expected = baseline_calculate_links(gr_df, target_vars, config)
+        result = calculate_links(gr_df, target_vars, config)
+
+        assert_frame_equal(result, expected, check_exact=False)
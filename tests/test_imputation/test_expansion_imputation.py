@@ -0,0 +1,37 @@
+"""Tests for expansion_imputation.py."""
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.imputation.expansion_imputation import evaluate_imputed_ixx
+
+
+class TestEvaluateImputedIxx:
+    """Unit tests for evaluate_imputed_ixx function."""
+
+    def create_input_df(self):
+        """Create an input dataframe for the test."""
+        input_cols = ["imp_class", "status", "imp_marker", "211", "211_imputed"]
+        input_cols += ["202", "202_imputed", "203", "203_imputed"]
+
+        data = [
+            ["C_1", "Clear", "R", 100.0, 100.0, 60.0, 60.0, 40.0, 40.0],
+            ["C_1", "Clear", "R", 300.0, 300.0, 60.0, 60.0, 240.0, 240.0],
+            ["C_1", "Form sent out", "TMI", None, 50.0, None, None, None, None],
+            ["C_1", "Form sent out", "TMI", None, 50.0, None, None, None, None],
+            ["D_1", "Clear", "R", 10.0, 10.0, 5.0, 5.0, 5.0, 5.0],
+            ["D_1", "Form sent out", "TMI", None, 0.0, None, None, None, None],
+            ["D_2", "Clear", "R", 10.0, 10.0, 5.0, 5.0, 5.0, 5.0],
+        ]
+        return pd.DataFrame(data=data, columns=input_cols)
+
+    def test_evaluate_imputed_ixx(self):
+        """Breakdowns of TMI rows are the class ratio times the imputed master."""
+        input_df = self.create_input_df()
+
+        result = evaluate_imputed_ixx(input_df, "211", ["202", "203"])
+
+        expected = self.create_input_df()
+        expected.loc[[2, 3], ["202_imputed", "203_imputed"]] = [15.0, 35.0]
+        expected.loc[5, ["202_imputed", "203_imputed"]] = [0.0, 0.0]
+
+        assert_frame_equal(result, expected)
@@ -8,6 +8,7 @@ from src.imputation.impute_civ_def import (
     create_civdef_dict,
     calc_cd_proportions,
     _get_random_civdef,
+    assign_random_civdef,
 )
 
 
@@ -227,3 +228,32 @@ class TestGetRandomCivdef(object):
             print(f"rand: {rand}")
         unique = set(values)
         assert len(unique) == 1, "Multiple random values found from one seed."
+
+
+class TestAssignRandomCivdef(object):
+    """Tests for assign_random_civdef."""
+
+    @pytest.mark.parametrize(
+        "proportions",
+        [(0.4, 0.6), (0.52, 0.48), (0.1, 0.9), (1.0, 0.0), (1 / 3, 2 / 3)],
+    )
+    def test_assign_random_civdef(self, proportions):
+        """Test the assigned values match _get_random_civdef for every seed."""
+        refs = list(range(0, 3000, 7)) + [1234567891011, 9999999]
+        input_df = pandasDF({"reference": refs})
+
+        expected = [_get_random_civdef(ref, proportions) for ref in refs]
+        result_df = assign_random_civdef(input_df, proportions)
+
+        assert list(result_df["200_imputed"]) == expected
+
+    def test_assign_random_civdef_global_state(self):
+        """Test the global NumPy random state is not changed."""
+        input_df = pandasDF({"reference": [1, 2, 3]})
+
+        np.random.seed(10)
+        expected = np.random.random_sample()
+        np.random.seed(10)
+        assign_random_civdef(input_df, (0.5, 0.5))
+
+        assert np.random.random_sample() == expected
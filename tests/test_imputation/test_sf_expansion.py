@@ -4,16 +4,94 @@
 import os
 
 # Third Party Imports
+import numpy as np
 import pytest
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 # Local Imports
-from src.imputation.sf_expansion import run_sf_expansion
+from src.imputation.sf_expansion import apply_expansion, run_sf_expansion
 
-# This indicates that the tests are a work in progress and should not be run
-pytestmark = pytest.mark.runwip
 
+class TestApplyExpansion(object):
+    """Tests for apply_expansion."""
+
+    @pytest.fixture(scope="function")
+    def expansion_df(self) -> pd.DataFrame:
+        """A dummy dataframe of long form responders and short forms to expand."""
+        columns = ["formtype", "status", "imp_marker", "200", "imp_class"]
+        columns += ["211_trim", "305_trim", "211", "202", "203"]
+        data = [
+            # class C_A has two positive responders
+            ["0001", "Clear", "R", "C", "C_A", False, False, 100.0, 60.0, 40.0],
+            ["0001", "Clear", "R", "C", "C_A", False, False, 300.0, 60.0, 240.0],
+            ["0006", "Form sent out", "TMI", "C", "C_A", None, None, 50.0, None, None],
+            # class C_B has one, so falls back to the civil group
+            ["0001", "Clear", "R", "C", "C_B", False, False, 100.0, 10.0, 90.0],
+            ["0001", "Clear", "R", "C", "C_B", True, False, 900.0, 900.0, 0.0],
+            ["0006", "Clear", "R", "C", "C_B", None, None, 100.0, None, None],
+            # the master of the defence group sums to 0
+            ["0001", "Clear", "R", "D", "D_A", False, False, 0.0, 5.0, 5.0],
+            ["0006", "Form sent out", "TMI", "D", "D_A", None, None, 20.0, None, None],
+            # rows without a civil or defence value are not expanded
+            ["0006", "Form sent out", "TMI", None, "X", None, None, 10.0, None, None],
+        ]
+        df = pd.DataFrame(data=data, columns=columns)
+        for col in ["211", "202", "203"]:
+            df[f"{col}_imputed"] = df[col]
+        for col in ["res", "tec", "oth"]:
+            df[f"headcount_{col}_m_imputed"] = 0.0
+            df[f"headcount_{col}_f_imputed"] = 0.0
+        return df
+
+    def run_expansion(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Expand 211 into 202 and 203, with a threshold of one responder."""
+        breakdown_dict = {"211": ["202", "203"]}
+        return apply_expansion(df, ["211"], breakdown_dict, threshold_num=1)
+
+    def test_imp_class_ratios(self, expansion_df):
+        """The imputation class ratios are used above the threshold."""
+        result = self.run_expansion(expansion_df)
+
+        assert result.loc[2, ["202_imputed", "203_imputed"]].tolist() == [15.0, 35.0]
+        assert result.loc[2, "211_sf_exp_grouping"] == "imp_class_group"
+        assert (result.loc[:2, "211_sf_exp_grouping"] == "imp_class_group").all()
+
+    def test_civil_defence_fallback(self, expansion_df):
+        """The civil or defence ratios are used at or below the threshold."""
+        result = self.run_expansion(expansion_df)
+
+        # the civil group sums to 500 for 211, 130 for 202 and 370 for 203,
+        # without the trimmed responder
+        expected = [26.0, 74.0]
+        np.testing.assert_allclose(
+            result.loc[5, ["202_imputed", "203_imputed"]].astype(float), expected
+        )
+        fallback_rows = result.loc[3:5, "211_sf_exp_grouping"]
+        assert (fallback_rows == "civil_defence_fallback").all()
+
+    def test_zero_master_sum(self, expansion_df):
+        """The ratios are 0 where the master of the group sums to 0."""
+        result = self.run_expansion(expansion_df)
+
+        assert result.loc[7, ["202_imputed", "203_imputed"]].tolist() == [0.0, 0.0]
+        assert result.loc[7, "211_sf_exp_grouping"] == "civil_defence_fallback"
+
+    def test_missing_civil_defence(self, expansion_df):
+        """Rows without a "200" value are kept, but not expanded."""
+        result = self.run_expansion(expansion_df)
+
+        assert len(result) == len(expansion_df)
+        assert result.loc[8, ["202_imputed", "203_imputed"]].isna().all()
+
+        # the long forms are not changed
+        long_cols = ["202_imputed", "203_imputed"]
+        assert_frame_equal(
+            result.loc[[0, 1, 3], long_cols], expansion_df.loc[[0, 1, 3], long_cols]
+        )
+
+
+@pytest.mark.runwip
 class TestRunTmi(object):
     """Tests for run_sf_expansion."""
 
@@ -1178,3 +1178,11 @@ class TestNormalRound:
             lambda row: auto.normal_round(row["to_round"]), axis=1
         )
         assert_frame_equal(input_df, expected_df)
+
+    def test_normal_round_array(self):
+        """Test for normal_round_array function, which matches normal_round."""
+        values = np.array([2.4, 2.5, 2.6, 3.4, 3.5, 3.6, 0.49999999999999994, np.nan])
+        result = auto.normal_round_array(values)
+        expected = [auto.normal_round(x) for x in values[:-1]]
+        assert result[:-1].tolist() == expected
+        assert np.isnan(result[-1])
@@ -0,0 +1,136 @@
+"""Tests for the file transfers in export_files.py."""
+import logging
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from src.outputs.export_files import (
+    TransferError,
+    transfer_file_verified,
+    transfer_files_parallel,
+)
+from src.utils import hdfs_mods
+from src.utils import local_file_mods as mods
+from src.utils.hdfs_session import HdfsSession
+from tests.test_utils.test_hdfs_session import FakeHdfs
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="function")
+def outputs(tmp_path):
+    """Two output files, their manifest entries and an export folder."""
+    manifest_files = {}
+    for name, content in [("short_form.csv", "a,b\n1,2\n"), ("tau.csv", "c\n3\n")]:
+        path = tmp_path / name
+        path.write_text(content)
+        manifest_files[str(path)] = {
+            "file": name,
+            "sizeBytes": mods.rd_stat_size(str(path)),
+            "md5sum": mods.rd_md5sum(str(path)),
+        }
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    return manifest_files, str(export_dir)
+
+
+def run_transfers(outputs, copy_files, md5sum=mods.rd_md5sum, method="copy"):
+    """Transfer the output files with the local file functions."""
+    manifest_files, export_dir = outputs
+    return transfer_files_parallel(
+        manifest_files,
+        export_dir,
+        method,
+        logger,
+        copy_files,
+        mods.rd_move_file,
+        mods.rd_isfile,
+        md5sum,
+        max_workers=2,
+        retries=1,
+    )
+
+
+def test_transfer_files_parallel(outputs):
+    """Test files are copied or moved and checked, with a report for each."""
+    report = run_transfers(outputs, mods.rd_copy_file)
+    assert [row["file"] for row in report] == list(outputs[0])
+    assert [row["attempts"] for row in report] == [1, 1]
+    assert [row["sizeBytes"] for row in report] == [8, 4]
+
+    # moved files are checked in the same way
+    shutil.rmtree(outputs[1])
+    os.mkdir(outputs[1])
+    report = run_transfers(outputs, mods.rd_copy_file, method="move")
+    assert [row["attempts"] for row in report] == [1, 1]
+    assert not any(mods.rd_isfile(path) for path in outputs[0])
+
+
+def test_transfer_files_parallel_retries(outputs):
+    """Test a transfer which fails its check is retried, then raises."""
+    failed = set()
+
+    def flaky_copy(src_path, dst_path):
+        # the first copy of each file is truncated
+        shutil.copy(src_path, dst_path)
+        if src_path not in failed:
+            failed.add(src_path)
+            with open(f"{dst_path}/{src_path.split('/')[-1]}", "w") as f:
+                f.write("a")
+
+    report = run_transfers(outputs, flaky_copy)
+    assert [row["attempts"] for row in report] == [2, 2]
+
+    def broken_copy(src_path, dst_path):
+        raise OSError("disk full")
+
+    with pytest.raises(TransferError):
+        run_transfers(outputs, broken_copy)
+
+
+def test_transfer_files_parallel_md5sum_mismatch(outputs):
+    """Test a file whose md5sum does not match is not accepted on its size."""
+    with pytest.raises(TransferError):
+        run_transfers(outputs, mods.rd_copy_file, md5sum=lambda path: "abc-2")
+
+
+def test_transfer_file_verified_hdfs(outputs, monkeypatch):
+    """Test hdfs transfers, which put the file inside the destination folder,
+    are checked at the path the file is written to."""
+    monkeypatch.setattr(hdfs_mods, "_session", HdfsSession(FakeHdfs))
+    monkeypatch.setattr(hdfs_mods, "hdfs", mock.Mock(open=open), raising=False)
+    manifest_files, export_dir = outputs
+
+    for method, (source, expected) in zip(["copy", "move"], manifest_files.items()):
+        report = transfer_file_verified(
+            source,
+            f"{export_dir}/",
+            method,
+            expected,
+            logger,
+            hdfs_mods.rd_copy_file,
+            hdfs_mods.rd_move_file,
+            hdfs_mods.rd_isfile,
+            hdfs_mods.rd_md5sum,
+            retries=0,
+        )
+        assert report["attempts"] == 1
+        assert os.path.isfile(os.path.join(export_dir, os.path.basename(source)))
+
+    # a file which does not match its manifest entry is not verified
+    source, expected = next(iter(manifest_files.items()))
+    with pytest.raises(TransferError):
+        transfer_file_verified(
+            source,
+            export_dir,
+            "copy",
+            {**expected, "md5sum": "0" * 32},
+            logger,
+            hdfs_mods.rd_copy_file,
+            hdfs_mods.rd_move_file,
+            hdfs_mods.rd_isfile,
+            hdfs_mods.rd_md5sum,
+            retries=0,
+        )
@@ -0,0 +1,73 @@
+"""Tests for manifest_output.py."""
+import json
+from datetime import datetime
+
+import pytest
+
+from src.outputs.manifest_output import Manifest, ManifestError
+from src.utils import local_file_mods as mods
+
+
+class TestManifest(object):
+    """Tests for the Manifest class."""
+
+    @pytest.fixture(scope="function")
+    def outgoing_dir(self, tmp_path):
+        """An outgoing folder holding two output files."""
+        outputs_dir = tmp_path / "outputs"
+        outputs_dir.mkdir()
+        (outputs_dir / "short_form.csv").write_text("reference,200\n1,C\n")
+        (outputs_dir / "long_form.csv").write_text("reference,211\n1,10\n2,20\n")
+        (tmp_path / "export").mkdir()
+        return tmp_path
+
+    def create_manifest(self, outgoing_dir, file_info_func) -> Manifest:
+        """Create a manifest using the local file functions."""
+        return Manifest(
+            outgoing_directory=str(outgoing_dir),
+            export_directory=str(outgoing_dir / "export"),
+            pipeline_run_datetime=datetime(2024, 1, 2, 3, 4),
+            delete_file_func=mods.rd_delete_file,
+            md5sum_func=mods.rd_md5sum,
+            stat_size_func=mods.rd_stat_size,
+            isdir_func=mods.rd_isdir,
+            isfile_func=mods.rd_isfile,
+            read_header_func=mods.rd_read_header,
+            string_to_file_func=mods.rd_write_string_to_file,
+            file_info_func=file_info_func,
+        )
+
+    @pytest.mark.parametrize("file_info_func", [None, mods.rd_file_info])
+    def test_add_files(self, outgoing_dir, file_info_func):
+        """Test files added together match files added one at a time."""
+        column_headers = {
+            "outputs/short_form.csv": "reference,200",
+            "outputs/long_form.csv": "reference,211",
+        }
+        manifest = self.create_manifest(outgoing_dir, file_info_func)
+        manifest.add_files(column_headers)
+
+        expected = self.create_manifest(outgoing_dir, None)
+        for path, header in column_headers.items():
+            expected.add_file(path, header)
+
+        assert manifest.manifest == expected.manifest
+        assert [f["file"] for f in manifest.manifest["files"]] == [
+            "short_form.csv",
+            "long_form.csv",
+        ]
+        assert manifest.manifest["files"][1]["sizeBytes"] == 24
+        assert manifest.invalid_headers == []
+
+        manifest.write_manifest()
+        with open(manifest.manifest_file_path) as f:
+            assert json.load(f) == manifest.manifest
+
+    def test_add_files_invalid(self, outgoing_dir):
+        """Test a missing file or a header which does not match is reported."""
+        manifest = self.create_manifest(outgoing_dir, mods.rd_file_info)
+        with pytest.raises(ManifestError):
+            manifest.add_files({"outputs/missing.csv": "reference"})
+
+        manifest.add_files({"outputs/short_form.csv": "reference,201"})
+        assert len(manifest.invalid_headers) == 1
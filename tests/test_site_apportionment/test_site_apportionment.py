@@ -19,6 +19,7 @@ from src.site_apportionment.site_apportionment import (
     count_duplicate_sites,
     weight_values,
     create_category_df,
+    iter_apportioned_sites,
 )
 
 # Define easier pandas usages
@@ -413,6 +414,45 @@ class TestCreateCartesianProduct:
         assert_frame_equal(result_df.reset_index(drop=True), exp_output_df)
 
 
+class TestIterApportionedSites(TestCreateCartesianProduct):
+    """Tests for the iter_apportioned_sites function."""
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 10])
+    def test_iter_apportioned_sites(self, batch_size):
+        """Test the batches match the weighted Cartesian product."""
+        category_input_df = self.create_category_input_df()
+        # shuffle the categories, which are matched to sites by their key
+        category_input_df = category_input_df.sample(frac=1, random_state=2)
+        sites_input_df = self.create_sites_input_df()
+        sites_input_df = sites_input_df.rename(columns={"site_weights": "site_weight"})
+        cols_in_order = ["reference", "period", "instance", "601", "201", "211"]
+
+        exp_output_df = weight_values(
+            create_cartesian_product(sites_input_df, category_input_df),
+            ["211"],
+            "site_weight",
+        )[cols_in_order]
+
+        batches = list(
+            iter_apportioned_sites(
+                sites_input_df,
+                category_input_df,
+                ["211"],
+                cols_in_order,
+                batch_size=batch_size,
+            )
+        )
+        result_df = pd.concat(batches, ignore_index=True)
+
+        # 4 references and periods have both sites and categories
+        assert len(batches) == -(-4 // batch_size)
+        sort_cols = ["reference", "period", "instance", "211"]
+        assert_frame_equal(
+            result_df.sort_values(sort_cols).reset_index(drop=True),
+            exp_output_df.sort_values(sort_cols).reset_index(drop=True),
+        )
+
+
 class TestCreateNotnullMask:
     """Tests for the function create_not_null_mask."""
 
@@ -5,6 +5,7 @@ from src.staging.postcode_validation import (
     run_full_postcode_process,
     # validate_postcode_pattern,
     format_postcodes,
+    format_postcode_series,
     check_pcs_real,
 )
 
@@ -34,6 +35,35 @@ class TestFormatPostcode(object):
         output["postcode"] = output["postcode"].apply(lambda x: format_postcodes(x))
         print(output)
 
+    def test_format_postcode_series(self, input_data):
+        """Test the vectorised formatting matches format_postcodes."""
+        postcodes = pd.concat(
+            [input_data["postcode"], pd.Series([None, " sw1a1aa ", "NP44 2NZ"])],
+            ignore_index=True,
+        )
+
+        result = format_postcode_series(postcodes)
+
+        expected_output = pd.Series(
+            [
+                "NP44 2NZ",
+                "NP44 2NZ",
+                "NP4  2NZ",
+                None,
+                None,
+                "NP44 2NZ",
+                "        ",
+                None,
+                "SW1A 1AA",
+                "NP44 2NZ",
+            ],
+            name="postcode",
+        )
+        pd.testing.assert_series_equal(result, postcodes.apply(format_postcodes))
+        pd.testing.assert_series_equal(
+            result, expected_output, check_names=False
+        )
+
 
 # Get the config
 def generate_config(val):
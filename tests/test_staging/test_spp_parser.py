@@ -1,8 +1,13 @@
+import io
+import json
+
+import numpy as np
 import pandas as pd
+import pytest
 from typing import Tuple
 
 # Import modules to test
-from src.staging.spp_parser import parse_snap_data
+from src.staging.spp_parser import parse_snap_data, parse_snap_stream
 
 
 class TestParseSPP:
@@ -41,3 +46,53 @@ class TestParseSPP:
 
         pd.testing.assert_frame_equal(df_result1, expected_output_data1)
         pd.testing.assert_frame_equal(df_result2, expected_output_data2)
+
+
+class TestParseSnapStream:
+    """Tests for the parse_snap_stream function."""
+
+    def input_data(self) -> dict:
+        dummy_snapdata = {
+            "snapshot_id": "abc",
+            "extra": {"nested": [1, 2, {"x": "]}"}]},
+            "contributors": [
+                {"ref": "123", "con": "789", "emp": 10},
+                {"ref": "456", "con": "910"},
+            ],
+            "responses": [
+                {"ref": "123", "res": "a \\\"quoted\\\" \u00e9", "val": 1.5},
+                {"ref": "456", "res": "910", "val": None},
+            ],
+        }
+        return dummy_snapdata
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 2**20])
+    def test_parse_snap_stream_matches_parse_snap_data(self, chunk_size):
+        """Test the streaming parser gives the same output as parse_snap_data."""
+        snapdata = self.input_data()
+        file = io.BytesIO(json.dumps(snapdata, indent=2).encode("utf-8"))
+
+        result_con, result_res = parse_snap_stream(file, chunk_size=chunk_size)
+        expected_con, expected_res = parse_snap_data(snapdata)
+
+        pd.testing.assert_frame_equal(result_con, expected_con)
+        pd.testing.assert_frame_equal(result_res, expected_res)
+        assert np.isnan(result_con.loc[1, "emp"])
+
+    def test_parse_snap_stream_text_file(self):
+        """Test the streaming parser accepts a file opened in text mode."""
+        snapdata = self.input_data()
+        file = io.StringIO(json.dumps(snapdata))
+
+        result_con, result_res = parse_snap_stream(file, chunk_size=5)
+        expected_con, expected_res = parse_snap_data(snapdata)
+
+        pd.testing.assert_frame_equal(result_con, expected_con)
+        pd.testing.assert_frame_equal(result_res, expected_res)
+
+    def test_parse_snap_stream_missing_key(self):
+        """Test a KeyError is raised if the responses array is missing."""
+        file = io.BytesIO(json.dumps({"contributors": []}).encode("utf-8"))
+
+        with pytest.raises(KeyError):
+            parse_snap_stream(file)
@@ -8,6 +8,7 @@ from typing import Tuple
 
 from src.staging.spp_snapshot_processing import (
     create_response_dataframe,
+    create_wide_response_dataframe,
     full_responses,
     response_rate,
     create_contextual_dataframe,
@@ -108,6 +109,63 @@ def test_full_responses(dummy_data, expected_output):
     )
 
 
+def full_responses_pivot(
+    contributors: pd.DataFrame, responses: pd.DataFrame
+) -> pd.DataFrame:
+    """Merge contributor and response data using pivot_table, as full_responses did.
+
+    The contributor data is merged onto every long response row before the
+    responses are reshaped, so this is the reference for the faster reshaping.
+    """
+    drop_cols = ["createdby", "createddate", "lastupdatedby"]
+    unique_id_cols = ["reference", "instance"]
+
+    contributors_dropped = contributors.drop(drop_cols, axis=1)
+    responses_dropped = responses.drop(
+        drop_cols + ["lastupdateddate", "adjustedresponse"], axis=1
+    )
+    responses_dropped = responses_dropped.astype({"instance": "Int64"})
+
+    merged_df = contributors_dropped.merge(
+        responses_dropped, on=["reference", "survey", "period"], how="outer"
+    )
+    contextual_df = create_contextual_dataframe(merged_df, unique_id_cols)
+    response_df = create_response_dataframe(merged_df, unique_id_cols)
+
+    return response_df.merge(contextual_df, on=unique_id_cols, how="outer")
+
+
+def test_full_responses_matches_pivot(dummy_data):
+    """Test full_responses gives the same output as the pivot_table version."""
+    contributor_data, responses_data = dummy_data
+
+    # Add a duplicate response, null responses and a response with no contributor
+    extra_responses = pd.DataFrame(
+        {
+            "reference": [101, 101, 102, 104],
+            "instance": [0, 1, 0, 0],
+            "period": 202012,
+            "survey": 1,
+            "createdby": "A",
+            "createddate": 2020,
+            "lastupdatedby": "A",
+            "lastupdateddate": 2020,
+            "questioncode": ["200", "300", "201", "200"],
+            "response": ["999", None, None, "5"],
+            "adjustedresponse": "",
+        }
+    )
+    responses_data = responses_data.astype({"questioncode": str, "response": str})
+    responses_data = pd.concat(
+        [responses_data, extra_responses], ignore_index=True
+    ).astype({"instance": "Int64"})
+
+    df_result = full_responses(contributor_data, responses_data)
+    expected_output_data = full_responses_pivot(contributor_data, responses_data)
+
+    pd.testing.assert_frame_equal(df_result, expected_output_data)
+
+
 def test_response_rate(dummy_data):
     # Import the module to test
 
@@ -139,6 +197,26 @@ def test_create_response_dataframe(dummy_data):
     assert response_df.values.tolist() == expected_data
 
 
+def test_create_wide_response_dataframe(dummy_data):
+
+    contributor_data, responses_data = dummy_data
+    unique_id_cols = ["reference", "instance"]
+    expected_columns = ["reference", "instance", 200, 201, 202]
+    expected_data = [
+        [101, 0, 0, 50, 100],
+        [101, 1, 10, 510, 110],
+        [102, 0, 75, 25, 65],
+    ]
+
+    response_df = create_wide_response_dataframe(responses_data, unique_id_cols)
+
+    # Assert the columns
+    assert response_df.columns.tolist() == expected_columns
+
+    # Assert the data
+    assert response_df.values.tolist() == expected_data
+
+
 def test_create_contextual_dataframe(dummy_data):
     contributor_data, responses_data = dummy_data
     unique_id_cols = ["reference", "instance"]
@@ -2,6 +2,7 @@ import pandas as pd
 from pandas._testing import assert_frame_equal
 import numpy as np
 import pytest
+import toml
 import unittest
 
 
@@ -10,6 +11,7 @@ from src.staging.validation import (
     validate_data_with_schema,
     combine_schemas_validate_full_df,
     validate_many_to_one,
+    load_schema_dtypes,
 )
 
 
@@ -95,6 +97,74 @@ def test_validate_data_with_schema(mock_load_schema):
     assert pd.api.types.is_datetime64_any_dtype(dumy_data["col4"].dtypes)
 
 
+def test_load_schema_dtypes_cached(tmp_path, monkeypatch):
+    """Test load_schema_dtypes only parses each schema file once."""
+    schema_path = tmp_path / "schema.toml"
+    schema_path.write_text(
+        '[col1]\nDeduced_Data_Type = "Int64"\n[col2]\nDeduced_Data_Type = "str"\n'
+    )
+    other_path = tmp_path / "other_schema.toml"
+    other_path.write_text(
+        '[col2]\nDeduced_Data_Type = "float64"\n[col3]\nDeduced_Data_Type = "bool"\n'
+    )
+
+    parsed_paths = []
+
+    def counting_load_schema(file_path):
+        parsed_paths.append(file_path)
+        return toml.load(file_path)
+
+    monkeypatch.setattr("src.staging.validation.load_schema", counting_load_schema)
+
+    first_result = load_schema_dtypes(str(schema_path), str(other_path))
+    first_result["col1"] = "changed"
+    second_result = load_schema_dtypes(str(schema_path), str(other_path))
+
+    # The first schema takes priority, and the cached result is not changed
+    assert second_result == {"col1": "Int64", "col2": "str", "col3": "bool"}
+    assert parsed_paths == [str(schema_path), str(other_path)]
+
+
+def test_validate_data_with_schema_coercion(monkeypatch, caplog):
+    """Test columns are converted together and coerced values are logged."""
+
+    def mock_schema(filepath):
+        return {
+            "col1": {"Deduced_Data_Type": "Int64"},
+            "col2": {"Deduced_Data_Type": "Int64"},
+            "col3": {"Deduced_Data_Type": "Int64"},
+            "col4": {"Deduced_Data_Type": "str"},
+        }
+
+    monkeypatch.setattr("src.staging.validation.load_schema", mock_schema)
+
+    dummy_data = pd.DataFrame(
+        {
+            "col1": ["1", "x", None],
+            "col4": ["a", "b", "c"],
+            "col2": ["4", "5", "6"],
+            "col3": ["1.5", "2", ""],
+        }
+    )
+
+    with caplog.at_level("WARNING"):
+        validate_data_with_schema(dummy_data, "mock_schema.toml")
+
+    expected_output = pd.DataFrame(
+        {
+            "col1": pd.array([1, None, None], dtype="Int64"),
+            "col4": pd.array(["a", "b", "c"], dtype="string"),
+            "col2": pd.array([4, 5, 6], dtype="Int64"),
+            # Values which are not whole numbers cannot be cast to Int64
+            "col3": [1.5, 2.0, np.nan],
+        }
+    )
+    assert_frame_equal(dummy_data, expected_output)
+    assert "1 values in column 'col1' are not numeric" in caplog.text
+    assert "1 values in column 'col3' are not numeric" in caplog.text
+    assert "col2" not in caplog.text
+
+
 # Mock the schemas data
 def mock_load_both_data(filepath):
     data_type_schema1 = {
@@ -425,3 +425,12 @@ class TestGreaterThanValidation:
             assert "Doing checks for values that should be greater than..." in caplog.text
             assert result_msg == msg
             assert result_count == count
+
+    def test_greater_than_validation_some_rows_fail(self):
+        """Test for greater_than_validation flagging only the rows that fail."""
+        input_df = self.create_input_df()
+        input_df = input_df.loc[input_df['reference'].isin(['A', 'B'])]
+        msg = "Column 221 is greater than 209 for reference: B, instance 1.\n "
+        result_msg, result_count = greater_than_validation(input_df, "", 0)
+        assert result_msg == msg
+        assert result_count == 1
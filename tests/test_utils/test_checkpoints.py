@@ -0,0 +1,158 @@
+"""Tests for checkpoints.py."""
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.utils import local_file_mods as mods
+from src.utils.checkpoints import StageCheckpointer
+
+
+class TestStageCheckpointer(object):
+    """Tests for the StageCheckpointer class."""
+
+    @pytest.fixture(scope="function")
+    def config(self, tmp_path) -> dict:
+        """Test config, with a construction file as an input."""
+        construction_file = tmp_path / "construction.csv"
+        construction_file.write_text("reference,601\n1,NP44 2NZ\n")
+        return {
+            "global": {"output_imputation_qa": False, "load_ni_data": False},
+            "checkpoints": {
+                "use_checkpoints": True,
+                "resume_from": "None",
+                "force_rerun": False,
+            },
+            "checkpoint_paths": {
+                "stage_outputs_path": str(tmp_path / "checkpoints" / "stage_outputs")
+            },
+            "construction_paths": {
+                "all_data_construction_file_path": str(construction_file)
+            },
+        }
+
+    def create_checkpointer(self, config) -> StageCheckpointer:
+        """Create a checkpointer using the local file functions."""
+        return StageCheckpointer(
+            config,
+            "0.0.1",
+            mods.rd_file_exists,
+            mods.rd_isfile,
+            mods.rd_mkdir,
+            mods.rd_read_feather,
+            mods.rd_write_feather,
+            mods.rd_load_json,
+            mods.rd_write_string_to_file,
+            mods.rd_stat_size,
+            mods.rd_md5sum,
+        )
+
+    def run_stages(self, config, calls):
+        """Run two stages, recording the stages which were not loaded."""
+
+        def construction():
+            calls.append("construction")
+            df = pd.DataFrame({"reference": [3, 1], "211": [10.5, None]})
+            return df.set_index("reference"), {"total": 10.5}, None
+
+        def imputation(df):
+            calls.append("imputation")
+            return df.assign(imp_marker="R")
+
+        checkpointer = self.create_checkpointer(config)
+        outputs = checkpointer.run_stage("construction", construction)
+        imputed = checkpointer.run_stage("imputation", imputation, outputs[0])
+        return outputs, imputed
+
+    def test_run_stage_loads_checkpoint(self, config):
+        """Test the second run loads the outputs saved by the first run."""
+        calls = []
+        first_outputs, first_imputed = self.run_stages(config, calls)
+        second_outputs, second_imputed = self.run_stages(config, calls)
+
+        assert calls == ["construction", "imputation"]
+        assert_frame_equal(second_outputs[0], first_outputs[0])
+        assert second_outputs[1:] == ({"total": 10.5}, None)
+        assert_frame_equal(second_imputed, first_imputed)
+
+    def test_run_stage_reruns(self, config):
+        """Test the settings and input files which cause stages to rerun."""
+        calls = []
+        self.run_stages(config, calls)
+
+        # output settings are not part of the key, but the QA of a stage is
+        config["global"]["output_long_form"] = True
+        config["global"]["output_imputation_qa"] = True
+        self.run_stages(config, calls)
+        assert calls == ["construction", "imputation", "imputation"]
+
+        config["global"]["output_imputation_qa"] = False
+        config["checkpoints"]["resume_from"] = "imputation"
+        self.run_stages(config, calls)
+        assert calls[3:] == ["imputation"]
+
+        config["checkpoints"]["force_rerun"] = True
+        self.run_stages(config, calls)
+        assert calls[4:] == ["construction", "imputation"]
+
+        # changing an input file reruns the stage and every stage after it
+        config["checkpoints"]["force_rerun"] = False
+        config["checkpoints"]["resume_from"] = None
+        input_path = config["construction_paths"]["all_data_construction_file_path"]
+        with open(input_path, "a") as f:
+            f.write("2,CE1 4OY\n")
+        self.run_stages(config, calls)
+        assert calls[6:] == ["construction", "imputation"]
+
+    def test_run_stage_empty_frames(self, config):
+        """Test empty frames, with or without columns, are saved and loaded."""
+        calls = []
+
+        def mapping():
+            calls.append("mapping")
+            return (
+                pd.DataFrame({"reference": [1], "211": [10.5]}),
+                pd.DataFrame(),
+                pd.DataFrame(columns=["reference", "itl"]),
+            )
+
+        first = self.create_checkpointer(config).run_stage("mapping", mapping)
+        second = self.create_checkpointer(config).run_stage("mapping", mapping)
+
+        assert calls == ["mapping"]
+        for first_df, second_df in zip(first, second):
+            assert_frame_equal(second_df, first_df, check_index_type=False)
+
+    def test_freezing_modes_rerun(self, config):
+        """Test freezing always runs in the modes where it writes files."""
+        calls = []
+
+        def freezing():
+            calls.append("freezing")
+            return pd.DataFrame({"reference": [1], "211": [10.5]})
+
+        config["global"]["run_with_snapshot_and_freeze"] = False
+        for _ in range(2):
+            self.create_checkpointer(config).run_stage("freezing", freezing)
+        assert calls == ["freezing"]
+
+        config["global"]["run_with_snapshot_and_freeze"] = True
+        for _ in range(2):
+            self.create_checkpointer(config).run_stage("freezing", freezing)
+        assert calls == ["freezing", "freezing", "freezing"]
+
+    def test_force_rerun_skips_input_files(self, config):
+        """Test force_rerun neither reads the input files nor saves checkpoints."""
+        calls = []
+        config["checkpoints"]["force_rerun"] = True
+        checkpointer = self.create_checkpointer(config)
+        checkpointer.md5sum_func = lambda path: calls.append(path)
+        checkpointer.run_stage("construction", lambda: pd.DataFrame({"a": [1]}))
+
+        assert calls == []
+        assert not mods.rd_file_exists(config["checkpoint_paths"]["stage_outputs_path"])
+
+    def test_resume_from_invalid(self, config):
+        """Test an unknown stage name in resume_from raises an error."""
+        config["checkpoints"]["resume_from"] = "imputing"
+        with pytest.raises(ValueError):
+            self.create_checkpointer(config)
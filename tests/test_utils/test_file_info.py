@@ -0,0 +1,28 @@
+"""Tests for file_info.py."""
+import hashlib
+import io
+
+from src.utils.file_info import md5_stream, stream_file_info
+
+
+def test_md5_stream():
+    """Test the chunked md5sum matches hashing the whole content."""
+    content = b"reference,instance\n" + b"1,0\n" * 1000
+    result = md5_stream(io.BytesIO(content), chunk_size=7)
+    assert result == hashlib.md5(content).hexdigest()
+
+
+def test_stream_file_info():
+    """Test the size, md5sum and header are found in one pass."""
+    # the header is split across chunks and ends with a windows line ending
+    content = b"reference,instance,200\r\n" + b"1,0,C\r\n" * 100
+    result = stream_file_info(io.BytesIO(content), chunk_size=5)
+    assert result == {
+        "size": len(content),
+        "md5sum": hashlib.md5(content).hexdigest(),
+        "header": "reference,instance,200",
+    }
+
+    # a file with no line ending is all header
+    result = stream_file_info(io.BytesIO(b"reference"))
+    assert (result["size"], result["header"]) == (9, "reference")
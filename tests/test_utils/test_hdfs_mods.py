@@ -13,6 +13,7 @@ from src.utils.hdfs_mods import (
     rd_load_json,
     rd_file_exists,
     rd_file_size,
+    rd_stat_size,
     check_file_exists,
 )
 
@@ -151,6 +152,23 @@ class TestHdfsFileSize:
         assert result == 300
 
 
+class TestHdfsStatSize:
+    """Tests for function to return the disk usage of a path in HDFS."""
+
+    @mock.patch("src.utils.hdfs_mods._perform")
+    @mock.patch("src.utils.hdfs_mods._session")
+    def test_rd_stat_size(self, mock_session, mock_perform):
+        """Mock test for rd_stat_size to return an int with or without pydoop."""
+        mock_session.fs = None
+        mock_perform.return_value = "300 900 filepath/filename.csv"
+        assert rd_stat_size("filepath/filename.csv") == 300
+
+        mock_session.fs = mock.Mock()
+        mock_session.disk_usage.return_value = 300
+        assert rd_stat_size("filepath/filename.csv") == 300
+        assert isinstance(rd_stat_size("filepath/filename.csv"), int)
+
+
 class TestCheckFileExists:
     """Tests for function to check a file exists in HDFS."""
 
@@ -0,0 +1,115 @@
+"""Tests for hdfs_session.py and the hdfs_mods functions which use it."""
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from src.utils import hdfs_mods
+from src.utils.hdfs_session import HdfsSession
+
+
+class FakeHdfs(object):
+    """Stand-in for a pydoop hdfs connection, backed by the local file system."""
+
+    def get_path_info(self, path):
+        if not os.path.exists(path):
+            raise IOError(f"No such file or directory: {path}")
+        stat = os.stat(path)
+        return {
+            "name": f"hdfs://namenode:8020{path}",
+            "kind": "directory" if os.path.isdir(path) else "file",
+            "size": 0 if os.path.isdir(path) else stat.st_size,
+            "last_mod": stat.st_mtime,
+        }
+
+    def list_directory(self, path):
+        return [self.get_path_info(os.path.join(path, n)) for n in os.listdir(path)]
+
+    def delete(self, path, recursive=True):
+        os.remove(path)
+
+    def copy(self, from_path, to_hdfs, to_path):
+        shutil.copy(from_path, to_path)
+
+    def rename(self, from_path, to_path):
+        os.rename(from_path, to_path)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="function")
+def fake_hdfs(monkeypatch):
+    """Route the hdfs_mods functions through a session on a FakeHdfs."""
+    fs = FakeHdfs()
+    session = HdfsSession(lambda: fs)
+    monkeypatch.setattr(hdfs_mods, "_session", session)
+    with mock.patch("src.utils.hdfs_mods._perform") as mock_perform:
+        yield fs
+    # the hadoop fs commands are not used while there is a connection
+    mock_perform.assert_not_called()
+
+
+@pytest.fixture(scope="function")
+def outputs_dir(tmp_path):
+    """A folder holding two csv files and a sub folder."""
+    (tmp_path / "a.csv").write_text("reference\n1\n")
+    (tmp_path / "b.csv").write_text("reference\n1\n2\n")
+    (tmp_path / "export").mkdir()
+    (tmp_path / "export" / "c.json").write_text("{}")
+    return tmp_path
+
+
+def test_path_checks(fake_hdfs, outputs_dir):
+    """Test the file, directory and size checks use the connection."""
+    a_path = str(outputs_dir / "a.csv")
+    assert hdfs_mods.rd_isfile(a_path)
+    assert not hdfs_mods.rd_isfile(str(outputs_dir))
+    assert hdfs_mods.rd_isdir(str(outputs_dir))
+    assert not hdfs_mods.rd_isdir(str(outputs_dir / "missing"))
+    assert hdfs_mods.rd_stat_size(a_path) == 12
+    assert hdfs_mods.rd_stat_size(str(outputs_dir)) == 12 + 14 + 2
+
+    missing = str(outputs_dir / "missing.csv")
+    assert hdfs_mods.rd_isfile_many([a_path, missing]) == {
+        a_path: True,
+        missing: False,
+    }
+
+
+def test_file_operations(fake_hdfs, outputs_dir):
+    """Test listing, copying, moving and deleting files use the connection."""
+    export_dir = str(outputs_dir / "export")
+    a_path = str(outputs_dir / "a.csv")
+    b_path = str(outputs_dir / "b.csv")
+
+    assert hdfs_mods.rd_list_files(str(outputs_dir), ext="csv") == [a_path, b_path]
+    assert hdfs_mods.rd_search_file(export_dir, ".json") == f"{export_dir}/c.json"
+
+    # copying or moving to a directory puts the file inside it
+    assert hdfs_mods.rd_copy_file(a_path, export_dir)
+    assert hdfs_mods.rd_move_file(b_path, export_dir)
+    assert sorted(os.listdir(export_dir)) == ["a.csv", "b.csv", "c.json"]
+    assert not os.path.exists(b_path)
+
+    assert hdfs_mods.rd_delete_file(a_path)
+    assert not hdfs_mods.rd_delete_file(a_path)
+    assert not hdfs_mods.rd_delete_file(export_dir)
+
+
+def test_session_fallback(monkeypatch):
+    """Test the hadoop fs commands are used if the connection fails."""
+
+    def connect():
+        raise RuntimeError("no namenode")
+
+    session = HdfsSession(connect)
+    monkeypatch.setattr(hdfs_mods, "_session", session)
+    with mock.patch("src.utils.hdfs_mods._perform") as mock_perform:
+        mock_perform.return_value = True
+        assert hdfs_mods.rd_isfile("outputs/a.csv")
+        mock_perform.assert_called_once_with(
+            ["hadoop", "fs", "-test", "-f", "outputs/a.csv"]
+        )
+    assert not session.available
@@ -8,16 +8,20 @@ from typing import Union
 import pandas as pd
 import yaml
 
+from src.staging.validation import schema_read_csv_kwargs
 from src.utils.local_file_mods import (
     rd_read_csv,
     rd_write_csv,
     rd_load_json,
+    rd_open_file,
     rd_file_exists,
     rd_file_size,
     check_file_exists,
     rd_mkdir,
     # rd_open,
     rd_write_feather,
+    rd_write_table,
+    rd_read_table,
     safeload_yaml,
 )
 
@@ -61,6 +65,31 @@ def test_rd_read_csv(test_csv_file, expout_data):
     pd.testing.assert_frame_equal(df, expout_data)
 
 
+def test_rd_read_csv_schema(tmp_path, test_csv_file, expout_data):
+    # Only the schema columns are read, with text columns read as strings
+    schema_path = tmp_path / "schema.toml"
+    schema_path.write_text(
+        '[run_id]\nDeduced_Data_Type = "str"\n\n'
+        '[duration]\nDeduced_Data_Type = "float"\n'
+    )
+    df = rd_read_csv(str(test_csv_file), **schema_read_csv_kwargs(str(schema_path)))
+    assert list(df.columns) == ["run_id", "duration"]
+    assert df["run_id"].tolist() == ["1", "2"]
+    assert df["duration"].tolist() == [5.0, 6.0]
+
+
+def test_rd_read_csv_chunks_and_engine(test_csv_file, expout_data):
+    # chunksize returns an iterator of dataframes
+    chunks = list(rd_read_csv(str(test_csv_file), chunksize=1))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(df, expout_data)
+
+    # The pyarrow engine reads the same data
+    df = rd_read_csv(str(test_csv_file), engine="pyarrow")
+    pd.testing.assert_frame_equal(df, expout_data)
+
+
 def test_rd_write_csv(tmp_path, input_data):
     filepath = tmp_path / "test.csv"
 
@@ -91,6 +120,22 @@ def test_rd_load_json(tmp_path):
     assert loaded_data == test_data_dict
 
 
+def test_rd_open_file(tmp_path):
+    # Write a test file to be read back in chunks
+    filepath = tmp_path / "test.json"
+    with open(filepath, "w") as file:
+        file.write(json.dumps({"key1": "value1"}))
+
+    with rd_open_file(str(filepath)) as file:
+        first_chunk = file.read(4)
+        content = first_chunk + file.read()
+
+    # Test that the file is read as bytes and closed afterwards
+    assert first_chunk == b'{"ke'
+    assert json.loads(content) == {"key1": "value1"}
+    assert file.closed
+
+
 def test_rd_file_exists(tmp_path):
     filepath = tmp_path / "test_file.txt"
     # Checking that it doesn't give a false positive
@@ -147,6 +192,27 @@ def test_rd_file_write_feather(tmp_path, input_data, expout_data):
     pd.testing.assert_frame_equal(df, expout_data)
 
 
+def test_rd_write_read_table(tmp_path, input_data, expout_data):
+    # Write the data in every format, replacing the .csv extension
+    filepath = str(tmp_path / "test.csv")
+    paths = rd_write_table(filepath, input_data, ["csv", "parquet", "feather"])
+    extensions = ["csv", "parquet", "feather"]
+    assert paths == [str(tmp_path / f"test.{ext}") for ext in extensions]
+
+    # Read each file back and compare the content
+    for path in paths:
+        pd.testing.assert_frame_equal(rd_read_table(path), expout_data)
+
+    # Data which cannot be stored in a columnar format falls back to csv
+    mixed_data = pd.DataFrame({"run_id": [1, "a"]})
+    paths = rd_write_table(str(tmp_path / "mixed.csv"), mixed_data, ["parquet"])
+    assert paths == [str(tmp_path / "mixed.csv")]
+    assert not os.path.exists(tmp_path / "mixed.parquet")
+
+    with pytest.raises(ValueError):
+        rd_write_table(filepath, input_data, ["xlsx"])
+
+
 def write_dict_to_yaml(_dict: dict, path: Union[str, pathlib.Path]) -> None:
     """Write a dictionary as a yaml file
 
@@ -0,0 +1,75 @@
+"""Tests for mapper_cache.py."""
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.utils import local_file_mods as mods
+from src.utils.mapper_cache import MapperCache
+
+
+class TestMapperCache(object):
+    """Tests for the MapperCache class."""
+
+    @pytest.fixture(scope="function")
+    def cache(self, tmp_path) -> MapperCache:
+        """A mapper cache writing feather files to a temporary folder."""
+        config = {
+            "global": {"cache_mappers": True},
+            "mapping_paths": {"mapper_cache_path": str(tmp_path / "mapper_cache")},
+        }
+        return MapperCache(
+            config,
+            mods.rd_file_exists,
+            mods.rd_mkdir,
+            mods.rd_read_csv,
+            mods.rd_read_feather,
+            mods.rd_write_feather,
+            mods.rd_stat_size,
+            mods.rd_md5sum,
+        )
+
+    @pytest.fixture(scope="function")
+    def mapper_path(self, tmp_path) -> str:
+        """A postcode mapper csv in a temporary folder."""
+        mapper = pd.DataFrame(
+            {"pcd2": ["NP44 2NZ", "CE1  4OY"], "itl": ["UKL16", "UKJ14"]}
+        )
+        path = str(tmp_path / "postcodes.csv")
+        mapper.to_csv(path, index=False)
+        return path
+
+    def test_read_csv_miss_then_hit(self, cache, mapper_path):
+        """Test the first read caches the mapper and the second read uses it."""
+        expected = pd.read_csv(mapper_path)
+
+        first = cache.read_csv(mapper_path)
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert os.path.exists(cache.cache_file_path(mapper_path))
+
+        second = cache.read_csv(mapper_path)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert_frame_equal(first, expected)
+        assert_frame_equal(second, expected)
+
+    def test_read_csv_changed_file(self, cache, mapper_path):
+        """Test a changed csv is read again rather than served from the cache."""
+        cache.read_csv(mapper_path)
+        pd.DataFrame({"pcd2": ["RH12 1XL"], "itl": ["UKJ28"]}).to_csv(
+            mapper_path, index=False
+        )
+
+        result = cache.read_csv(mapper_path)
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert result["pcd2"].tolist() == ["RH12 1XL"]
+
+    def test_read_csv_bypass(self, cache, mapper_path):
+        """Test reads with keyword arguments or a disabled cache skip the cache."""
+        result = cache.read_csv(mapper_path, usecols=["pcd2"])
+        assert list(result.columns) == ["pcd2"]
+
+        cache.enabled = False
+        cache.read_csv(mapper_path)
+        assert (cache.hits, cache.misses) == (0, 0)
+        assert not os.path.exists(cache.cache_path)
@@ -0,0 +1,92 @@
+"""Tests for s3_multipart.py."""
+import io
+
+import pandas as pd
+import pytest
+
+from src.utils.s3_multipart import MultipartUploader, write_csv_chunks
+
+
+class FakeS3Client(object):
+    """Stand-in for the boto3 s3 client, keeping objects in memory."""
+
+    def __init__(self, fail_part=None):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.fail_part = fail_part
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = bytes(Body)
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_part:
+            raise ConnectionError("Part upload failed")
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(parts), "Parts not completed in order."
+        self.objects[Key] = b"".join(parts[number] for number in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+        self.aborted.append(Key)
+
+
+class TestMultipartUploader(object):
+    """Tests for the MultipartUploader class."""
+
+    def test_small_upload(self):
+        """Test data smaller than a part is uploaded with put_object."""
+        client = FakeS3Client()
+        with MultipartUploader(client, "bucket", "small.txt", part_size=10) as up:
+            up.write("abc")
+            up.write(b"def")
+        assert client.objects == {"small.txt": b"abcdef"}
+        assert client.uploads == {}
+
+    def test_multipart_upload(self):
+        """Test large data is split into parts and reassembled in order."""
+        client = FakeS3Client()
+        content = bytes(range(256)) * 40
+        with MultipartUploader(
+            client, "bucket", "large.bin", part_size=100, max_workers=3
+        ) as uploader:
+            for start in range(0, len(content), 777):
+                uploader.write(content[start : start + 777])
+            assert len(uploader.buffer) < 100
+        assert client.objects["large.bin"] == content
+
+    def test_failed_part_aborts(self):
+        """Test a failed part aborts the upload and raises the error."""
+        client = FakeS3Client(fail_part=2)
+        with pytest.raises(ConnectionError):
+            with MultipartUploader(client, "bucket", "fail.bin", part_size=10) as up:
+                up.write(b"x" * 95)
+        assert client.aborted == ["fail.bin"]
+        assert "fail.bin" not in client.objects
+
+
+def test_write_csv_chunks():
+    """Test a dataframe written in chunks matches writing it at once."""
+    df = pd.DataFrame({"reference": range(25), "211": [x / 3 for x in range(25)]})
+    client = FakeS3Client()
+    with MultipartUploader(client, "bucket", "df.csv", part_size=64) as uploader:
+        write_csv_chunks(uploader, df, chunk_rows=7, index=False)
+    assert client.objects["df.csv"].decode() == df.to_csv(index=False)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(io.BytesIO(client.objects["df.csv"])), df
+    )
+
+    # an empty dataframe still has its header written
+    with MultipartUploader(client, "bucket", "empty.csv", part_size=64) as uploader:
+        write_csv_chunks(uploader, df.iloc[:0], index=False)
+    assert client.objects["empty.csv"] == b"reference,211\n"
@@ -0,0 +1,109 @@
+"""Tests for upsert.py."""
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.utils.upsert import keyed_upsert
+
+
+@pytest.fixture(scope="function")
+def target_df() -> pd.DataFrame:
+    """A dummy dataframe to apply changes to."""
+    columns = ["reference", "instance", "value", "status"]
+    data = [
+        [1, 0, 1.0, "clear"],
+        [1, 1, 2.0, "clear"],
+        [2, 0, 3.0, "Form sent out"],
+        [3, 0, 4.0, "clear"],
+    ]
+    return pd.DataFrame(columns=columns, data=data)
+
+
+class TestKeyedUpsert(object):
+    """Tests for keyed_upsert."""
+
+    def test_keyed_upsert(self, target_df):
+        """Matched rows are updated, new rows added and marked rows removed."""
+        changes = pd.DataFrame(
+            {
+                "reference": pd.array([1, 4], dtype="Int64"),
+                "instance": [1.0, 0.0],
+                "value": [20.0, 5.0],
+            }
+        )
+        remove = target_df["status"] == "Form sent out"
+        result, counts = keyed_upsert(
+            target_df, changes, ["reference", "instance"], remove=remove
+        )
+
+        expected = pd.DataFrame(
+            {
+                "reference": [1, 1, 3, 4],
+                "instance": [0.0, 1.0, 0.0, 0.0],
+                "value": [1.0, 20.0, 4.0, 5.0],
+                "status": ["clear", "clear", "clear", None],
+            }
+        )
+        assert_frame_equal(result, expected, check_dtype=False)
+        assert result["value"].dtype == "float64"
+        assert counts == {"inserted": 1, "updated": 1, "removed": 1}
+
+    def test_keyed_upsert_skip_missing(self, target_df):
+        """Missing values are skipped, and unmatched changes are not inserted."""
+        changes = pd.DataFrame(
+            {
+                "reference": [1, 3, 5],
+                "instance": [0, 0, 0],
+                "value": [None, 40.0, 6.0],
+                "status": ["constructed", None, "constructed"],
+            }
+        )
+        result, counts = keyed_upsert(
+            target_df,
+            changes,
+            ["reference", "instance"],
+            insert=False,
+            skip_missing=True,
+        )
+
+        assert result["value"].tolist() == [1.0, 2.0, 3.0, 40.0]
+        assert result["status"].tolist() == [
+            "constructed",
+            "clear",
+            "Form sent out",
+            "clear",
+        ]
+        assert counts == {"inserted": 0, "updated": 2, "removed": 0}
+
+    def test_keyed_upsert_duplicate_keys(self, target_df):
+        """A row matching more than one change raises an error."""
+        changes = pd.DataFrame(
+            {"reference": [1, 1], "instance": [0, 0], "value": [5.0, 6.0]}
+        )
+        with pytest.raises(ValueError):
+            keyed_upsert(target_df, changes, ["reference", "instance"])
+
+    def test_keyed_upsert_categories_differ(self, target_df):
+        """Categorical columns with different categories are updated."""
+        target_df["status"] = target_df["status"].astype("category")
+        changes = pd.DataFrame(
+            {
+                "reference": [1, 2],
+                "instance": [0, 0],
+                "status": pd.Categorical(
+                    ["Clear", "constructed"], categories=["Clear", "constructed"]
+                ),
+            }
+        )
+        result, counts = keyed_upsert(
+            target_df, changes, ["reference", "instance"], insert=False
+        )
+
+        assert result["status"].tolist() == [
+            "Clear",
+            "clear",
+            "constructed",
+            "clear",
+        ]
+        assert result["status"].dtype == "category"
+        assert counts == {"inserted": 0, "updated": 2, "removed": 0}